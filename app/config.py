@@ -8,6 +8,14 @@ class Settings(BaseSettings):
     debug: bool = False
     host: str = "0.0.0.0"
     port: int = 8000
+    # Build clients and load the query model in the background right after startup
+    warmup_on_startup: bool = True
+
+    # Observability settings
+    log_level: str = "INFO"
+    log_format: str = "text"
+    otel_enabled: bool = False
+    processor_metrics_port: int | None = None
 
     # Redis settings
     redis_host: str = "localhost"
@@ -16,12 +24,99 @@ class Settings(BaseSettings):
     redis_password: str | None = None
     redis_decode_responses: bool = True
 
+    # Queue settings
+    queue_backend: str = "streams"
+    queue_consumer_group: str = "processors"
+    queue_consumer_name: str | None = None
+    queue_batch_size: int = 16
+    queue_block_ms: int = 5000
+    queue_claim_idle_ms: int = 60000
+    queue_claim_interval_seconds: float = 30
+    queue_max_deliveries: int = 5
+    queue_stream_maxlen: int | None = 100000
+
+    # Processor settings
+    processor_fetch_workers: int = 4
+    processor_extract_workers: int | None = None
+    processor_store_workers: int = 2
+    processor_queue_size: int = 8
+    processor_incremental_reindex: bool = True
+    # Keep each file's extracted text in MINIO_ARTIFACTS_BUCKET so `main.py reindex` can skip parsing
+    processor_persist_text: bool = True
+    reindex_workers: int = 4
+
+    # Extraction settings
+    pdf_backend: str = "pypdf2"
+    pdf_pages_per_task: int = 50
+
+    # Chunking settings
+    chunker: str = "tokens"
+    chunk_max_tokens: int | None = None
+    chunk_overlap_tokens: int = 32
+    chunk_snap_sentences: bool = True
+
+    # Embedding settings
+    embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embed_batch_size: int = 64
+    embed_max_batch_chunks: int = 256
+    embed_max_wait_ms: int = 20
+    embedding_cache_size: int = 50000
+    embedding_cache_redis: bool = True
+    embedding_cache_ttl_seconds: int | None = 7 * 24 * 3600
+    embedding_cache_dtype: str = "float16"
+    embedding_backend: str = "torch"
+    embedding_onnx_file: str = "onnx/model.onnx"
+    embedding_onnx_int8_file: str = "onnx/model_qint8_avx2.onnx"
+    embedding_intra_op_threads: int | None = None
+    embedding_inter_op_threads: int | None = None
+    embedding_parity_min_cosine: float = 0.99
+
+    # Request handlers use async Redis/Qdrant clients (False: sync clients in the threadpool)
+    async_storage: bool = True
+
+    # File index settings
+    file_index_enabled: bool = True
+
+    # File metadata cache settings
+    file_stat_cache_ttl_seconds: int = 3600
+    file_stat_negative_ttl_seconds: int = 30
+    file_stat_local_ttl_seconds: float = 2
+    file_stat_local_max_entries: int = 10000
+
+    # Search settings
+    search_cache_ttl_seconds: int = 300
+    search_max_batch_size: int = 32
+    search_max_wait_ms: float = 2
+
     # MinIO settings
     minio_endpoint: str = "localhost:9000"
     minio_access_key: str = "minioadmin"
     minio_secret_key: str = "minioadmin"
     minio_secure: bool = False
     minio_bucket: str = "analytics"
+    # Derived data (chunk text, extracted text), kept apart from uploads
+    minio_artifacts_bucket: str = "analytics-artifacts"
+    minio_part_size: int = 16 * 1024 * 1024
+    minio_async_workers: int = 64
+    minio_region: str = "us-east-1"
+    # Endpoint clients use for presigned URLs, when it differs from minio_endpoint
+    minio_public_endpoint: str | None = None
+    minio_public_secure: bool | None = None
+
+    # Download settings (processor)
+    download_chunk_size: int = 1024 * 1024
+    download_spool_max_bytes: int = 32 * 1024 * 1024
+    download_dir: str | None = None
+    download_verify_checksum: bool = True
+
+    # Upload settings
+    upload_chunk_size: int = 1024 * 1024
+    upload_session_ttl_seconds: int = 3600
+    upload_multipart_threshold: int = 64 * 1024 * 1024
+    upload_part_size: int = 64 * 1024 * 1024
+    upload_cleanup_interval_seconds: int = 600
+    upload_batch_concurrency: int = 8
+    upload_batch_max_files: int = 500
 
     # Qdrant settings
     qdrant_host: str = "localhost"
@@ -29,6 +124,27 @@ class Settings(BaseSettings):
     qdrant_grpc_port: int = 6334
     qdrant_collection_name: str = "documents"
     qdrant_api_key: str | None = None
+    qdrant_prefer_grpc: bool = True
+    qdrant_upsert_batch_size: int = 256
+    qdrant_upsert_parallel: int = 4
+    qdrant_upsert_wait: bool = False
+    qdrant_barrier_timeout_seconds: float = 30
+    qdrant_pending_max_files: int = 256
+    # Collection profile; apply changes to an existing collection with `main.py migrate-collection`
+    qdrant_quantization: str = "none"  # none, scalar (int8) or binary
+    qdrant_quantization_always_ram: bool = True
+    qdrant_search_rescore: bool = True
+    qdrant_search_oversampling: float = 2.0
+    qdrant_on_disk_vectors: bool = False
+    qdrant_on_disk_payload: bool = False
+    qdrant_hnsw_m: int = 16
+    qdrant_hnsw_ef_construct: int = 100
+    qdrant_hnsw_on_disk: bool = False
+    qdrant_hnsw_ef: int | None = None
+    # Where chunk text lives: "payload" (in Qdrant) or "artifact" (one compressed
+    # object per file in MINIO_ARTIFACTS_BUCKET, fetched only when results need text)
+    chunk_text_store: str = "payload"
+    chunk_text_cache_ttl_seconds: int = 3600  # Redis hot cache for artifacts; 0 disables
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,61 @@
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.handlers.files_processor.pipeline import FileJob
+from app.packages.cache import EmbeddingCache
+
+
+class EmbeddingBatcher:
+    """Encodes the chunks of several files in one model call.
+
+    Chunks are ordered by length before encoding so each model batch holds
+    similarly sized inputs and little padding, then the vectors are scattered
+    back to the files they came from. With a cache, only texts that miss it
+    are encoded, and repeated texts within a batch are encoded once.
+    """
+
+    def __init__(
+            self,
+            encode: Callable[[list[str], int], np.ndarray],
+            batch_size: int = 64,
+            length: Callable[[str], int] = len,
+            cache: Optional[EmbeddingCache] = None,
+    ):
+        self._encode = encode
+        self.batch_size = batch_size
+        self._length = length
+        self._cache = cache
+
+    @property
+    def cache(self) -> Optional[EmbeddingCache]:
+        return self._cache
+
+    def embed(self, jobs: list[FileJob]) -> list[FileJob]:
+        job_texts = [job.embed_chunks for job in jobs]
+        texts = [chunk for chunks in job_texts for chunk in chunks]
+        if not texts:
+            return jobs
+
+        unique = list(dict.fromkeys(texts))
+        vectors = self._cache.get_many(unique) if self._cache is not None else [None] * len(unique)
+        missing = [text for text, vector in zip(unique, vectors) if vector is None]
+
+        if missing:
+            order = np.argsort([self._length(text) for text in missing], kind="stable")
+            encoded = self._encode([missing[i] for i in order], self.batch_size)
+            fresh = np.empty_like(encoded)
+            fresh[order] = encoded
+            if self._cache is not None:
+                self._cache.put_many(missing, fresh)
+            fresh_by_text = dict(zip(missing, fresh))
+            vectors = [fresh_by_text[text] if vector is None else vector for text, vector in zip(unique, vectors)]
+
+        by_text = dict(zip(unique, vectors))
+        embeddings = np.stack([by_text[text] for text in texts]).astype(np.float32, copy=False)
+
+        offset = 0
+        for job, chunks in zip(jobs, job_texts):
+            job.embeddings = embeddings[offset:offset + len(chunks)]
+            offset += len(chunks)
+        return jobs
@@ -0,0 +1,83 @@
+from tokenizers import Tokenizer
+
+SENTENCE_ENDINGS = ".!?"
+
+
+class TokenChunker:
+    """Splits text into windows that fit the embedding model's sequence length.
+
+    The text is tokenized once with offsets. Windows of ``max_tokens`` tokens,
+    overlapping by ``overlap`` tokens, are mapped back to character offsets and
+    sliced straight out of the original string. With ``snap_to_sentence``, a
+    window is shortened to the last sentence end in its second half.
+    """
+    max_tokens: int
+    overlap: int
+    snap_to_sentence: bool
+
+    def __init__(
+            self,
+            tokenizer: Tokenizer,
+            max_tokens: int,
+            overlap: int = 32,
+            snap_to_sentence: bool = True,
+    ):
+        if max_tokens <= 0:
+            raise ValueError(f"max_tokens must be positive, got {max_tokens}")
+        if not 0 <= overlap < max_tokens:
+            raise ValueError(f"overlap must be in [0, {max_tokens}), got {overlap}")
+
+        # Own copy with truncation and padding off, so concurrent encode calls
+        # from several threads never mutate shared tokenizer state.
+        self._tokenizer = Tokenizer.from_str(tokenizer.to_str())
+        self._tokenizer.no_truncation()
+        self._tokenizer.no_padding()
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+        self.snap_to_sentence = snap_to_sentence
+
+    def chunk(self, text: str) -> list[str]:
+        offsets = self._tokenizer.encode(text, add_special_tokens=False).offsets
+        num_tokens = len(offsets)
+
+        chunks = []
+        start = 0
+        while start < num_tokens:
+            end = min(start + self.max_tokens, num_tokens)
+            if end < num_tokens and self.snap_to_sentence:
+                end = self._sentence_end(text, offsets, start, end)
+
+            chunks.append(text[offsets[start][0]:offsets[end - 1][1]])
+            if end == num_tokens:
+                break
+            start = max(end - self.overlap, start + 1)
+
+        return chunks
+
+    def _sentence_end(self, text: str, offsets: list[tuple[int, int]], start: int, end: int) -> int:
+        lower = start + (end - start) // 2
+        for i in range(end, lower, -1):
+            if text[offsets[i - 1][1] - 1] in SENTENCE_ENDINGS:
+                return i
+        return end
+
+
+def chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> list[str]:
+    words = text.split()
+
+    if not words:
+        return []
+
+    if len(words) <= chunk_size:
+        return [text]
+
+    chunks = []
+    step = max(1, chunk_size - overlap)
+
+    for i in range(0, len(words), step):
+        chunk_words = words[i:i + chunk_size]
+        if chunk_words:
+            chunk = ' '.join(chunk_words)
+            chunks.append(chunk)
+
+    return chunks
@@ -0,0 +1,191 @@
+import io
+import logging
+import mmap
+from concurrent.futures import Executor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+from app.config import settings
+from app.packages.observability import PROCESSOR_PAGES
+
+logger = logging.getLogger(__name__)
+
+
+class _BufferStream(io.RawIOBase):
+    """Read-only, seekable file object over a buffer, without copying it."""
+
+    def __init__(self, buffer: memoryview):
+        # Own view, released on close, so a parser that outlives the call
+        # cannot keep a memory-mapped download pinned.
+        self._buffer = memoryview(buffer)
+        self._position = 0
+
+    def close(self) -> None:
+        self._buffer.release()
+        super().close()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        match whence:
+            case io.SEEK_SET:
+                self._position = offset
+            case io.SEEK_CUR:
+                self._position += offset
+            case io.SEEK_END:
+                self._position = len(self._buffer) + offset
+        return self._position
+
+    def readinto(self, target) -> int:
+        data = self._buffer[self._position:self._position + len(target)]
+        target[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+def extract_text_from_pdf(
+        content: bytes | memoryview,
+        executor: Optional[Executor] = None,
+        backend: Optional[str] = None,
+        path: Optional[str] = None,
+) -> str:
+    """Extract the text of a PDF, optionally fanning page ranges out to a process pool.
+
+    ``content`` may be a memory-mapped view; it is read in place, never copied.
+    With an executor, workers map ``path`` when the content lives in a file,
+    and otherwise the bytes are placed in shared memory once and every worker
+    opens them from there, so no copy of the document is pickled.
+    """
+    backend = backend or settings.pdf_backend
+    try:
+        num_pages = _count_pages(memoryview(content), backend)
+        logger.debug("PDF has %d pages", num_pages)
+
+        if executor is None or num_pages == 0:
+            pages = _read_pages(memoryview(content), backend, 0, num_pages)
+        elif path is not None:
+            pages = _read_file_pages_parallel(path, backend, num_pages, executor)
+        else:
+            pages = _read_pages_parallel(content, backend, num_pages, executor)
+
+        text = "\n".join(page for page in pages if page.strip())
+        if not text.strip():
+            raise ValueError("No text could be extracted from PDF. It might be a scanned document or image-based PDF.")
+
+        PROCESSOR_PAGES.inc(num_pages)
+        logger.debug("Extracted %d characters", len(text))
+        return text
+    except Exception as e:
+        logger.warning("Error reading PDF: %s", e)
+        raise
+
+
+def _page_ranges(num_pages: int) -> list[tuple[int, int]]:
+    per_task = max(1, settings.pdf_pages_per_task)
+    return [(start, min(start + per_task, num_pages)) for start in range(0, num_pages, per_task)]
+
+
+def _read_pages_parallel(content: bytes | memoryview, backend: str, num_pages: int, executor: Executor) -> list[str]:
+    size = len(content)
+    shm = SharedMemory(create=True, size=size)
+    try:
+        shm.buf[:size] = content
+        futures = [
+            executor.submit(_read_shared_pages, shm.name, size, backend, start, end)
+            for start, end in _page_ranges(num_pages)
+        ]
+        pages = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _read_file_pages_parallel(path: str, backend: str, num_pages: int, executor: Executor) -> list[str]:
+    futures = [
+        executor.submit(_read_file_pages, path, backend, start, end)
+        for start, end in _page_ranges(num_pages)
+    ]
+    pages = []
+    for future in futures:
+        pages.extend(future.result())
+    return pages
+
+
+def _read_file_pages(path: str, backend: str, start: int, end: int) -> list[str]:
+    # Every worker maps the same file read-only, so the page cache holds one copy.
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            return _read_pages(view, backend, start, end)
+        finally:
+            view.release()
+
+
+def _read_shared_pages(name: str, size: int, backend: str, start: int, end: int) -> list[str]:
+    # Pool workers share the parent's resource tracker, so attaching here does
+    # not take ownership; the creating process unlinks the segment.
+    shm = SharedMemory(name=name)
+    view = shm.buf[:size]
+    try:
+        return _read_pages(view, backend, start, end)
+    finally:
+        view.release()
+        shm.close()
+
+
+def _count_pages(data: memoryview, backend: str) -> int:
+    match backend:
+        case "pypdf2":
+            with _BufferStream(data) as stream:
+                return len(_open_pypdf2(stream).pages)
+        case "pymupdf":
+            with _open_pymupdf(data) as document:
+                return document.page_count
+        case _:
+            raise ValueError(f"Unsupported PDF backend: {backend}")
+
+
+def _read_pages(data: memoryview, backend: str, start: int, end: int) -> list[str]:
+    match backend:
+        case "pypdf2":
+            with _BufferStream(data) as stream:
+                reader = _open_pypdf2(stream)
+                return [_page_text(lambda i=i: reader.pages[i].extract_text(), i) for i in range(start, end)]
+        case "pymupdf":
+            with _open_pymupdf(data) as document:
+                return [_page_text(lambda i=i: document[i].get_text(), i) for i in range(start, end)]
+        case _:
+            raise ValueError(f"Unsupported PDF backend: {backend}")
+
+
+def _page_text(extract, index: int) -> str:
+    try:
+        return extract() or ""
+    except Exception as e:
+        logger.warning("Error extracting text from page %d: %s", index + 1, e)
+        return ""
+
+
+def _open_pypdf2(stream: _BufferStream):
+    # Imported on first use so loading this module stays cheap.
+    import PyPDF2
+
+    return PyPDF2.PdfReader(stream)
+
+
+def _open_pymupdf(data: memoryview):
+    try:
+        import pymupdf
+    except ImportError as e:
+        raise ImportError("PDF_BACKEND=pymupdf requires the 'pymupdf' package") from e
+    return pymupdf.open(stream=data, filetype="pdf")
@@ -0,0 +1,206 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from app.packages.observability import PROCESSOR_FILES
+from app.packages.storage.spool import SpooledObject
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FileJob:
+    """A file moving through the processor pipeline, filled in stage by stage."""
+    file_id: str
+    message: Any = None
+    content_type: Optional[str] = None
+    content: Optional[bytes | memoryview] = None
+    download: Optional[SpooledObject] = None
+    text: Optional[str] = None
+    chunks: list[str] = field(default_factory=list)
+    embed_indices: Optional[list[int]] = None
+    plan: Any = None
+    embeddings: Optional[np.ndarray] = None
+    failed: bool = False
+
+    def release_content(self) -> None:
+        """Drop the downloaded content and its temp file, if any."""
+        self.content = None
+        if self.download is not None:
+            self.download.close()
+            self.download = None
+
+    @property
+    def embed_chunks(self) -> list[str]:
+        """Chunks that still need an embedding; all of them unless narrowed."""
+        if self.embed_indices is None:
+            return self.chunks
+        return [self.chunks[i] for i in self.embed_indices]
+
+
+_STOP = object()
+
+
+class Stage:
+    """A pool of worker threads draining a bounded input queue.
+
+    ``handler`` returns the job to pass downstream, or ``None`` when the job is
+    finished early (skipped, unsupported, nothing to embed). Because the input
+    queue is bounded, a slow stage blocks the producers in front of it.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            handler: Callable[[FileJob], Optional[FileJob]],
+            workers: int = 1,
+            queue_size: int = 8,
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.downstream: Optional["Stage"] = None
+        self.on_done: Callable[[FileJob], None] = lambda job: None
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def put(self, job: FileJob) -> None:
+        self.queue.put(job)
+
+    def stop(self) -> None:
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def _work(self) -> None:
+        while True:
+            job = self.queue.get()
+            if job is _STOP:
+                return
+            self._process(job)
+
+    def _process(self, job: FileJob) -> None:
+        try:
+            result = self.handler(job)
+        except Exception:
+            logger.exception("Failed to process file", extra={"stage": self.name, "file_id": job.file_id})
+            PROCESSOR_FILES.labels("failed").inc()
+            job.failed = True
+            self.on_done(job)
+            return
+
+        if result is None or self.downstream is None:
+            self.on_done(job)
+        else:
+            self.downstream.put(result)
+
+
+class Pipeline:
+    """Chain of stages connected by bounded queues.
+
+    ``on_done`` is called exactly once per submitted job, whether it finished,
+    was dropped early or failed in some stage; failed jobs have ``failed`` set.
+    """
+
+    def __init__(self, stages: list[Stage], on_done: Callable[[FileJob], None]):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.stages = stages
+        for stage, downstream in zip(stages, stages[1:] + [None]):
+            stage.downstream = downstream
+            stage.on_done = on_done
+
+    def start(self) -> None:
+        for stage in self.stages:
+            stage.start()
+
+    def submit(self, job: FileJob) -> None:
+        self.stages[0].put(job)
+
+    def stop(self) -> None:
+        # Stop front to back so every stage drains what upstream already handed it.
+        for stage in self.stages:
+            stage.stop()
+
+
+class BatchStage(Stage):
+    """Stage whose handler receives several jobs at once.
+
+    A worker takes the first queued job, then keeps collecting until the jobs
+    hold ``max_items`` chunks or ``max_wait`` seconds have passed. The handler
+    returns one result per job, with ``None`` for jobs finished early.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            handler: Callable[[list[FileJob]], list[Optional[FileJob]]],
+            max_items: int,
+            max_wait: float,
+            workers: int = 1,
+            queue_size: int = 8,
+    ):
+        super().__init__(name, handler, workers, queue_size)
+        self.max_items = max_items
+        self.max_wait = max_wait
+
+    def _work(self) -> None:
+        while True:
+            job = self.queue.get()
+            if job is _STOP:
+                return
+
+            batch = [job]
+            size = len(job.embed_indices if job.embed_indices is not None else job.chunks)
+            deadline = time.monotonic() + self.max_wait
+            stopping = False
+            while size < self.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stopping = True
+                    break
+                batch.append(job)
+                size += len(job.embed_indices if job.embed_indices is not None else job.chunks)
+
+            self._process_batch(batch)
+            if stopping:
+                return
+
+    def _process_batch(self, batch: list[FileJob]) -> None:
+        try:
+            results = self.handler(batch)
+        except Exception:
+            logger.exception(
+                "Failed to process files",
+                extra={"stage": self.name, "file_ids": [job.file_id for job in batch]},
+            )
+            PROCESSOR_FILES.labels("failed").inc(len(batch))
+            for job in batch:
+                job.failed = True
+                self.on_done(job)
+            return
+
+        for job, result in zip(batch, results):
+            if result is None or self.downstream is None:
+                self.on_done(job)
+            else:
+                self.downstream.put(result)
@@ -1,115 +1,367 @@
 from app.packages.queues.prototypes import Subscriber
-from app.packages.queues.redis import RedisSubscriber
+from app.packages.queues import new_subscriber
 from app.packages.infrastructure.redis import redis_cli
-from app.packages.constants.constants import FILES_TOPIC
-from app.packages.storage import MinioClient, QdrantVectorStore
-from sentence_transformers import SentenceTransformer
-from io import BytesIO
-import PyPDF2
+from app.packages.constants.constants import FILES_TOPIC, FILES_DELETED_TOPIC
+from app.packages.storage import (
+    MinioClient,
+    QdrantVectorStore,
+    ExtractedTextStore,
+    ChecksumMismatchError,
+    extracted_text_store,
+)
+from app.packages.cache import DedupIndex, EmbeddingCache, SearchCache, FileIndex, file_stat_cache, redis_client
+from app.packages.embeddings import load_embedding_model, embedding_model_id
+from app.packages.infrastructure.redis import redis_bin_cli
+from app.handlers.files_processor.pipeline import FileJob, Pipeline, Stage, BatchStage
+from app.handlers.files_processor.batcher import EmbeddingBatcher
+from app.handlers.files_processor.pdf import extract_text_from_pdf
+from app.handlers.files_processor.chunking import TokenChunker, chunk_text
+from app.config import settings
+from app.startup import startup_timer
+from app.packages.observability import (
+    PROCESSOR_FILES,
+    PROCESSOR_CHUNKS,
+    PROCESSOR_BYTES,
+    timed_stage,
+    observe_queue_lag,
+)
+from concurrent.futures import ProcessPoolExecutor
+from prometheus_client import start_http_server
+from typing import TYPE_CHECKING, Callable, Optional
+import logging
+import multiprocessing
+import os
+import threading
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+logger = logging.getLogger(__name__)
 
 
 class Processor:
     _subscriber: Subscriber
+    _deletions: Subscriber
     _minio_client: MinioClient
-    _transformer: SentenceTransformer
+    _transformer: "SentenceTransformer"
     _vector_store: QdrantVectorStore
+    _dedup: DedupIndex
+    _file_index: FileIndex
+    _text_store: Optional[ExtractedTextStore]
+    _search_cache: SearchCache
+    _batcher: EmbeddingBatcher
+    chunk: Callable[[str], list[str]]
+    _extract_pool: Optional[ProcessPoolExecutor]
+    _pipeline: Optional[Pipeline]
+    _deletions_thread: Optional[threading.Thread]
 
-    def __init__(self):
-        self._subscriber = RedisSubscriber(redis_cli)
-        self._minio_client = MinioClient()
-        self._transformer = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-        self._vector_store = QdrantVectorStore()
+    def __init__(
+            self,
+            minio_client: Optional[MinioClient] = None,
+            vector_store: Optional[QdrantVectorStore] = None,
+            dedup: Optional[DedupIndex] = None,
+            transformer: Optional["SentenceTransformer"] = None,
+            embedding_cache: Optional[EmbeddingCache] = None,
+            text_store: Optional[ExtractedTextStore] = None,
+    ):
+        """Collaborators default to the configured services; pass them to run offline."""
+        with startup_timer.phase("connect"):
+            self._subscriber = new_subscriber(redis_cli)
+            self._deletions = new_subscriber(redis_cli)
+            self._minio_client = minio_client or MinioClient()
+            self._vector_store = vector_store or QdrantVectorStore()
+            self._dedup = dedup or DedupIndex(redis_client)
+            self._file_index = FileIndex(redis_cli)
+            self._search_cache = SearchCache(redis_client)
+            self._text_store = text_store or (extracted_text_store if settings.processor_persist_text else None)
+        with startup_timer.phase("model"):
+            self._transformer = transformer or load_embedding_model()
+        self._batcher = EmbeddingBatcher(
+            encode=lambda texts, batch_size: self._transformer.encode(
+                texts,
+                batch_size=batch_size,
+                show_progress_bar=False,
+            ),
+            batch_size=settings.embed_batch_size,
+            cache=embedding_cache or EmbeddingCache(
+                model_name=embedding_model_id(),
+                redis=redis_bin_cli if settings.embedding_cache_redis else None,
+                max_entries=settings.embedding_cache_size,
+                ttl_seconds=settings.embedding_cache_ttl_seconds,
+                dtype=settings.embedding_cache_dtype,
+            ),
+        )
+        self.chunk = self._build_chunker()
+        self._extract_pool = None
+        self._pipeline = None
+        self._deletions_thread = None
+        self._stopping = False
 
     def run(self):
-        print(f"Starting processor, subscribing to {FILES_TOPIC}...")
-        for message in self._subscriber.subscribe(FILES_TOPIC):
+        if settings.processor_metrics_port:
             try:
-                self._handle_file(str(message))
-            except Exception as e:
-                print(e)
+                start_http_server(settings.processor_metrics_port)
+            except OSError as e:
+                # Another processor on this host already holds the port; keep
+                # processing rather than dying over metrics.
+                logger.warning(
+                    "Metrics server not started: %s",
+                    e,
+                    extra={"metrics_port": settings.processor_metrics_port},
+                )
+        logger.info("Starting processor", extra={"topic": FILES_TOPIC, "metrics_port": settings.processor_metrics_port})
+        self._pipeline = self._build_pipeline()
+        self._pipeline.start()
+        self._deletions_thread = threading.Thread(target=self._consume_deletions, name="deletions", daemon=True)
+        self._deletions_thread.start()
+        startup_timer.report("Processor")
+        for message in self._subscriber.subscribe(FILES_TOPIC):
+            # Blocks while the fetch stage is full, which keeps unread
+            # messages in the queue for other processors.
+            self._pipeline.submit(FileJob(file_id=decode_message(message), message=message))
 
     def terminate(self):
+        self._stopping = True
         self._subscriber.close()
+        self._deletions.close()
+        if self._pipeline is not None:
+            self._pipeline.stop()
+        if self._extract_pool is not None:
+            self._extract_pool.shutdown()
+        try:
+            self._vector_store.barrier()
+        finally:
+            self._vector_store.close()
 
-    def _handle_file(self, file_id: str):
-        print(f"Processing file: {file_id}")
-        metadata = self._minio_client.stat_file(file_id)
-        file = self._minio_client.download_file(file_id)
-        text = ""
-        match metadata.content_type:
-            case "application/pdf":
-                text = extract_text_from_pdf(file)
-            case _:
-                print(f"Unsupported file type: {metadata.content_type}")
-                return
-
-        chunks = chunk_text(text)
-        print(f"Created {len(chunks)} chunks")
+    def delete_files(self, file_ids: list[str]) -> None:
+        """Remove the vectors and text artifacts of deleted files."""
+        self._vector_store.delete_by_file_ids(file_ids)
+        if self._text_store is not None:
+            self._text_store.delete(file_ids)
+        # Searches that ran before the vectors were gone may have cached them.
+        self._search_cache.invalidate()
+        PROCESSOR_FILES.labels("deleted").inc(len(file_ids))
+        logger.info("Deleted file data", extra={"file_ids": file_ids})
 
-        if not chunks:
-            print("No chunks created from text")
-            return
+    def _consume_deletions(self) -> None:
+        # The API publishes deleted ids; failures stay pending and are
+        # retried like files, so a Qdrant outage cannot orphan vectors.
+        try:
+            for message in self._deletions.subscribe(FILES_DELETED_TOPIC):
+                file_id = decode_message(message)
+                try:
+                    self.delete_files([file_id])
+                except Exception:
+                    logger.exception("Failed to delete file data", extra={"file_id": file_id})
+                    self._deletions.release(FILES_DELETED_TOPIC, message)
+                else:
+                    self._deletions.ack(FILES_DELETED_TOPIC, message)
+        except Exception:
+            if not self._stopping:
+                logger.exception("Deletion consumer stopped")
 
-        embeddings = self._transformer.encode(chunks, show_progress_bar=True)
-        print(f"Embeddings shape: {embeddings.shape}")
+    def _build_pipeline(self) -> Pipeline:
+        extract_workers = settings.processor_extract_workers or os.cpu_count() or 1
+        # Spawn rather than fork: the parent already runs threads and torch.
+        # Extractors fan page ranges out to this pool, so the extract stage
+        # itself only needs enough threads to keep it busy.
+        self._extract_pool = ProcessPoolExecutor(
+            max_workers=extract_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        queue_size = settings.processor_queue_size
 
-        # Store embeddings and chunks in Qdrant
-        result = self._vector_store.add_documents(
-            file_id=file_id,
-            chunks=chunks,
-            embeddings=embeddings,
+        return Pipeline(
+            stages=[
+                Stage("fetch", self._fetch, settings.processor_fetch_workers, queue_size),
+                Stage("extract", self._extract, extract_workers, queue_size),
+                # A single worker owns the model and encodes chunks from
+                # several files per call.
+                BatchStage(
+                    "embed",
+                    self.embed_batch,
+                    max_items=settings.embed_max_batch_chunks,
+                    max_wait=settings.embed_max_wait_ms / 1000,
+                    workers=1,
+                    queue_size=queue_size,
+                ),
+                Stage("store", self._store, settings.processor_store_workers, queue_size),
+            ],
+            on_done=self._finish,
         )
-        print(f"Stored {result['num_chunks']} chunks in Qdrant with status: {result['status']}")
-        print(f"Successfully processed file: {file_id}")
 
+    def _build_chunker(self) -> Callable[[str], list[str]]:
+        match settings.chunker:
+            case "tokens":
+                tokenizer = self._transformer.tokenizer
+                max_tokens = settings.chunk_max_tokens or self._transformer.max_seq_length
+                return TokenChunker(
+                    tokenizer=tokenizer.backend_tokenizer,
+                    max_tokens=max_tokens - tokenizer.num_special_tokens_to_add(pair=False),
+                    overlap=settings.chunk_overlap_tokens,
+                    snap_to_sentence=settings.chunk_snap_sentences,
+                ).chunk
+            case "words":
+                return chunk_text
+            case _:
+                raise ValueError(f"Unsupported chunker: {settings.chunker}")
+
+    def _finish(self, job: FileJob) -> None:
+        # Jobs that failed before extraction still hold their download.
+        job.release_content()
+        if job.message is None:
+            return
+        if job.failed:
+            # Redelivered later, so a transient outage does not lose the file.
+            self._subscriber.release(FILES_TOPIC, job.message)
+        else:
+            self._subscriber.ack(FILES_TOPIC, job.message)
+
+    def _handle_file(self, file_id: str):
+        job = FileJob(file_id=file_id)
+        try:
+            for step in (self._fetch, self._extract, self._embed, self._store):
+                if step(job) is None:
+                    return
+        finally:
+            job.release_content()
 
-def extract_text_from_pdf(content: bytes) -> str:
-    try:
-        pdf_stream = BytesIO(content)
-        reader = PyPDF2.PdfReader(pdf_stream)
+    def _fetch(self, job: FileJob) -> Optional[FileJob]:
+        observe_queue_lag(getattr(job.message, "message_id", None))
+        if self._dedup.is_indexed(job.file_id):
+            logger.info("Skipping already indexed file", extra={"file_id": job.file_id})
+            PROCESSOR_FILES.labels("skipped").inc()
+            return None
 
-        num_pages = len(reader.pages)
-        print(f"PDF has {num_pages} pages")
+        logger.info("Processing file", extra={"file_id": job.file_id})
+        return self.download(job)
 
-        text = ""
-        for i, page in enumerate(reader.pages):
+    def download(self, job: FileJob) -> Optional[FileJob]:
+        """Fetch the file of ``job``; None when its type has no extractor."""
+        with timed_stage("stat", file_id=job.file_id):
+            metadata = self._minio_client.stat_file(job.file_id)
+        if metadata.content_type not in EXTRACTORS:
+            logger.warning(
+                "Unsupported file type",
+                extra={"file_id": job.file_id, "content_type": metadata.content_type},
+            )
+            PROCESSOR_FILES.labels("unsupported").inc()
+            return None
+
+        job.content_type = metadata.content_type
+        expected_sha256 = None
+        if settings.download_verify_checksum:
+            # File ids are the first characters of the content's SHA-256; the
+            # full hash the upload claimed is checked once it is recorded.
+            # Presigned uploads are verified only here.
+            expected_sha256 = self._dedup.file_hash(job.file_id) or job.file_id
+        with timed_stage("download", file_id=job.file_id):
             try:
-                page_text = page.extract_text()
-                if page_text and page_text.strip():
-                    text += page_text + "\n"
-                    print(f"Page {i+1}: extracted {len(page_text)} characters")
-                else:
-                    print(f"Page {i+1}: no text extracted (might be scanned/image)")
-            except Exception as e:
-                print(f"Error extracting text from page {i+1}: {e}")
-                continue
+                job.download = self._minio_client.download_object(job.file_id, expected_sha256_prefix=expected_sha256)
+            except ChecksumMismatchError as e:
+                self._reject(job.file_id, str(e))
+                return None
+        job.content = job.download.view()
+        PROCESSOR_BYTES.inc(job.download.size)
+        return job
+
+    def _reject(self, file_id: str, reason: str) -> None:
+        """Delete a file whose content does not match its id, so it is never indexed or served."""
+        logger.warning("Rejecting file", extra={"file_id": file_id, "reason": reason})
+        self._minio_client.delete_file(file_id)
+        self._dedup.forget(file_id)
+        self._file_index.remove(file_id)
+        file_stat_cache.invalidate(file_id)
+        PROCESSOR_FILES.labels("rejected").inc()
 
-        if not text.strip():
-            raise ValueError("No text could be extracted from PDF. It might be a scanned document or image-based PDF.")
+    def _extract(self, job: FileJob) -> Optional[FileJob]:
+        self.extract_text(job)
 
-        print(f"Total extracted text length: {len(text)} characters")
-        return text
-    except Exception as e:
-        print(f"Error reading PDF: {e}")
-        raise
+        with timed_stage("chunk", file_id=job.file_id):
+            job.chunks = self.chunk(job.text)
+        logger.debug("Created chunks", extra={"file_id": job.file_id, "chunks": len(job.chunks)})
 
+        if not job.chunks:
+            logger.warning("No chunks created from text", extra={"file_id": job.file_id})
+            PROCESSOR_FILES.labels("empty").inc()
+            return None
 
-def chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> list[str]:
-    words = text.split()
+        if settings.processor_incremental_reindex:
+            with timed_stage("plan", file_id=job.file_id):
+                job.plan = self._vector_store.plan_reindex(job.file_id, job.chunks)
+            job.embed_indices = job.plan.new
+            logger.debug(
+                "Reindex plan",
+                extra={
+                    "file_id": job.file_id,
+                    "new": len(job.plan.new),
+                    "stale": len(job.plan.stale),
+                    "moved": len(job.plan.moved),
+                },
+            )
+            if job.plan.unchanged:
+                self._dedup.mark_indexed(job.file_id)
+                logger.info("File already up to date", extra={"file_id": job.file_id})
+                PROCESSOR_FILES.labels("unchanged").inc()
+                return None
+        return job
 
-    if not words:
-        return []
+    def extract_text(self, job: FileJob) -> None:
+        """Set ``job.text`` from the downloaded content and persist it if configured."""
+        extractor = EXTRACTORS[job.content_type]
+        with timed_stage("extract", file_id=job.file_id):
+            job.text = extractor(job.content, executor=self._extract_pool, path=job.download.path)
+        job.release_content()
+
+        if self._text_store is not None:
+            with timed_stage("persist_text", file_id=job.file_id):
+                self._text_store.put(job.file_id, job.text)
+
+    def _embed(self, job: FileJob) -> FileJob:
+        return self.embed_batch([job])[0]
+
+    def embed_batch(self, jobs: list[FileJob]) -> list[FileJob]:
+        """Embed the chunks of several jobs in shared model batches."""
+        chunks = sum(len(job.embed_chunks) for job in jobs)
+        with timed_stage("encode", files=len(jobs), chunks=chunks):
+            self._batcher.embed(jobs)
+        PROCESSOR_CHUNKS.inc(chunks)
+        logger.debug(
+            "Embedded chunks",
+            extra={"files": len(jobs), "chunks": chunks, "cache": self._batcher.cache.stats()},
+        )
+        return jobs
+
+    def _store(self, job: FileJob) -> FileJob:
+        # Store embeddings and chunks in Qdrant
+        with timed_stage("upsert", file_id=job.file_id):
+            if job.plan is not None:
+                result = self._vector_store.apply_reindex(
+                    file_id=job.file_id,
+                    chunks=job.chunks,
+                    plan=job.plan,
+                    embeddings=job.embeddings,
+                )
+            else:
+                result = self._vector_store.add_documents(
+                    file_id=job.file_id,
+                    chunks=job.chunks,
+                    embeddings=job.embeddings,
+                )
+        self._dedup.mark_indexed(job.file_id)
+        PROCESSOR_FILES.labels("indexed").inc()
+        logger.info(
+            "Processed file",
+            extra={"file_id": job.file_id, "chunks": result["num_chunks"], "status": result["status"]},
+        )
+        return job
 
-    if len(words) <= chunk_size:
-        return [text]
 
-    chunks = []
-    step = max(1, chunk_size - overlap)
+def decode_message(message: bytes | str) -> str:
+    return message.decode() if isinstance(message, bytes) else str(message)
 
-    for i in range(0, len(words), step):
-        chunk_words = words[i:i + chunk_size]
-        if chunk_words:
-            chunk = ' '.join(chunk_words)
-            chunks.append(chunk)
 
-    return chunks
+EXTRACTORS = {
+    "application/pdf": extract_text_from_pdf,
+}
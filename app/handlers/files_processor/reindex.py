@@ -0,0 +1,206 @@
+import logging
+import os
+import threading
+from collections import Counter
+from typing import Iterable, Optional
+
+from app.config import settings
+from app.handlers.files_processor.pipeline import FileJob, Pipeline, Stage, BatchStage
+from app.handlers.files_processor.processor import Processor
+from app.packages.observability import timed_stage
+from app.packages.storage import ExtractedTextStore, QdrantVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """Append-only file of finished file ids, so an interrupted run resumes where it stopped.
+
+    ``done`` is every id indexed into the target; a ``-<id>`` line records an
+    id whose file was deleted again and removed from the target.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.done: set[str] = set()
+        self._lock = threading.Lock()
+        self._file = None
+        if path is not None:
+            if os.path.exists(path):
+                with open(path) as f:
+                    for line in f:
+                        line = line.strip()
+                        if line.startswith("-"):
+                            self.done.discard(line[1:])
+                        elif line:
+                            self.done.add(line)
+            self._file = open(path, "a")
+
+    def record(self, file_id: str) -> None:
+        with self._lock:
+            self.done.add(file_id)
+            self._write(file_id)
+
+    def discard(self, file_ids: Iterable[str]) -> None:
+        with self._lock:
+            for file_id in file_ids:
+                self.done.discard(file_id)
+                self._write("-" + file_id)
+
+    def _write(self, line: str) -> None:
+        if self._file is not None:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class Reindexer:
+    """Rebuild the embeddings of every stored file into ``target``.
+
+    Text comes from the extracted-text artifacts the processor writes, so a
+    run is bound by embedding speed. Files without one (indexed before text
+    was persisted) are downloaded and extracted once, which also writes their
+    artifact. ``workers`` threads load and chunk files ahead of the single
+    embedding worker, which batches chunks across files as the processor does.
+
+    The live processors keep writing to the old collection meanwhile, so the
+    target is brought up to date by diffing listings against the checkpoint:
+    ``run`` repeats catch-up passes until one finds nothing to do, and
+    ``catch_up`` once more after the alias has moved covers what changed in
+    between.
+    """
+
+    def __init__(
+            self,
+            processor: Processor,
+            target: QdrantVectorStore,
+            text_store: Optional[ExtractedTextStore],
+            checkpoint: Checkpoint,
+            workers: Optional[int] = None,
+    ):
+        self._processor = processor
+        self._target = target
+        self._text_store = text_store
+        self._checkpoint = checkpoint
+        self._workers = workers or settings.reindex_workers
+        self._stats: Counter = Counter(files=0)
+        self._stats_lock = threading.Lock()
+        self._already_done = len(checkpoint.done)
+        # Ids attempted this run, and those that reached a final state.
+        self._seen: set[str] = set()
+        self._finished: set[str] = set()
+        self._listed: set[str] = set()
+
+    def run(self, list_file_ids, max_passes: int = 5) -> dict:
+        """Index every id from ``list_file_ids()`` that is not checkpointed yet.
+
+        Each pass lists the files again, indexes the ones not seen before and
+        deletes from ``target`` the checkpointed ones that are gone. Ids that
+        failed are not retried; files still listed but not finished count as
+        failed.
+        """
+        for _ in range(max_passes):
+            if not self.catch_up(list_file_ids):
+                break
+
+        return {
+            "collection_name": self._target.collection_name,
+            "already_done": self._already_done,
+            "failed": len((self._seen & self._listed) - self._finished),
+            **self._stats,
+        }
+
+    def catch_up(self, list_file_ids) -> int:
+        """Sync ``target`` with one listing; return how many files were indexed or deleted."""
+        listed = list(dict.fromkeys(list_file_ids()))
+        self._listed = set(listed)
+        pending = [
+            file_id for file_id in listed
+            if file_id not in self._checkpoint.done and file_id not in self._seen
+        ]
+        # Deleted after they were indexed; the live processors only removed
+        # them from the old collection.
+        gone = [file_id for file_id in self._checkpoint.done if file_id not in self._listed]
+
+        if pending:
+            self._seen.update(pending)
+            self._count("files", len(pending))
+            self._run_pass(pending)
+        if gone:
+            self._target.delete_by_file_ids(gone)
+            self._checkpoint.discard(gone)
+            # A re-upload of the same content is indexed again.
+            self._seen.difference_update(gone)
+            self._count("deleted", len(gone))
+            logger.info("Removed deleted files from the rebuild", extra={"files": len(gone)})
+        self._target.barrier()
+        return len(pending) + len(gone)
+
+    def _run_pass(self, file_ids: Iterable[str]) -> None:
+        queue_size = settings.processor_queue_size
+        pipeline = Pipeline(
+            stages=[
+                Stage("load", self._load, self._workers, queue_size),
+                BatchStage(
+                    "embed",
+                    self._processor.embed_batch,
+                    max_items=settings.embed_max_batch_chunks,
+                    max_wait=settings.embed_max_wait_ms / 1000,
+                    workers=1,
+                    queue_size=queue_size,
+                ),
+                Stage("store", self._store, settings.processor_store_workers, queue_size),
+            ],
+            on_done=lambda job: job.release_content(),
+        )
+        pipeline.start()
+        try:
+            for file_id in file_ids:
+                pipeline.submit(FileJob(file_id=file_id))
+        finally:
+            pipeline.stop()
+
+    def _load(self, job: FileJob) -> Optional[FileJob]:
+        text = None
+        if self._text_store is not None:
+            with timed_stage("load_text", file_id=job.file_id):
+                text = self._text_store.get(job.file_id)
+        if text is not None:
+            job.text = text
+            self._count("text_from_artifact")
+        else:
+            if self._processor.download(job) is None:
+                self._finish(job.file_id, "unsupported")
+                return None
+            self._processor.extract_text(job)
+            self._count("text_extracted")
+
+        with timed_stage("chunk", file_id=job.file_id):
+            job.chunks = self._processor.chunk(job.text)
+        job.text = None
+        if not job.chunks:
+            self._finish(job.file_id, "empty")
+            return None
+        return job
+
+    def _store(self, job: FileJob) -> FileJob:
+        with timed_stage("upsert", file_id=job.file_id):
+            self._target.add_documents(file_id=job.file_id, chunks=job.chunks, embeddings=job.embeddings)
+        self._checkpoint.record(job.file_id)
+        self._finish(job.file_id, "indexed")
+        self._count("chunks", len(job.chunks))
+        logger.info("Reindexed file", extra={"file_id": job.file_id, "chunks": len(job.chunks)})
+        return job
+
+    def _finish(self, file_id: str, outcome: str) -> None:
+        with self._stats_lock:
+            self._finished.add(file_id)
+            self._stats[outcome] += 1
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
@@ -1,3 +1,4 @@
 from app.handlers.services.file_service import FileService
+from app.handlers.services.search_service import SearchService
 
-__all__ = ["FileService"]
+__all__ = ["FileService", "SearchService"]
@@ -1,74 +1,431 @@
+import asyncio
+import logging
+
 from fastapi import UploadFile
-from typing import Dict, Any
+from typing import Dict, Any, BinaryIO, Optional
+from itertools import islice
 from app.packages import minio_client, redis_client, MinioClient, RedisClient, FileStat
+from app.packages.cache import DedupIndex, SearchCache, FileIndex, FileStatCache, file_stat_cache, async_redis_client
+from app.packages.cache import UploadSession, UploadSessionStore
+from app.packages.storage import AsyncMinioClient, async_minio_client, artifact_minio_client
+from fastapi.concurrency import run_in_threadpool
+from minio.error import S3Error
 import hashlib
-from datetime import datetime, UTC
+from datetime import datetime, timedelta, UTC
+
+from app.packages.constants.constants import FILES_TOPIC, FILES_DELETED_TOPIC
+from app.packages.queues.prototypes import Publisher, AsyncPublisher
+from app.packages.queues import new_publisher, new_async_publisher
+from app.packages.infrastructure.redis import redis_cli, redis_async_cli
+from app.config import settings
+
+logger = logging.getLogger(__name__)
 
-from app.packages.constants.constants import FILES_TOPIC
-from app.packages.queues.prototypes import Publisher
-from app.packages.queues.redis import RedisPublisher
-from app.packages.infrastructure.redis import redis_cli
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
 
 
 class FileService:
     _minio: MinioClient
+    _staging: MinioClient
+    _async_minio: AsyncMinioClient
     _redis: RedisClient
     _publisher: Publisher
+    _async_publisher: AsyncPublisher
+    _dedup: DedupIndex
+    _search_cache: SearchCache
+    _file_index: FileIndex
+    _stat_cache: FileStatCache
+    _upload_sessions: UploadSessionStore
+    _async_storage: bool
 
-    def __init__(self):
+    def __init__(self, async_storage: Optional[bool] = None):
         self._minio = minio_client
+        self._staging = artifact_minio_client
+        self._async_minio = async_minio_client
         self._redis = redis_client
-        self._publisher = RedisPublisher(redis_cli)
+        self._publisher = new_publisher(redis_cli)
+        self._async_publisher = new_async_publisher(redis_async_cli)
+        self._dedup = DedupIndex(redis_client, async_redis=async_redis_client)
+        self._search_cache = SearchCache(redis_client, async_redis=async_redis_client)
+        self._file_index = FileIndex(redis_cli, async_redis=redis_async_cli)
+        self._stat_cache = file_stat_cache
+        self._upload_sessions = UploadSessionStore(redis_client, ttl_seconds=settings.upload_session_ttl_seconds)
+        self._async_storage = settings.async_storage if async_storage is None else async_storage
 
     def save_file(self, file: UploadFile) -> Dict[str, Any]:
-        contents = file.file.read()
-        file_hash = hashlib.sha256(contents).hexdigest()
+        file_hash, file_metadata = self._store_upload(file)
+        if file_metadata["status"] == "uploaded":
+            self._enqueue([(file_hash, file_metadata)])
+        return file_metadata
+
+    async def save_files(self, files: list[UploadFile]) -> list[Dict[str, Any]]:
+        """Store many uploads concurrently and enqueue the new ones in one round trip.
+
+        Each file goes through the same steps as save_file, at most
+        ``upload_batch_concurrency`` at a time. A file that fails is reported
+        in its own result instead of failing the batch.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.upload_batch_concurrency))
+
+        async def store(file: UploadFile) -> tuple[Optional[str], Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await run_in_threadpool(self._store_upload, file)
+                except Exception as e:
+                    logger.warning("Failed to store %s: %s", file.filename, e)
+                    return None, {"filename": file.filename, "status": "failed", "error": str(e)}
+
+        results = []
+        uploaded: dict[str, Dict[str, Any]] = {}
+        for file_hash, file_metadata in await asyncio.gather(*(store(file) for file in files)):
+            if file_metadata["status"] == "uploaded":
+                if file_hash in uploaded:
+                    # Same content twice in one batch: both wrote the same object.
+                    file_metadata = {**file_metadata, "status": "duplicate"}
+                else:
+                    uploaded[file_hash] = file_metadata
+            results.append(file_metadata)
+
+        if uploaded:
+            await run_in_threadpool(self._enqueue, list(uploaded.items()))
+        return results
+
+    def _store_upload(self, file: UploadFile) -> tuple[str, Dict[str, Any]]:
+        """Write an upload to MinIO and index it, without enqueueing it yet."""
+        # UploadFile.file is a spooled temporary file, so hashing it in chunks
+        # and handing the same stream to MinIO keeps memory flat for any size.
+        file_hash, size = hash_stream(file.file)
         file_id = f"{file_hash[:16]}"
 
+        existing = self._dedup.get(file_hash)
+        if existing is not None:
+            return file_hash, {**existing, "status": "duplicate"}
+
+        uploaded_at = datetime.now(UTC)
+        content_type = file.content_type or "application/octet-stream"
         upload_result = self._minio.upload_file(
             object_name=file_id,
-            data=contents,
-            content_type=file.content_type or "application/octet-stream",
+            data=file.file,
+            content_type=content_type,
             metadata={
                 "original_filename": file.filename or "unknown",
-                "upload_timestamp": datetime.now(UTC).isoformat()
+                "upload_timestamp": uploaded_at.isoformat()
             }
         )
+        stat = FileStat(
+            bucket_name=upload_result["bucket"],
+            object_name=file_id,
+            size=size,
+            etag=upload_result["etag"],
+            last_modified=uploaded_at,
+            content_type=content_type,
+        )
+        return file_hash, self._index_file(stat, file.filename, file.content_type)
+
+    def create_upload_session(self, filename: str, content_type: str, size: int, sha256: str) -> Dict[str, Any]:
+        """Start a presigned upload that goes straight to MinIO.
 
-        self._publisher.publish(FILES_TOPIC, file_id.encode())
+        The client uploads to a staging object of its own; completion copies
+        it to the key derived from the client-supplied SHA-256, as for proxied
+        uploads, so the presigned URLs can never write to a stored file. The
+        processor checks the content against the hash before indexing it.
+        Objects above the multipart threshold get one presigned URL per part.
+        Raises ValueError when another file already holds the key.
+        """
+        existing = self._dedup.get(sha256)
+        if existing is not None:
+            return {**existing, "status": "duplicate"}
 
-        file_metadata = {
+        file_id = sha256[:16]
+        if self._stat_file(file_id) is not None:
+            raise ValueError(f"File {file_id} already exists")
+        ttl = self._upload_sessions.ttl_seconds
+        session = UploadSession(
+            session_id=self._upload_sessions.new_id(),
+            file_id=file_id,
+            sha256=sha256,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            expires_at=(datetime.now(UTC) + timedelta(seconds=ttl)).isoformat(),
+        )
+        staging = self._upload_sessions.staging_name(session.session_id)
+        result = {
+            "session_id": session.session_id,
             "file_id": file_id,
-            "filename": file.filename,
-            "content_type": file.content_type,
-            "size": len(contents),
-            "etag": upload_result["etag"],
-            "status": "uploaded",
-            "upload_timestamp": datetime.now(UTC).isoformat()
+            "status": "pending",
+            "method": "PUT",
+            "headers": {"Content-Type": content_type},
+            "expires_at": session.expires_at,
         }
 
+        if size > settings.upload_multipart_threshold:
+            # S3 allows at most 10,000 parts of at least 5 MiB each.
+            part_size = max(settings.upload_part_size, MIN_PART_SIZE, -(-size // MAX_PARTS))
+            session.part_size = part_size
+            session.upload_id = self._staging.create_multipart_upload(staging, content_type)
+            result["part_size"] = part_size
+            result["parts"] = [
+                {
+                    "part_number": part_number,
+                    "url": self._staging.get_presigned_part_url(staging, session.upload_id, part_number, ttl),
+                }
+                for part_number in range(1, -(-size // part_size) + 1)
+            ]
+        else:
+            result["url"] = self._staging.get_presigned_put_url(staging, ttl)
+
+        self._upload_sessions.save(session)
+        return result
+
+    def complete_upload_session(
+            self,
+            session_id: str,
+            parts: Optional[list[tuple[int, str]]] = None,
+    ) -> Dict[str, Any]:
+        """Move a presigned upload into place, then record and enqueue it like a proxied upload.
+
+        Raises LookupError for unknown or expired sessions and ValueError when
+        the upload is missing or does not match the session. A missing object
+        or missing parts keep the session open so the call can be retried;
+        content of the wrong size is discarded along with the session.
+        """
+        session = self._upload_sessions.claim(session_id)
+        if session is None:
+            raise LookupError("Upload session not found or expired")
+        staging = self._upload_sessions.staging_name(session.session_id)
+
+        try:
+            if session.upload_id is not None:
+                self._complete_multipart(session, parts)
+            stat = self._staging.stat_file(staging)
+        except _IncompleteUpload as e:
+            self._upload_sessions.save(session)
+            raise ValueError(f"Upload is not complete: {e}") from e
+        except S3Error as e:
+            if e.code == "NoSuchUpload":
+                raise LookupError("Upload session not found or expired") from e
+            self._upload_sessions.save(session)
+            if e.code in ("NoSuchKey", "InvalidPart", "InvalidPartOrder"):
+                raise ValueError(f"Upload is not complete: {e.code}") from e
+            raise
+
+        if stat.size != session.size:
+            self._staging.delete_file(staging)
+            raise ValueError(f"Uploaded {stat.size} bytes, expected {session.size}")
+
+        if self._stat_file(session.file_id) is not None:
+            # Another session for the same hash completed first.
+            self._staging.delete_file(staging)
+            existing = self._dedup.get(session.sha256)
+            if existing is None:
+                raise ValueError(f"File {session.file_id} already exists")
+            return {**existing, "status": "duplicate"}
+
+        # A server-side copy sets the declared Content-Type, which the
+        # processor picks an extractor from, whatever the client sent.
+        uploaded_at = datetime.now(UTC)
+        self._minio.copy_from(
+            session.file_id,
+            self._staging.bucket_name,
+            staging,
+            session.content_type,
+            {"original_filename": session.filename, "upload_timestamp": uploaded_at.isoformat()},
+        )
+        self._staging.delete_file(staging)
+        stat = self._minio.stat_file(session.file_id)
+
+        file_metadata = self._index_file(stat, session.filename, session.content_type)
+        self._enqueue([(session.sha256, file_metadata)])
         return file_metadata
 
-    async def get_file(self, file_id: str) -> FileStat:
-        return self._minio.stat_file(file_id)
+    def _complete_multipart(self, session: UploadSession, parts: Optional[list[tuple[int, str]]]) -> None:
+        if not parts:
+            raise _IncompleteUpload("multipart uploads must list their parts")
+        staging = self._upload_sessions.staging_name(session.session_id)
+        uploaded = self._staging.multipart_upload_size(staging, session.upload_id)
+        if uploaded < session.size:
+            raise _IncompleteUpload(f"{uploaded} of {session.size} bytes")
+        if uploaded > session.size:
+            self._abort_multipart(staging, session.upload_id)
+            raise ValueError(f"Uploaded {uploaded} bytes, expected {session.size}")
+        self._staging.complete_multipart_upload(staging, session.upload_id, parts)
+
+    def _abort_multipart(self, staging: str, upload_id: str) -> None:
+        try:
+            self._staging.abort_multipart_upload(staging, upload_id)
+        except S3Error as e:
+            # Already completed or aborted: nothing is left to clean up.
+            if e.code != "NoSuchUpload":
+                raise
+
+    def abort_expired_uploads(self) -> int:
+        """Remove the staging objects and multipart parts of expired sessions.
 
-    async def delete_file(self, file_id: str) -> Dict[str, Any]:
-        self._minio.delete_file(file_id)
+        Returns how many sessions were cleaned up.
+        """
+        cleaned = 0
+        while expired := self._upload_sessions.expired():
+            for session_id, upload_id in expired:
+                staging = self._upload_sessions.staging_name(session_id)
+                if upload_id is not None:
+                    self._abort_multipart(staging, upload_id)
+                self._staging.delete_file(staging)
+                self._upload_sessions.forget(session_id, upload_id)
+                cleaned += 1
+        if cleaned:
+            logger.info("Cleaned up expired upload sessions", extra={"count": cleaned})
+        return cleaned
 
+    def _index_file(self, stat: FileStat, filename: Optional[str], content_type: Optional[str]) -> Dict[str, Any]:
+        """Add a stored object to the listing and stat caches and describe it."""
+        self._file_index.add(stat)
+        self._stat_cache.set(stat)
         return {
-            "file_id": file_id,
-            "status": "deleted",
+            "file_id": stat.object_name,
+            "filename": filename,
+            "content_type": content_type,
+            "size": stat.size,
+            "etag": stat.etag,
+            "status": "uploaded",
+            "upload_timestamp": stat.last_modified.isoformat()
+        }
+
+    def _enqueue(self, uploads: list[tuple[str, Dict[str, Any]]]) -> None:
+        """Publish new files for processing, then record them for dedup.
+
+        Recording comes last so a failed publish leaves the content
+        re-uploadable instead of reported as a duplicate forever.
+        """
+        self._publisher.publish_many(FILES_TOPIC, [metadata["file_id"].encode() for _, metadata in uploads])
+        for file_hash, metadata in uploads:
+            self._dedup.record(file_hash, metadata["file_id"], metadata)
+
+    async def get_file(self, file_id: str) -> Optional[FileStat]:
+        """Return the file's metadata, or None when it does not exist."""
+        if not self._async_storage:
+            hit, stat = await run_in_threadpool(self._stat_cache.get, file_id)
+            if hit:
+                return stat
+            return await run_in_threadpool(self._stat_file, file_id)
+
+        hit, stat = await self._stat_cache.get_async(file_id)
+        if hit:
+            return stat
+        try:
+            stat = await self._async_minio.stat_file(file_id)
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                raise
+            await self._stat_cache.set_missing_async(file_id)
+            return None
+        await self._stat_cache.set_async(stat)
+        return stat
+
+    def _stat_file(self, file_id: str) -> Optional[FileStat]:
+        try:
+            stat = self._minio.stat_file(file_id)
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                raise
+            self._stat_cache.set_missing(file_id)
+            return None
+        self._stat_cache.set(stat)
+        return stat
+
+    async def delete_files(self, file_ids: list[str]) -> Dict[str, Any]:
+        """Delete files from storage and drop their cached metadata.
+
+        Objects are removed with multi-object DELETE requests. The ``deleted``
+        ids are then published to the deletions stream, whose consumer in the
+        processor removes their vectors and text artifacts, retrying on
+        failure, so the request does not wait on Qdrant. A publish failure
+        fails the call; retrying it is safe, as missing objects count as
+        deleted.
+        """
+        file_ids = list(dict.fromkeys(file_ids))
+        if self._async_storage:
+            errors = await self._async_minio.delete_files(file_ids)
+            deleted = [file_id for file_id in file_ids if file_id not in errors]
+            if deleted:
+                await self._file_index.remove_async(*deleted)
+                await self._stat_cache.invalidate_async(*deleted)
+                await self._dedup.forget_async(*deleted)
+                await self._search_cache.invalidate_async()
+                await self._async_publisher.publish_many(
+                    FILES_DELETED_TOPIC, [file_id.encode() for file_id in deleted]
+                )
+        else:
+            errors = await run_in_threadpool(self._delete_files, file_ids)
+            deleted = [file_id for file_id in file_ids if file_id not in errors]
+
+        return {
+            "deleted": deleted,
+            "failed": [{"file_id": file_id, "error": code} for file_id, code in errors.items()],
         }
 
-    async def list_files(self, skip: int = 0, limit: int = 10) -> Dict[str, Any]:
-        all_files = self._minio.list_files()
-        total = len(all_files)
-        paginated_files = all_files[skip:skip + limit]
+    def _delete_files(self, file_ids: list[str]) -> dict[str, str]:
+        errors = self._minio.delete_files(file_ids)
+        deleted = [file_id for file_id in file_ids if file_id not in errors]
+        if deleted:
+            self._file_index.remove(*deleted)
+            self._stat_cache.invalidate(*deleted)
+            self._dedup.forget(*deleted)
+            self._search_cache.invalidate()
+            self._publish_deleted(deleted)
+        return errors
+
+    def _publish_deleted(self, file_ids: list[str]) -> None:
+        self._publisher.publish_many(FILES_DELETED_TOPIC, [file_id.encode() for file_id in file_ids])
+
+    async def list_files(self, cursor: Optional[str] = None, limit: int = 10) -> Dict[str, Any]:
+        if settings.file_index_enabled:
+            if self._async_storage:
+                files, next_cursor = await self._file_index.page_async(cursor=cursor, limit=limit)
+                total = await self._file_index.total_async()
+            else:
+                files, next_cursor = await run_in_threadpool(self._file_index.page, cursor=cursor, limit=limit)
+                total = await run_in_threadpool(self._file_index.total)
+        else:
+            # Stream the listing in key order and stop after one page; the
+            # total is unknown without walking the whole bucket.
+            if self._async_storage:
+                page = await self._async_minio.list_page(start_after=cursor, limit=limit + 1)
+            else:
+                page = await run_in_threadpool(
+                    lambda: list(islice(self._minio.iter_files(start_after=cursor), limit + 1))
+                )
+            files = page[:limit]
+            next_cursor = files[-1].object_name if len(page) > limit else None
+            total = None
 
         return {
-            "files": paginated_files,
+            "files": files,
             "total": total,
-            "skip": skip,
             "limit": limit,
-            "has_more": (skip + limit) < total
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None
         }
+
+
+def hash_stream(stream: BinaryIO, chunk_size: int | None = None) -> tuple[str, int]:
+    """Compute the SHA-256 digest and size of a seekable stream in fixed-size chunks.
+
+    The stream is rewound to the start afterwards so it can be read again.
+    """
+    chunk_size = chunk_size or settings.upload_chunk_size
+    digest = hashlib.sha256()
+    size = 0
+
+    stream.seek(0)
+    while chunk := stream.read(chunk_size):
+        digest.update(chunk)
+        size += len(chunk)
+    stream.seek(0)
+
+    return digest.hexdigest(), size
+
+
+class _IncompleteUpload(Exception):
+    """The client has not uploaded everything yet; the session stays open."""
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.packages.embeddings import load_embedding_model
+
+
+class QueryEncoder:
+    """Shared query embedding model for the API process.
+
+    The model is loaded once, by ``start`` or by the first ``encode``. Concurrent ``encode`` calls are
+    queued and encoded together: the worker takes the first waiting query,
+    collects more for up to ``max_wait_ms`` or ``max_batch_size`` queries, and
+    runs a single ``encode`` call in a thread for the whole batch.
+    """
+    model_name: str
+
+    def __init__(
+            self,
+            model_name: str,
+            backend: Optional[str] = None,
+            max_batch_size: int = 32,
+            max_wait_ms: float = 2,
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._model: Any = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._worker is not None
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._worker is not None:
+                return
+            started = time.perf_counter()
+            self._model = await asyncio.to_thread(self._load)
+            self.load_seconds = time.perf_counter() - started
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def encode(self, query: str) -> np.ndarray:
+        if self._queue is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, future))
+        return await future
+
+    def _load(self):
+        model = load_embedding_model(backend=self.backend, model_name=self.model_name)
+        # The first call initializes kernels and buffers; do it before traffic.
+        model.encode(["warmup"], show_progress_bar=False)
+        return model
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            queries = [query for query, _ in batch]
+            try:
+                vectors = await asyncio.to_thread(
+                    self._model.encode,
+                    queries,
+                    batch_size=len(queries),
+                    show_progress_bar=False,
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+
+query_encoder = QueryEncoder(
+    model_name=settings.embedding_model,
+    backend=settings.embedding_backend,
+    max_batch_size=settings.search_max_batch_size,
+    max_wait_ms=settings.search_max_wait_ms,
+)
@@ -0,0 +1,76 @@
+from typing import TYPE_CHECKING, Dict, Any, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.packages.cache import SearchCache, normalize_query, redis_client, async_redis_client
+from app.handlers.services.query_encoder import QueryEncoder, query_encoder
+
+if TYPE_CHECKING:
+    from app.packages.storage import QdrantVectorStore, AsyncQdrantVectorStore
+
+
+class SearchService:
+    _encoder: QueryEncoder
+    _store: "QdrantVectorStore"
+    _async_store: "AsyncQdrantVectorStore"
+    _cache: SearchCache
+    _async_storage: bool
+
+    def __init__(self, async_storage: Optional[bool] = None):
+        from app.packages.storage import qdrant_store, async_qdrant_store
+
+        self._encoder = query_encoder
+        self._store = qdrant_store
+        self._async_store = async_qdrant_store
+        self._cache = SearchCache(
+            redis_client,
+            ttl_seconds=settings.search_cache_ttl_seconds,
+            async_redis=async_redis_client,
+        )
+        self._async_storage = settings.async_storage if async_storage is None else async_storage
+
+    async def search(
+            self,
+            query: str,
+            file_id: Optional[str] = None,
+            limit: int = 5,
+            with_text: bool = True,
+    ) -> Dict[str, Any]:
+        # The cache key is built from exactly the text the encoder sees, so
+        # only queries with the same embedding share an entry.
+        query = normalize_query(query)
+        if self._async_storage:
+            results = await self._cache.get_async(query, file_id, limit, with_text)
+        else:
+            results = await run_in_threadpool(self._cache.get, query, file_id, limit, with_text)
+        cached = results is not None
+        if not cached:
+            embedding = await self._encoder.encode(query)
+            if self._async_storage:
+                results = await self._async_store.search(
+                    query_embedding=embedding,
+                    limit=limit,
+                    file_id=file_id,
+                    with_text=with_text,
+                )
+            else:
+                results = await run_in_threadpool(
+                    self._store.search,
+                    query_embedding=embedding,
+                    limit=limit,
+                    file_id=file_id,
+                    with_text=with_text,
+                )
+            results = [{**result, "id": str(result["id"])} for result in results]
+            if self._async_storage:
+                await self._cache.set_async(query, file_id, limit, results, with_text)
+            else:
+                await run_in_threadpool(self._cache.set, query, file_id, limit, results, with_text)
+
+        return {
+            "query": query,
+            "file_id": file_id,
+            "results": results,
+            "cached": cached,
+        }
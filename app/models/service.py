@@ -1,6 +1,6 @@
 from typing import TypeVar, Generic
 from fastapi import File, UploadFile, status
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 T = TypeVar('T')
 
@@ -32,8 +32,42 @@ class UploadFileRequest:
         self.file = file
 
 
+class UploadBatchRequest:
+    files: list[UploadFile]
+
+    def __init__(self, files: list[UploadFile] = File(...)):
+        self.files = files
+
+
 class GetFileRequest:
     file_id: str
 
     def __init__(self, file_id: str):
         self.file_id = file_id
+
+
+class SearchRequest(BaseModel):
+    query: str = Field(..., min_length=1)
+    file_id: str | None = None
+    limit: int = Field(default=5, ge=1, le=50)
+    with_text: bool = True
+
+
+class DeleteFilesRequest(BaseModel):
+    file_ids: list[str] = Field(..., min_length=1, max_length=1000)
+
+
+class CreateUploadRequest(BaseModel):
+    filename: str = Field(..., min_length=1)
+    content_type: str = "application/octet-stream"
+    size: int = Field(..., gt=0)
+    sha256: str = Field(..., pattern=r"^[0-9a-f]{64}$")
+
+
+class UploadPart(BaseModel):
+    part_number: int = Field(..., ge=1, le=10000)
+    etag: str
+
+
+class CompleteUploadRequest(BaseModel):
+    parts: list[UploadPart] | None = None
@@ -1,3 +1,23 @@
-from app.packages.cache.redis import RedisClient, redis_client
+from app.packages.cache.redis import RedisClient, redis_client, AsyncRedisClient, async_redis_client
+from app.packages.cache.dedup import DedupIndex
+from app.packages.cache.embeddings import EmbeddingCache
+from app.packages.cache.search import SearchCache, normalize_query
+from app.packages.cache.file_index import FileIndex
+from app.packages.cache.file_stat import FileStatCache, file_stat_cache
+from app.packages.cache.upload_sessions import UploadSession, UploadSessionStore
 
-__all__ = ["RedisClient", "redis_client"]
+__all__ = [
+    "RedisClient",
+    "redis_client",
+    "AsyncRedisClient",
+    "async_redis_client",
+    "DedupIndex",
+    "EmbeddingCache",
+    "SearchCache",
+    "normalize_query",
+    "FileIndex",
+    "FileStatCache",
+    "file_stat_cache",
+    "UploadSession",
+    "UploadSessionStore",
+]
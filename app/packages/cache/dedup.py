@@ -0,0 +1,68 @@
+import json
+from typing import Optional
+
+from app.packages.cache.redis import RedisClient, AsyncRedisClient
+from app.packages.constants.constants import (
+    DEDUP_HASH_KEY_PREFIX,
+    DEDUP_FILE_KEY_PREFIX,
+    INDEXED_FILES_KEY,
+)
+
+
+class DedupIndex:
+    """Content-addressed index of uploaded files, keyed on the full SHA-256.
+
+    Upload metadata is stored under the content hash, with a reverse entry
+    from file id to hash so deletes can drop both. A separate set tracks the
+    file ids whose chunks have already been embedded and stored.
+    """
+    _redis: RedisClient
+    _async_redis: Optional[AsyncRedisClient]
+
+    def __init__(self, redis: RedisClient, async_redis: Optional[AsyncRedisClient] = None):
+        self._redis = redis
+        self._async_redis = async_redis
+
+    def get(self, file_hash: str) -> Optional[dict]:
+        return self._redis.get_json(self._hash_key(file_hash))
+
+    def file_hash(self, file_id: str) -> Optional[str]:
+        """The full SHA-256 recorded for ``file_id``, if any."""
+        # MGET: with the lazy client singleton, ``get`` is the proxy's own.
+        [file_hash] = self._redis.mget(self._file_key(file_id))
+        return file_hash
+
+    def record(self, file_hash: str, file_id: str, metadata: dict) -> bool:
+        recorded = self._redis.set(self._hash_key(file_hash), json.dumps(metadata), nx=True)
+        self._redis.set(self._file_key(file_id), file_hash)
+        return bool(recorded)
+
+    def forget(self, *file_ids: str) -> None:
+        if not file_ids:
+            return
+        file_keys = [self._file_key(file_id) for file_id in file_ids]
+        file_hashes = self._redis.mget(*file_keys)
+        self._redis.delete(*file_keys, *[self._hash_key(h) for h in file_hashes if h])
+        self._redis.srem(INDEXED_FILES_KEY, *file_ids)
+
+    async def forget_async(self, *file_ids: str) -> None:
+        if not file_ids:
+            return
+        file_keys = [self._file_key(file_id) for file_id in file_ids]
+        file_hashes = await self._async_redis.mget(*file_keys)
+        await self._async_redis.delete(*file_keys, *[self._hash_key(h) for h in file_hashes if h])
+        await self._async_redis.srem(INDEXED_FILES_KEY, *file_ids)
+
+    def is_indexed(self, file_id: str) -> bool:
+        return self._redis.sismember(INDEXED_FILES_KEY, file_id)
+
+    def mark_indexed(self, file_id: str) -> None:
+        self._redis.sadd(INDEXED_FILES_KEY, file_id)
+
+    @staticmethod
+    def _hash_key(file_hash: str) -> str:
+        return f"{DEDUP_HASH_KEY_PREFIX}:{file_hash}"
+
+    @staticmethod
+    def _file_key(file_id: str) -> str:
+        return f"{DEDUP_FILE_KEY_PREFIX}:{file_id}"
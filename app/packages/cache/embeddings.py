@@ -0,0 +1,109 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import redis
+
+from app.packages.constants.constants import EMBEDDING_CACHE_KEY_PREFIX
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Two-tier cache of chunk embeddings keyed by (model name, text hash).
+
+    The first tier is a bounded in-process LRU. The second is Redis holding raw
+    vector bytes, so ``redis`` must be a connection created with
+    ``decode_responses=False``.
+    """
+    model_name: str
+
+    def __init__(
+            self,
+            model_name: str,
+            redis: Optional[redis.Redis] = None,
+            max_entries: int = 50000,
+            ttl_seconds: Optional[int] = None,
+            dtype: str = "float16",
+    ):
+        self.model_name = model_name
+        self._redis = redis
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._dtype = np.dtype(dtype)
+        self._local: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    def get_many(self, texts: list[str]) -> list[Optional[np.ndarray]]:
+        keys = [self._key(text) for text in texts]
+        results: list[Optional[np.ndarray]] = [None] * len(texts)
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._local.get(key)
+                if vector is not None:
+                    self._local.move_to_end(key)
+                    results[i] = vector
+                    self._stats["local_hits"] += 1
+
+        missing = [i for i, vector in enumerate(results) if vector is None]
+        if missing and self._redis is not None:
+            try:
+                values = self._redis.mget([keys[i] for i in missing])
+            except redis.RedisError as e:
+                logger.warning("Embedding cache lookup failed: %s", e)
+                values = [None] * len(missing)
+
+            found = {}
+            for i, value in zip(missing, values):
+                if value is not None:
+                    vector = np.frombuffer(value, dtype=self._dtype).astype(np.float32)
+                    results[i] = vector
+                    found[keys[i]] = vector
+            self._remember(found)
+            with self._lock:
+                self._stats["redis_hits"] += len(found)
+
+        with self._lock:
+            self._stats["misses"] += sum(1 for vector in results if vector is None)
+        return results
+
+    def put_many(self, texts: list[str], vectors: np.ndarray) -> None:
+        entries = {self._key(text): np.asarray(vector, dtype=np.float32) for text, vector in zip(texts, vectors)}
+        self._remember(entries)
+
+        if self._redis is None or not entries:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for key, vector in entries.items():
+                pipe.set(key, vector.astype(self._dtype).tobytes(), ex=self._ttl_seconds)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Embedding cache write failed: %s", e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["local_entries"] = len(self._local)
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_ratio"] = (lookups - stats["misses"]) / lookups if lookups else 0.0
+        return stats
+
+    def _remember(self, entries: dict[str, np.ndarray]) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            for key, vector in entries.items():
+                self._local[key] = vector
+                self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        return f"{EMBEDDING_CACHE_KEY_PREFIX}:{self.model_name}:{digest}"
@@ -0,0 +1,142 @@
+from typing import Iterable, Optional
+
+from redis import Redis
+import redis.asyncio
+
+from app.packages.constants.constants import FILE_INDEX_BY_TIME_KEY, FILE_INDEX_METADATA_KEY
+from app.packages.storage.minio import FileStat
+
+
+class FileIndex:
+    """Redis index of stored files for cursor pagination.
+
+    A sorted set orders file ids by upload time in milliseconds, and a hash
+    maps each id to its ``FileStat`` JSON. A page is one ZREVRANGEBYSCORE plus
+    one HMGET, and the total is a ZCARD.
+    """
+    redis: Redis
+    async_redis: Optional[redis.asyncio.Redis]
+
+    def __init__(self, redis: Redis, async_redis: Optional[redis.asyncio.Redis] = None):
+        self.redis = redis
+        self.async_redis = async_redis
+
+    def add(self, stat: FileStat) -> None:
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.zadd(FILE_INDEX_BY_TIME_KEY, {stat.object_name: _score(stat)})
+        pipe.hset(FILE_INDEX_METADATA_KEY, stat.object_name, stat.model_dump_json())
+        pipe.execute()
+
+    def remove(self, *file_ids: str) -> None:
+        if not file_ids:
+            return
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.zrem(FILE_INDEX_BY_TIME_KEY, *file_ids)
+        pipe.hdel(FILE_INDEX_METADATA_KEY, *file_ids)
+        pipe.execute()
+
+    async def remove_async(self, *file_ids: str) -> None:
+        if not file_ids:
+            return
+        pipe = self.async_redis.pipeline(transaction=True)
+        pipe.zrem(FILE_INDEX_BY_TIME_KEY, *file_ids)
+        pipe.hdel(FILE_INDEX_METADATA_KEY, *file_ids)
+        await pipe.execute()
+
+    def get(self, file_id: str) -> Optional[FileStat]:
+        value = self.redis.hget(FILE_INDEX_METADATA_KEY, file_id)
+        return FileStat.model_validate_json(value) if value else None
+
+    def total(self) -> int:
+        return self.redis.zcard(FILE_INDEX_BY_TIME_KEY)
+
+    async def total_async(self) -> int:
+        return await self.async_redis.zcard(FILE_INDEX_BY_TIME_KEY)
+
+    def page(self, cursor: Optional[str] = None, limit: int = 10) -> tuple[list[FileStat], Optional[str]]:
+        """Return up to ``limit`` files older than ``cursor``, newest first, and the next cursor."""
+        max_score, after = _page_bounds(cursor)
+        entries: list[tuple[str, int]] = []
+        offset = 0
+        while len(entries) <= limit:
+            batch = self.redis.zrevrangebyscore(
+                FILE_INDEX_BY_TIME_KEY, max_score, "-inf", start=offset, num=limit + 1, withscores=True,
+            )
+            if not batch:
+                break
+            offset += len(batch)
+            entries.extend(_entries_after(batch, after))
+
+        entries, next_cursor = _trim_page(entries, limit)
+        if not entries:
+            return [], None
+        values = self.redis.hmget(FILE_INDEX_METADATA_KEY, [member for member, _ in entries])
+        return [FileStat.model_validate_json(value) for value in values if value], next_cursor
+
+    async def page_async(self, cursor: Optional[str] = None, limit: int = 10) -> tuple[list[FileStat], Optional[str]]:
+        max_score, after = _page_bounds(cursor)
+        entries: list[tuple[str, int]] = []
+        offset = 0
+        while len(entries) <= limit:
+            batch = await self.async_redis.zrevrangebyscore(
+                FILE_INDEX_BY_TIME_KEY, max_score, "-inf", start=offset, num=limit + 1, withscores=True,
+            )
+            if not batch:
+                break
+            offset += len(batch)
+            entries.extend(_entries_after(batch, after))
+
+        entries, next_cursor = _trim_page(entries, limit)
+        if not entries:
+            return [], None
+        values = await self.async_redis.hmget(FILE_INDEX_METADATA_KEY, [member for member, _ in entries])
+        return [FileStat.model_validate_json(value) for value in values if value], next_cursor
+
+    def rebuild(self, stats: Iterable[FileStat], batch_size: int = 1000) -> int:
+        """Backfill the index from a stream of stats, e.g. a MinIO listing."""
+        count = 0
+        pipe = self.redis.pipeline(transaction=False)
+        for stat in stats:
+            pipe.zadd(FILE_INDEX_BY_TIME_KEY, {stat.object_name: _score(stat)})
+            pipe.hset(FILE_INDEX_METADATA_KEY, stat.object_name, stat.model_dump_json())
+            count += 1
+            if count % batch_size == 0:
+                pipe.execute()
+        pipe.execute()
+        return count
+
+
+def _score(stat: FileStat) -> int:
+    return int(stat.last_modified.timestamp() * 1000)
+
+
+def _page_bounds(cursor: Optional[str]) -> tuple[float | str, Optional[tuple[int, str]]]:
+    if not cursor:
+        return "+inf", None
+    after = _parse_cursor(cursor)
+    return after[0], after
+
+
+def _entries_after(batch: list, after: Optional[tuple[int, str]]) -> list[tuple[str, int]]:
+    # Equal scores come back in reverse lexical order; skip those at or
+    # before the cursor.
+    return [
+        (member, int(score))
+        for member, score in batch
+        if not (after and int(score) == after[0] and member >= after[1])
+    ]
+
+
+def _trim_page(entries: list[tuple[str, int]], limit: int) -> tuple[list[tuple[str, int]], Optional[str]]:
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    next_cursor = f"{entries[-1][1]}:{entries[-1][0]}" if has_more and entries else None
+    return entries, next_cursor
+
+
+def _parse_cursor(cursor: str) -> tuple[int, str]:
+    try:
+        score, file_id = cursor.split(":", 1)
+        return int(score), file_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
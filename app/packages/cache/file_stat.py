@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import settings
+from app.packages.cache.redis import RedisClient, redis_client, AsyncRedisClient, async_redis_client
+from app.packages.constants.constants import FILE_STAT_KEY_PREFIX
+from app.packages.storage.minio import FileStat
+
+_MISSING = {"missing": True}
+
+
+class FileStatCache:
+    """Read-through cache of ``FileStat`` in Redis with a tiny in-process TTL tier.
+
+    Files known not to exist are cached too, with a shorter TTL, so bursts of
+    lookups for a missing id do not all reach MinIO.
+    """
+    _redis: RedisClient
+    _async_redis: Optional[AsyncRedisClient]
+
+    def __init__(
+            self,
+            redis: RedisClient,
+            async_redis: Optional[AsyncRedisClient] = None,
+            ttl_seconds: int = 3600,
+            negative_ttl_seconds: int = 30,
+            local_ttl_seconds: float = 2,
+            local_max_entries: int = 10000,
+    ):
+        self._redis = redis
+        self._async_redis = async_redis
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+        self.local_max_entries = local_max_entries
+        self._local: OrderedDict[str, tuple[float, Optional[FileStat]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_id: str) -> tuple[bool, Optional[FileStat]]:
+        """Return ``(hit, stat)``; a hit with ``stat=None`` means the file is known missing."""
+        entry = self._recall(file_id)
+        if entry is not None:
+            return True, entry[1]
+        return self._hydrate(file_id, self._redis.get_json(self._key(file_id)))
+
+    async def get_async(self, file_id: str) -> tuple[bool, Optional[FileStat]]:
+        entry = self._recall(file_id)
+        if entry is not None:
+            return True, entry[1]
+        return self._hydrate(file_id, await self._async_redis.get_json(self._key(file_id)))
+
+    def set(self, stat: FileStat) -> None:
+        self._redis.set_json(self._key(stat.object_name), stat.model_dump(mode="json"), ex=self.ttl_seconds)
+        self._remember(stat.object_name, stat)
+
+    def set_missing(self, file_id: str) -> None:
+        self._redis.set_json(self._key(file_id), _MISSING, ex=self.negative_ttl_seconds)
+        self._remember(file_id, None)
+
+    async def set_async(self, stat: FileStat) -> None:
+        await self._async_redis.set_json(self._key(stat.object_name), stat.model_dump(mode="json"), ex=self.ttl_seconds)
+        self._remember(stat.object_name, stat)
+
+    async def set_missing_async(self, file_id: str) -> None:
+        await self._async_redis.set_json(self._key(file_id), _MISSING, ex=self.negative_ttl_seconds)
+        self._remember(file_id, None)
+
+    def invalidate(self, *file_ids: str) -> None:
+        if not file_ids:
+            return
+        self._redis.delete(*[self._key(file_id) for file_id in file_ids])
+        self._forget(file_ids)
+
+    async def invalidate_async(self, *file_ids: str) -> None:
+        if not file_ids:
+            return
+        await self._async_redis.delete(*[self._key(file_id) for file_id in file_ids])
+        self._forget(file_ids)
+
+    def _recall(self, file_id: str) -> Optional[tuple[float, Optional[FileStat]]]:
+        with self._lock:
+            entry = self._local.get(file_id)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    return entry
+                del self._local[file_id]
+        return None
+
+    def _hydrate(self, file_id: str, value: Optional[dict]) -> tuple[bool, Optional[FileStat]]:
+        if value is None:
+            return False, None
+        stat = None if value == _MISSING else FileStat.model_validate(value)
+        self._remember(file_id, stat)
+        return True, stat
+
+    def _forget(self, file_ids: tuple[str, ...]) -> None:
+        with self._lock:
+            for file_id in file_ids:
+                self._local.pop(file_id, None)
+
+    def _remember(self, file_id: str, stat: Optional[FileStat]) -> None:
+        if self.local_ttl_seconds <= 0 or self.local_max_entries <= 0:
+            return
+        with self._lock:
+            self._local[file_id] = (time.monotonic() + self.local_ttl_seconds, stat)
+            self._local.move_to_end(file_id)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    @staticmethod
+    def _key(file_id: str) -> str:
+        return f"{FILE_STAT_KEY_PREFIX}:{file_id}"
+
+
+file_stat_cache = FileStatCache(
+    redis=redis_client,
+    async_redis=async_redis_client,
+    ttl_seconds=settings.file_stat_cache_ttl_seconds,
+    negative_ttl_seconds=settings.file_stat_negative_ttl_seconds,
+    local_ttl_seconds=settings.file_stat_local_ttl_seconds,
+    local_max_entries=settings.file_stat_local_max_entries,
+)
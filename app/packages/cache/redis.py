@@ -1,6 +1,8 @@
 import redis
+import redis.asyncio
 from typing import Any, Optional
-from app.packages.infrastructure.redis import redis_cli
+from app.packages.infrastructure.lazy import Lazy
+from app.packages.infrastructure.redis import redis_cli, redis_async_cli
 import json
 
 
@@ -11,7 +13,7 @@ class RedisClient:
         self._initialize()
 
     def _initialize(self):
-        self.client = redis_cli
+        self.client = redis_cli.get()
         self._test_connection()
 
     def _test_connection(self) -> None:
@@ -62,6 +64,12 @@ class RedisClient:
         except (json.JSONEncodeError, redis.RedisError) as e:
             raise Exception(f"Failed to set JSON key '{key}': {e}")
 
+    def mget(self, *keys: str) -> list[Optional[str]]:
+        try:
+            return self.client.mget(keys)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to get keys: {e}")
+
     def delete(self, *keys: str) -> int:
         try:
             return self.client.delete(*keys)
@@ -98,6 +106,42 @@ class RedisClient:
         except redis.RedisError as e:
             raise Exception(f"Failed to decrement key '{key}': {e}")
 
+    def sadd(self, key: str, *members: str) -> int:
+        try:
+            return self.client.sadd(key, *members)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to add members to set '{key}': {e}")
+
+    def srem(self, key: str, *members: str) -> int:
+        try:
+            return self.client.srem(key, *members)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to remove members from set '{key}': {e}")
+
+    def sismember(self, key: str, member: str) -> bool:
+        try:
+            return bool(self.client.sismember(key, member))
+        except redis.RedisError as e:
+            raise Exception(f"Failed to check membership of set '{key}': {e}")
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        try:
+            return self.client.zadd(key, mapping)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to add members to sorted set '{key}': {e}")
+
+    def zrangebyscore(self, key: str, min_score: float, max_score: float, count: Optional[int] = None) -> list[str]:
+        try:
+            return self.client.zrangebyscore(key, min_score, max_score, start=0 if count else None, num=count)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to read sorted set '{key}': {e}")
+
+    def zrem(self, key: str, *members: str) -> int:
+        try:
+            return self.client.zrem(key, *members)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to remove members from sorted set '{key}': {e}")
+
     def flush_db(self) -> bool:
         try:
             return self.client.flushdb()
@@ -117,4 +161,89 @@ class RedisClient:
             return False
 
 
-redis_client = RedisClient()
+redis_client: Lazy[RedisClient] = Lazy("redis_client", RedisClient)
+
+
+class AsyncRedisClient:
+    """Event-loop counterpart of RedisClient backed by redis.asyncio."""
+    client: redis.asyncio.Redis
+
+    def __init__(self):
+        self.client = redis_async_cli.get()
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await self.client.get(key)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to get key '{key}': {e}")
+
+    async def get_json(self, key: str) -> Optional[dict | list]:
+        value = await self.get(key)
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return None
+
+    async def set(
+            self,
+            key: str,
+            value: Any,
+            ex: Optional[int] = None,
+            px: Optional[int] = None,
+            nx: bool = False,
+            xx: bool = False
+    ) -> bool:
+        try:
+            return await self.client.set(key, value, ex=ex, px=px, nx=nx, xx=xx)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to set key '{key}': {e}")
+
+    async def set_json(
+            self,
+            key: str,
+            value: dict | list,
+            ex: Optional[int] = None,
+            px: Optional[int] = None
+    ) -> bool:
+        return await self.set(key, json.dumps(value), ex=ex, px=px)
+
+    async def mget(self, *keys: str) -> list[Optional[str]]:
+        try:
+            return await self.client.mget(keys)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to get keys: {e}")
+
+    async def delete(self, *keys: str) -> int:
+        try:
+            return await self.client.delete(*keys)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to delete keys: {e}")
+
+    async def exists(self, *keys: str) -> int:
+        try:
+            return await self.client.exists(*keys)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to check key existence: {e}")
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        try:
+            return await self.client.incr(key, amount)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to increment key '{key}': {e}")
+
+    async def srem(self, key: str, *members: str) -> int:
+        try:
+            return await self.client.srem(key, *members)
+        except redis.RedisError as e:
+            raise Exception(f"Failed to remove members from set '{key}': {e}")
+
+    async def ping(self) -> bool:
+        try:
+            return await self.client.ping()
+        except redis.RedisError:
+            return False
+
+
+async_redis_client: Lazy[AsyncRedisClient] = Lazy("async_redis_client", AsyncRedisClient)
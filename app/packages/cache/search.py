@@ -0,0 +1,74 @@
+import hashlib
+import json
+from typing import Optional
+
+from app.packages.cache.redis import RedisClient, AsyncRedisClient
+from app.packages.constants.constants import SEARCH_CACHE_KEY_PREFIX, SEARCH_GENERATION_KEY
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace only; case can change the embedding of a cased model."""
+    return " ".join(query.split())
+
+
+class SearchCache:
+    """Redis cache of search results keyed by query, filter, limit and text flag.
+
+    Keys embed a generation counter, so bumping it with ``invalidate`` retires
+    every cached result at once; old entries simply expire.
+    """
+    _redis: RedisClient
+    _async_redis: Optional[AsyncRedisClient]
+    ttl_seconds: int
+
+    def __init__(self, redis: RedisClient, ttl_seconds: int = 300, async_redis: Optional[AsyncRedisClient] = None):
+        self._redis = redis
+        self._async_redis = async_redis
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, query: str, file_id: Optional[str], limit: int, with_text: bool = True) -> Optional[list]:
+        return self._redis.get_json(self._key(query, file_id, limit, with_text))
+
+    def set(self, query: str, file_id: Optional[str], limit: int, results: list, with_text: bool = True) -> None:
+        self._redis.set_json(self._key(query, file_id, limit, with_text), results, ex=self.ttl_seconds)
+
+    def invalidate(self) -> None:
+        self._redis.incr(SEARCH_GENERATION_KEY)
+
+    async def get_async(
+            self,
+            query: str,
+            file_id: Optional[str],
+            limit: int,
+            with_text: bool = True,
+    ) -> Optional[list]:
+        return await self._async_redis.get_json(await self._key_async(query, file_id, limit, with_text))
+
+    async def set_async(
+            self,
+            query: str,
+            file_id: Optional[str],
+            limit: int,
+            results: list,
+            with_text: bool = True,
+    ) -> None:
+        key = await self._key_async(query, file_id, limit, with_text)
+        await self._async_redis.set_json(key, results, ex=self.ttl_seconds)
+
+    async def invalidate_async(self) -> None:
+        await self._async_redis.incr(SEARCH_GENERATION_KEY)
+
+    # MGET rather than GET: the clients are usually lazy singletons, whose own
+    # ``get`` returns the client instead of reading a key.
+    def _key(self, query: str, file_id: Optional[str], limit: int, with_text: bool) -> str:
+        [generation] = self._redis.mget(SEARCH_GENERATION_KEY)
+        return self._build_key(generation, query, file_id, limit, with_text)
+
+    async def _key_async(self, query: str, file_id: Optional[str], limit: int, with_text: bool) -> str:
+        [generation] = await self._async_redis.mget(SEARCH_GENERATION_KEY)
+        return self._build_key(generation, query, file_id, limit, with_text)
+
+    @staticmethod
+    def _build_key(generation: Optional[str], query: str, file_id: Optional[str], limit: int, with_text: bool) -> str:
+        digest = hashlib.sha256(json.dumps([query, file_id, limit, with_text]).encode()).hexdigest()
+        return f"{SEARCH_CACHE_KEY_PREFIX}:{generation or '0'}:{digest}"
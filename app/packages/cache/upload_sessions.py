@@ -0,0 +1,85 @@
+import math
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.packages.cache.redis import RedisClient
+from app.packages.constants.constants import UPLOAD_SESSION_KEY_PREFIX, UPLOAD_STAGING_KEY
+
+# Presigned uploads land here, in the artifacts bucket, until completion
+# copies them to their file id.
+STAGING_PREFIX = "uploads"
+
+
+class UploadSession(BaseModel):
+    session_id: str
+    file_id: str
+    sha256: str
+    filename: str
+    content_type: str
+    size: int
+    upload_id: Optional[str] = None
+    part_size: Optional[int] = None
+    expires_at: str
+
+
+class UploadSessionStore:
+    """Pending presigned uploads, kept in Redis until completed or expired.
+
+    Every session is also listed in a sorted set by expiry, because its staging
+    object and multipart parts outlive the session key and have to be removed
+    explicitly. Entries stay listed after completion: the presigned URLs remain
+    valid until expiry, so anything uploaded with them late is cleaned up too.
+    """
+    _redis: RedisClient
+
+    def __init__(self, redis: RedisClient, ttl_seconds: int = 3600):
+        self._redis = redis
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def staging_name(session_id: str) -> str:
+        return f"{STAGING_PREFIX}/{session_id}"
+
+    def save(self, session: UploadSession) -> None:
+        # The key expires with the session, never after its cleanup entry, so
+        # a session still in Redis always has its upload intact.
+        expires_at = datetime.fromisoformat(session.expires_at).timestamp()
+        ttl = max(1, math.floor(expires_at - time.time()))
+        self._redis.set_json(self._key(session.session_id), session.model_dump(mode="json"), ex=ttl)
+        self._redis.zadd(UPLOAD_STAGING_KEY, {_staging_member(session.session_id, session.upload_id): expires_at})
+
+    def expired(self, limit: int = 100) -> list[tuple[str, Optional[str]]]:
+        """``(session_id, upload_id)`` of expired sessions; ``upload_id`` is None unless multipart."""
+        members = self._redis.zrangebyscore(UPLOAD_STAGING_KEY, "-inf", time.time(), count=limit)
+        return [(session_id, upload_id or None) for session_id, _, upload_id in (m.partition(":") for m in members)]
+
+    def forget(self, session_id: str, upload_id: Optional[str]) -> None:
+        self._redis.zrem(UPLOAD_STAGING_KEY, _staging_member(session_id, upload_id))
+
+    def get(self, session_id: str) -> Optional[UploadSession]:
+        value = self._redis.get_json(self._key(session_id))
+        return UploadSession.model_validate(value) if value is not None else None
+
+    def claim(self, session_id: str) -> Optional[UploadSession]:
+        """Remove and return the session, so only one completion call proceeds."""
+        session = self.get(session_id)
+        if session is None or not self._redis.delete(self._key(session_id)):
+            return None
+        return session
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"{UPLOAD_SESSION_KEY_PREFIX}:{session_id}"
+
+
+def _staging_member(session_id: str, upload_id: Optional[str]) -> str:
+    # Session ids are hex, so the first colon always ends them.
+    return f"{session_id}:{upload_id or ''}"
@@ -1 +1,14 @@
-FILES_TOPIC = "analytics.files"
\ No newline at end of file
+FILES_TOPIC = "analytics.files"
+FILES_DELETED_TOPIC = "analytics.files.deleted"
+DEDUP_HASH_KEY_PREFIX = "analytics.dedup.hash"
+DEDUP_FILE_KEY_PREFIX = "analytics.dedup.file"
+INDEXED_FILES_KEY = "analytics.files.indexed"
+EMBEDDING_CACHE_KEY_PREFIX = "analytics.embeddings"
+SEARCH_CACHE_KEY_PREFIX = "analytics.search"
+SEARCH_GENERATION_KEY = "analytics.search.generation"
+FILE_INDEX_BY_TIME_KEY = "analytics.files.by_time"
+FILE_INDEX_METADATA_KEY = "analytics.files.metadata"
+FILE_STAT_KEY_PREFIX = "analytics.files.stat"
+UPLOAD_SESSION_KEY_PREFIX = "analytics.uploads.session"
+UPLOAD_STAGING_KEY = "analytics.uploads.staging"
+CHUNK_TEXT_KEY_PREFIX = "analytics.chunks.text"
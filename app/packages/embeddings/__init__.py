@@ -0,0 +1,4 @@
+from app.packages.embeddings.models import BACKENDS, load_embedding_model, embedding_model_id
+from app.packages.embeddings.parity import ParityReport, check_parity
+
+__all__ = ["BACKENDS", "load_embedding_model", "embedding_model_id", "ParityReport", "check_parity"]
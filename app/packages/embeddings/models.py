@@ -0,0 +1,93 @@
+from typing import TYPE_CHECKING, Optional
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def load_embedding_model(
+        backend: Optional[str] = None,
+        model_name: Optional[str] = None,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None,
+) -> "SentenceTransformer":
+    """Load the embedding model on the configured CPU inference backend.
+
+    Every backend returns a SentenceTransformer, so callers keep using
+    ``encode``, ``tokenizer`` and ``max_seq_length`` whichever runtime sits
+    underneath. ``onnx-int8`` loads the dynamically quantized ONNX export
+    named by ``EMBEDDING_ONNX_INT8_FILE``.
+    """
+    backend = backend or settings.embedding_backend
+    model_name = model_name or settings.embedding_model
+    intra_op_threads = intra_op_threads or settings.embedding_intra_op_threads
+    inter_op_threads = inter_op_threads or settings.embedding_inter_op_threads
+
+    # sentence-transformers pulls in torch; only the embedding processes need it.
+    from sentence_transformers import SentenceTransformer
+
+    match backend:
+        case "torch":
+            _set_torch_threads(intra_op_threads, inter_op_threads)
+            return SentenceTransformer(model_name, device="cpu")
+        case "onnx":
+            return SentenceTransformer(
+                model_name,
+                device="cpu",
+                backend="onnx",
+                model_kwargs=_onnx_kwargs(settings.embedding_onnx_file, intra_op_threads, inter_op_threads),
+            )
+        case "onnx-int8":
+            return SentenceTransformer(
+                model_name,
+                device="cpu",
+                backend="onnx",
+                model_kwargs=_onnx_kwargs(settings.embedding_onnx_int8_file, intra_op_threads, inter_op_threads),
+            )
+        case _:
+            raise ValueError(f"Unsupported embedding backend: {backend}")
+
+
+def embedding_model_id(backend: Optional[str] = None, model_name: Optional[str] = None) -> str:
+    """Name that tells vectors from different backends apart, e.g. in caches.
+
+    The PyTorch backend keeps the bare model name so existing entries stay valid.
+    """
+    backend = backend or settings.embedding_backend
+    model_name = model_name or settings.embedding_model
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+def _set_torch_threads(intra_op_threads: Optional[int], inter_op_threads: Optional[int]) -> None:
+    import torch
+
+    if intra_op_threads:
+        torch.set_num_threads(intra_op_threads)
+    if inter_op_threads:
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError:
+            # Can only be set once per process, before any inter-op work ran.
+            pass
+
+
+def _onnx_kwargs(file_name: str, intra_op_threads: Optional[int], inter_op_threads: Optional[int]) -> dict:
+    try:
+        import onnxruntime
+    except ImportError as e:
+        raise ImportError("ONNX embedding backends require the 'optimum[onnxruntime]' package") from e
+
+    options = onnxruntime.SessionOptions()
+    if intra_op_threads:
+        options.intra_op_num_threads = intra_op_threads
+    if inter_op_threads:
+        options.inter_op_num_threads = inter_op_threads
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL
+    return {
+        "file_name": file_name,
+        "provider": "CPUExecutionProvider",
+        "session_options": options,
+    }
@@ -0,0 +1,83 @@
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+import numpy as np
+
+from app.packages.embeddings.models import load_embedding_model
+
+# Short and long, plain and technical, so drift shows up across lengths.
+SAMPLE_TEXTS = [
+    "Quarterly revenue grew by 12% compared with the same period last year.",
+    "The invoice is due within thirty days of the delivery date.",
+    "Reset the device by holding the power button for ten seconds.",
+    "Patients reported mild headaches and fatigue during the first week of treatment.",
+    "The committee approved the budget after a lengthy discussion about infrastructure spending, "
+    "staffing levels for the coming fiscal year and the timeline for the new data center.",
+    "Section 4.2 describes how termination notices must be delivered in writing to both parties.",
+    "Gradient descent updates the parameters in the direction that reduces the loss.",
+    "Store the samples at four degrees Celsius and analyse them within 48 hours.",
+]
+
+
+@dataclass
+class ParityReport:
+    backend: str
+    reference: str
+    texts: int
+    min_cosine: float
+    mean_cosine: float
+    max_drift: float
+    reference_texts_per_second: float
+    backend_texts_per_second: float
+
+    @property
+    def speedup(self) -> float:
+        return self.backend_texts_per_second / self.reference_texts_per_second
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "speedup": self.speedup}
+
+
+def check_parity(
+        backend: str,
+        reference: str = "torch",
+        texts: Optional[list[str]] = None,
+        batch_size: int = 64,
+        repeat: int = 3,
+) -> ParityReport:
+    """Embed the same texts on ``backend`` and ``reference`` and compare them.
+
+    Drift is ``1 - cosine`` between the two vectors of each text. Throughput
+    is the best of ``repeat`` timed runs after one warm-up run.
+    """
+    texts = texts or SAMPLE_TEXTS
+    expected, reference_rate = _embed_timed(load_embedding_model(reference), texts, batch_size, repeat)
+    actual, backend_rate = _embed_timed(load_embedding_model(backend), texts, batch_size, repeat)
+
+    cosines = np.sum(_normalize(expected) * _normalize(actual), axis=1)
+    return ParityReport(
+        backend=backend,
+        reference=reference,
+        texts=len(texts),
+        min_cosine=float(cosines.min()),
+        mean_cosine=float(cosines.mean()),
+        max_drift=float(1 - cosines.min()),
+        reference_texts_per_second=reference_rate,
+        backend_texts_per_second=backend_rate,
+    )
+
+
+def _embed_timed(model, texts: list[str], batch_size: int, repeat: int) -> tuple[np.ndarray, float]:
+    embeddings = model.encode(texts, batch_size=batch_size, show_progress_bar=False)
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        model.encode(texts, batch_size=batch_size, show_progress_bar=False)
+        best = min(best, time.perf_counter() - started)
+    return np.asarray(embeddings, dtype=np.float32), len(texts) / best
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
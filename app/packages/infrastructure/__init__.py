@@ -1,3 +1,4 @@
-from .redis import redis_cli
+from .lazy import Lazy, initialize, shutdown
+from .redis import redis_cli, redis_bin_cli, redis_async_cli
 
-__all__ = ["redis_cli"]
\ No newline at end of file
+__all__ = ["Lazy", "initialize", "shutdown", "redis_cli", "redis_bin_cli", "redis_async_cli"]
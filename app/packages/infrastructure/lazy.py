@@ -0,0 +1,83 @@
+import inspect
+import logging
+import threading
+import time
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class Lazy(Generic[T]):
+    """Module-level singleton that is built on first use.
+
+    Attribute access is forwarded to the instance, so existing call sites such
+    as ``minio_client.stat_file(...)`` work unchanged, while importing the
+    module no longer opens connections. A failed build is not cached; the next
+    use tries again.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T], close: Optional[Callable[[T], Any]] = None):
+        self._name = name
+        self._factory = factory
+        self._close = close
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+        self.init_seconds: Optional[float] = None
+        _registry.append(self)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                started = time.perf_counter()
+                self._instance = self._factory()
+                self.init_seconds = time.perf_counter() - started
+            return self._instance
+
+    async def aclose(self) -> None:
+        with self._lock:
+            instance, self._instance = self._instance, None
+        if instance is None or self._close is None:
+            return
+        result = self._close(instance)
+        if inspect.isawaitable(result):
+            await result
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only called for attributes not found on the proxy itself.
+        return getattr(self.get(), attr)
+
+    def __repr__(self) -> str:
+        state = "initialized" if self.initialized else "pending"
+        return f"<Lazy {self._name} ({state})>"
+
+
+_registry: list[Lazy] = []
+
+
+def initialize(*singletons: Lazy) -> dict[str, float]:
+    """Build the given singletons now and return how long each one took."""
+    for singleton in singletons:
+        singleton.get()
+    return {singleton.name: singleton.init_seconds or 0.0 for singleton in singletons}
+
+
+async def shutdown() -> None:
+    """Close every singleton that was built, newest first."""
+    for singleton in reversed(_registry):
+        try:
+            await singleton.aclose()
+        except Exception as e:
+            logger.warning("Error closing %s: %s", singleton.name, e)
@@ -1,9 +1,20 @@
 from minio import Minio
 from app.config import settings
+from app.packages.infrastructure.lazy import Lazy
 
-minio_cli = Minio(
+minio_cli: Lazy[Minio] = Lazy("minio_cli", lambda: Minio(
     endpoint=settings.minio_endpoint,
     access_key=settings.minio_access_key,
     secret_key=settings.minio_secret_key,
     secure=settings.minio_secure
-)
+))
+
+# Signs URLs that clients use directly, so it carries the endpoint they can
+# reach. The region is fixed so signing never needs a round trip to MinIO.
+minio_presign_cli: Lazy[Minio] = Lazy("minio_presign_cli", lambda: Minio(
+    endpoint=settings.minio_public_endpoint or settings.minio_endpoint,
+    access_key=settings.minio_access_key,
+    secret_key=settings.minio_secret_key,
+    secure=settings.minio_public_secure if settings.minio_public_secure is not None else settings.minio_secure,
+    region=settings.minio_region,
+))
@@ -1,9 +1,29 @@
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from app.config import settings
+from app.packages.infrastructure.lazy import Lazy
 
-qdrant_client = QdrantClient(
-    host=settings.qdrant_host,
-    port=settings.qdrant_port,
-    api_key=settings.qdrant_api_key,
-    timeout=60,
+
+def _client_options() -> dict:
+    return dict(
+        host=settings.qdrant_host,
+        port=settings.qdrant_port,
+        grpc_port=settings.qdrant_grpc_port,
+        prefer_grpc=settings.qdrant_prefer_grpc,
+        api_key=settings.qdrant_api_key,
+        timeout=60,
+    )
+
+
+# The clients check server compatibility when built, so they are created on
+# first use rather than at import.
+qdrant_client: Lazy[QdrantClient] = Lazy(
+    "qdrant_client",
+    lambda: QdrantClient(**_client_options()),
+    close=lambda client: client.close(),
+)
+
+async_qdrant_client: Lazy[AsyncQdrantClient] = Lazy(
+    "async_qdrant_client",
+    lambda: AsyncQdrantClient(**_client_options()),
+    close=lambda client: client.close(),
 )
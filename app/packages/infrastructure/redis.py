@@ -1,10 +1,34 @@
 import redis
+import redis.asyncio
 from app.config import settings
+from app.packages.infrastructure.lazy import Lazy
 
-redis_cli = redis.Redis(
-    host=settings.redis_host,
-    port=settings.redis_port,
-    db=settings.redis_db,
-    password=settings.redis_password,
-    decode_responses=settings.redis_decode_responses
+
+def _connection_options(decode_responses: bool) -> dict:
+    return dict(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_db,
+        password=settings.redis_password,
+        decode_responses=decode_responses
+    )
+
+
+redis_cli: Lazy[redis.Redis] = Lazy(
+    "redis_cli",
+    lambda: redis.Redis(**_connection_options(settings.redis_decode_responses)),
+    close=lambda client: client.close(),
+)
+
+# Binary-safe connection for values that are not text, such as vector bytes.
+redis_bin_cli: Lazy[redis.Redis] = Lazy(
+    "redis_bin_cli",
+    lambda: redis.Redis(**_connection_options(False)),
+    close=lambda client: client.close(),
+)
+
+redis_async_cli: Lazy[redis.asyncio.Redis] = Lazy(
+    "redis_async_cli",
+    lambda: redis.asyncio.Redis(**_connection_options(settings.redis_decode_responses)),
+    close=lambda client: client.aclose(),
 )
@@ -0,0 +1,28 @@
+from app.packages.observability.log import configure_logging
+from app.packages.observability.tracing import configure_tracing, span
+from app.packages.observability.metrics import (
+    PROCESSOR_STAGE_SECONDS,
+    PROCESSOR_FILES,
+    PROCESSOR_PAGES,
+    PROCESSOR_CHUNKS,
+    PROCESSOR_BYTES,
+    PROCESSOR_QUEUE_LAG_SECONDS,
+    HTTP_REQUEST_SECONDS,
+    timed_stage,
+    observe_queue_lag,
+)
+
+__all__ = [
+    "configure_logging",
+    "configure_tracing",
+    "span",
+    "PROCESSOR_STAGE_SECONDS",
+    "PROCESSOR_FILES",
+    "PROCESSOR_PAGES",
+    "PROCESSOR_CHUNKS",
+    "PROCESSOR_BYTES",
+    "PROCESSOR_QUEUE_LAG_SECONDS",
+    "HTTP_REQUEST_SECONDS",
+    "timed_stage",
+    "observe_queue_lag",
+]
@@ -0,0 +1,78 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+from app.config import settings
+
+# Attributes every LogRecord has; anything else came in through ``extra``.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with ``extra`` fields as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(_extras(record))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Plain log lines with ``extra`` fields appended as ``key=value`` pairs."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        fields = " ".join(f"{key}={value}" for key, value in _extras(record).items())
+        return f"{message} {fields}" if fields else message
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so the record is passed on as is
+        # and the listener's formatter still sees exc_info and extra fields.
+        return record
+
+
+def _extras(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+def configure_logging() -> None:
+    """Send log records through a queue to a background thread that does the I/O.
+
+    Worker threads only enqueue records, so writing logs never blocks the
+    pipeline. Level and format come from ``LOG_LEVEL`` and ``LOG_FORMAT``.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    if settings.log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(TextFormatter())
+
+    records: queue.Queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.handlers = [_LocalQueueHandler(records)]
+    root.setLevel(settings.log_level.upper())
+
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
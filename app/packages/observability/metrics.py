@@ -0,0 +1,58 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from prometheus_client import Counter, Histogram
+
+from app.packages.observability.tracing import span
+
+# Stages range from sub-millisecond Redis lookups to minutes for large PDFs.
+_STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+PROCESSOR_STAGE_SECONDS = Histogram(
+    "processor_stage_seconds",
+    "Time spent in each processing stage.",
+    ["stage"],
+    buckets=_STAGE_BUCKETS,
+)
+PROCESSOR_FILES = Counter(
+    "processor_files",
+    "Files handled by the processor, by outcome.",
+    ["outcome"],
+)
+PROCESSOR_PAGES = Counter("processor_pages", "PDF pages extracted.")
+PROCESSOR_CHUNKS = Counter("processor_chunks", "Chunks embedded.")
+PROCESSOR_BYTES = Counter("processor_bytes", "File bytes downloaded.")
+PROCESSOR_QUEUE_LAG_SECONDS = Histogram(
+    "processor_queue_lag_seconds",
+    "Time between a file being published and the processor starting on it.",
+    buckets=_STAGE_BUCKETS,
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route.",
+    ["method", "route", "status"],
+)
+
+
+@contextmanager
+def timed_stage(stage: str, **attributes) -> Iterator[None]:
+    """Record the duration of ``stage`` and, when tracing is enabled, wrap it in a span."""
+    with span(f"processor.{stage}", **attributes):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            PROCESSOR_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - started)
+
+
+def observe_queue_lag(message_id: Optional[str]) -> None:
+    """Record queue lag from a Redis stream entry id, whose first part is the publish time in ms."""
+    if not message_id:
+        return
+    try:
+        published_ms = int(message_id.split("-", 1)[0])
+    except ValueError:
+        return
+    PROCESSOR_QUEUE_LAG_SECONDS.observe(max(0.0, time.time() - published_ms / 1000))
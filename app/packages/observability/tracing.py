@@ -0,0 +1,44 @@
+from contextlib import contextmanager, nullcontext
+from typing import Any, Iterator, Optional
+
+from app.config import settings
+
+_tracer: Optional[Any] = None
+
+
+def configure_tracing(service_name: str) -> None:
+    """Export OpenTelemetry spans over OTLP when ``OTEL_ENABLED`` is set.
+
+    The exporter reads the standard ``OTEL_EXPORTER_OTLP_*`` environment variables.
+    """
+    global _tracer
+    if not settings.otel_enabled:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError as e:
+        raise ImportError(
+            "OTEL_ENABLED requires the 'opentelemetry-sdk' and 'opentelemetry-exporter-otlp' packages"
+        ) from e
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("analytics")
+
+
+def span(name: str, **attributes):
+    """Span context manager, or a no-op when tracing is not configured."""
+    if _tracer is None:
+        return nullcontext()
+    return _started_span(name, attributes)
+
+
+@contextmanager
+def _started_span(name: str, attributes: dict) -> Iterator[None]:
+    with _tracer.start_as_current_span(name, attributes=attributes):
+        yield
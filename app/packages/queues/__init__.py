@@ -0,0 +1,3 @@
+from app.packages.queues.factory import new_publisher, new_async_publisher, new_subscriber
+
+__all__ = ["new_publisher", "new_async_publisher", "new_subscriber"]
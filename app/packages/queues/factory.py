@@ -0,0 +1,46 @@
+from redis import Redis
+import redis.asyncio
+
+from app.config import settings
+from app.packages.queues.prototypes import Publisher, AsyncPublisher, Subscriber
+from app.packages.queues.redis import RedisPublisher, AsyncRedisPublisher, RedisSubscriber
+from app.packages.queues.redis_streams import RedisStreamPublisher, AsyncRedisStreamPublisher, RedisStreamSubscriber
+
+
+def new_publisher(redis: Redis) -> Publisher:
+    match settings.queue_backend:
+        case "streams":
+            return RedisStreamPublisher(redis, maxlen=settings.queue_stream_maxlen)
+        case "pubsub":
+            return RedisPublisher(redis)
+        case _:
+            raise ValueError(f"Unsupported queue backend: {settings.queue_backend}")
+
+
+def new_async_publisher(redis: redis.asyncio.Redis) -> AsyncPublisher:
+    match settings.queue_backend:
+        case "streams":
+            return AsyncRedisStreamPublisher(redis, maxlen=settings.queue_stream_maxlen)
+        case "pubsub":
+            return AsyncRedisPublisher(redis)
+        case _:
+            raise ValueError(f"Unsupported queue backend: {settings.queue_backend}")
+
+
+def new_subscriber(redis: Redis) -> Subscriber:
+    match settings.queue_backend:
+        case "streams":
+            return RedisStreamSubscriber(
+                redis,
+                group=settings.queue_consumer_group,
+                consumer=settings.queue_consumer_name,
+                batch_size=settings.queue_batch_size,
+                block_ms=settings.queue_block_ms,
+                claim_idle_ms=settings.queue_claim_idle_ms,
+                claim_interval_seconds=settings.queue_claim_interval_seconds,
+                max_deliveries=settings.queue_max_deliveries,
+            )
+        case "pubsub":
+            return RedisSubscriber(redis)
+        case _:
+            raise ValueError(f"Unsupported queue backend: {settings.queue_backend}")
@@ -1,10 +1,18 @@
-from typing import Protocol, Iterator
+from typing import Protocol, Iterable, Iterator
 
 
 class Publisher(Protocol):
     def publish(self, channel: str, message: bytes) -> None: ...
+    def publish_many(self, channel: str, messages: Iterable[bytes]) -> None: ...
+
+
+class AsyncPublisher(Protocol):
+    async def publish(self, channel: str, message: bytes) -> None: ...
+    async def publish_many(self, channel: str, messages: Iterable[bytes]) -> None: ...
 
 
 class Subscriber(Protocol):
     def subscribe(self, channel: str) -> Iterator[bytes]: ...
-    def close(self) -> None: ...
\ No newline at end of file
+    def ack(self, channel: str, message: bytes) -> None: ...
+    def release(self, channel: str, message: bytes) -> None: ...
+    def close(self) -> None: ...
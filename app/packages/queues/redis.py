@@ -1,5 +1,6 @@
 from redis import Redis
-from typing import Iterator
+import redis.asyncio
+from typing import Iterable, Iterator
 
 class RedisPublisher:
     redis: Redis
@@ -9,6 +10,27 @@ class RedisPublisher:
     def publish(self, channel: str, message: bytes) -> None:
         self.redis.publish(channel, message)
 
+    def publish_many(self, channel: str, messages: Iterable[bytes]) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for message in messages:
+            pipe.publish(channel, message)
+        pipe.execute()
+
+class AsyncRedisPublisher:
+    redis: redis.asyncio.Redis
+
+    def __init__(self, redis: redis.asyncio.Redis):
+        self.redis = redis
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        await self.redis.publish(channel, message)
+
+    async def publish_many(self, channel: str, messages: Iterable[bytes]) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for message in messages:
+            pipe.publish(channel, message)
+        await pipe.execute()
+
 class RedisSubscriber:
     redis: Redis
 
@@ -23,5 +45,13 @@ class RedisSubscriber:
             if msg["type"] == "message":
                 yield msg["data"]
 
+    def ack(self, channel: str, message: bytes) -> None:
+        # Pub/sub has no delivery tracking, so there is nothing to acknowledge.
+        pass
+
+    def release(self, channel: str, message: bytes) -> None:
+        # Nor any redelivery: a message whose processing failed is gone.
+        pass
+
     def close(self) -> None:
         self.redis.close()
\ No newline at end of file
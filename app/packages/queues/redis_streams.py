@@ -0,0 +1,251 @@
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Iterable, Iterator, Optional
+
+from redis import Redis, ResponseError
+import redis.asyncio
+
+logger = logging.getLogger(__name__)
+
+
+class StreamMessage(bytes):
+    """Message payload carrying the stream entry id needed to ack it."""
+    message_id: str
+
+    def __new__(cls, data: bytes | str, message_id: bytes | str):
+        if isinstance(data, str):
+            data = data.encode()
+        message = super().__new__(cls, data)
+        message.message_id = message_id.decode() if isinstance(message_id, bytes) else message_id
+        return message
+
+
+class RedisStreamPublisher:
+    redis: Redis
+    maxlen: Optional[int]
+
+    def __init__(self, redis: Redis, maxlen: Optional[int] = None):
+        self.redis = redis
+        self.maxlen = maxlen
+
+    def publish(self, channel: str, message: bytes) -> None:
+        self.redis.xadd(channel, {"data": message}, maxlen=self.maxlen, approximate=True)
+
+    def publish_many(self, channel: str, messages: Iterable[bytes]) -> None:
+        # One round trip for the whole batch instead of one XADD each.
+        pipe = self.redis.pipeline(transaction=False)
+        for message in messages:
+            pipe.xadd(channel, {"data": message}, maxlen=self.maxlen, approximate=True)
+        pipe.execute()
+
+
+class AsyncRedisStreamPublisher:
+    redis: redis.asyncio.Redis
+    maxlen: Optional[int]
+
+    def __init__(self, redis: redis.asyncio.Redis, maxlen: Optional[int] = None):
+        self.redis = redis
+        self.maxlen = maxlen
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        await self.redis.xadd(channel, {"data": message}, maxlen=self.maxlen, approximate=True)
+
+    async def publish_many(self, channel: str, messages: Iterable[bytes]) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for message in messages:
+            pipe.xadd(channel, {"data": message}, maxlen=self.maxlen, approximate=True)
+        await pipe.execute()
+
+
+class RedisStreamSubscriber:
+    """Consumer-group subscriber on a Redis stream.
+
+    Every message is delivered to exactly one consumer of the group and stays
+    pending until it is acked. Entries left pending by a crashed consumer, or
+    released after a failure, for longer than ``claim_idle_ms`` are reclaimed
+    with XAUTOCLAIM. An entry delivered more than ``max_deliveries`` times is
+    moved to the ``<channel>:dead`` stream instead of being retried again.
+
+    Yielded entries stay in flight until they are acked or released. While
+    queued or processing they are kept fresh with ``XCLAIM ... JUSTID`` from a
+    heartbeat thread, so neither this consumer nor another one reclaims a file
+    that is still being worked on.
+    """
+    redis: Redis
+    group: str
+    consumer: str
+
+    def __init__(
+            self,
+            redis: Redis,
+            group: str,
+            consumer: Optional[str] = None,
+            batch_size: int = 16,
+            block_ms: int = 5000,
+            claim_idle_ms: int = 60000,
+            claim_interval_seconds: float = 30,
+            max_deliveries: int = 5,
+    ):
+        self.redis = redis
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval_seconds = claim_interval_seconds
+        self.max_deliveries = max_deliveries
+        self._closed = False
+        self._in_flight: set[str] = set()
+        self._in_flight_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def subscribe(self, channel: str) -> Iterator[bytes]:
+        self._ensure_group(channel)
+        self._start_heartbeat(channel)
+        last_claim = 0.0
+
+        while not self._closed:
+            entries = []
+            if time.monotonic() - last_claim >= self.claim_interval_seconds:
+                entries = self._claim_stale(channel)
+                last_claim = time.monotonic()
+
+            if not entries:
+                response = self.redis.xreadgroup(
+                    self.group,
+                    self.consumer,
+                    {channel: ">"},
+                    count=self.batch_size,
+                    block=self.block_ms,
+                )
+                entries = response[0][1] if response else []
+
+            for message_id, fields in entries:
+                data = _field(fields, "data")
+                if data is None:
+                    self.redis.xack(channel, self.group, message_id)
+                    continue
+                message = StreamMessage(data, message_id)
+                with self._in_flight_lock:
+                    self._in_flight.add(message.message_id)
+                yield message
+
+    def ack(self, channel: str, message: bytes) -> None:
+        message_id = getattr(message, "message_id", None)
+        if message_id is not None:
+            self.redis.xack(channel, self.group, message_id)
+            self._settle(message_id)
+
+    def release(self, channel: str, message: bytes) -> None:
+        # Left pending on purpose: once no heartbeat refreshes it, it is
+        # reclaimed and retried after claim_idle_ms.
+        message_id = getattr(message, "message_id", None)
+        if message_id is not None:
+            self._settle(message_id)
+
+    def close(self) -> None:
+        self._closed = True
+        self._stopped.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        self.redis.close()
+
+    def _settle(self, message_id: str) -> None:
+        with self._in_flight_lock:
+            self._in_flight.discard(message_id)
+
+    def _start_heartbeat(self, channel: str) -> None:
+        if self._heartbeat is not None:
+            return
+        self._heartbeat = threading.Thread(
+            target=self._refresh_in_flight,
+            args=(channel,),
+            name="stream-heartbeat",
+            daemon=True,
+        )
+        self._heartbeat.start()
+
+    def _refresh_in_flight(self, channel: str) -> None:
+        # A few refreshes per idle window keep in-flight entries well below it.
+        interval = self.claim_idle_ms / 1000 / 3
+        while not self._stopped.wait(interval):
+            with self._in_flight_lock:
+                message_ids = list(self._in_flight)
+            if not message_ids:
+                continue
+            try:
+                # JUSTID resets the idle time without counting a delivery.
+                self.redis.xclaim(channel, self.group, self.consumer, 0, message_ids, justid=True)
+            except Exception:
+                logger.warning("Failed to refresh in-flight messages", exc_info=True)
+
+    def _ensure_group(self, channel: str) -> None:
+        try:
+            self.redis.xgroup_create(channel, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _claim_stale(self, channel: str) -> list:
+        result = self.redis.xautoclaim(
+            channel,
+            self.group,
+            self.consumer,
+            min_idle_time=self.claim_idle_ms,
+            count=self.batch_size,
+        )
+        with self._in_flight_lock:
+            in_flight = set(self._in_flight)
+        entries = [
+            entry for entry in (result[1] if result else [])
+            if entry and _as_str(entry[0]) not in in_flight
+        ]
+        if not entries:
+            return []
+
+        deliveries = self._delivery_counts(channel, entries)
+        retried = []
+        for message_id, fields in entries:
+            if deliveries.get(_as_str(message_id), 0) > self.max_deliveries:
+                self._dead_letter(channel, message_id, fields)
+            else:
+                retried.append((message_id, fields))
+        return retried
+
+    def _delivery_counts(self, channel: str, entries: list) -> dict[str, int]:
+        pending = self.redis.xpending_range(
+            channel,
+            self.group,
+            min=entries[0][0],
+            max=entries[-1][0],
+            count=len(entries),
+            consumername=self.consumer,
+        )
+        return {_as_str(entry["message_id"]): entry["times_delivered"] for entry in pending}
+
+    def _dead_letter(self, channel: str, message_id, fields) -> None:
+        pipe = self.redis.pipeline(transaction=True)
+        if fields:
+            pipe.xadd(f"{channel}:dead", {**fields, "message_id": message_id})
+        pipe.xack(channel, self.group, message_id)
+        pipe.execute()
+        logger.error(
+            "Moved message to dead-letter stream",
+            extra={"channel": channel, "message_id": _as_str(message_id), "max_deliveries": self.max_deliveries},
+        )
+
+
+def _field(fields: Optional[dict], name: str):
+    """Look a field up whether the client decodes responses or not."""
+    if not fields:
+        return None
+    value = fields.get(name)
+    return value if value is not None else fields.get(name.encode())
+
+
+def _as_str(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -1,4 +1,49 @@
-from app.packages.storage.minio import MinioClient, minio_client, FileStat
-from app.packages.storage.qdrant import QdrantVectorStore, qdrant_store
+from app.packages.storage.minio import (
+    MinioClient,
+    minio_client,
+    artifact_minio_client,
+    FileStat,
+    AsyncMinioClient,
+    async_minio_client,
+)
+from app.packages.storage.chunk_text import ChunkTextStore, chunk_text_store
+from app.packages.storage.extracted_text import ExtractedTextStore, extracted_text_store
+from app.packages.storage.spool import SpooledObject, ChecksumMismatchError, spool_stream
 
-__all__ = ["MinioClient", "minio_client", "FileStat", "QdrantVectorStore", "qdrant_store"]
+__all__ = [
+    "MinioClient",
+    "minio_client",
+    "artifact_minio_client",
+    "FileStat",
+    "AsyncMinioClient",
+    "async_minio_client",
+    "SpooledObject",
+    "ChecksumMismatchError",
+    "spool_stream",
+    "ChunkTextStore",
+    "chunk_text_store",
+    "ExtractedTextStore",
+    "extracted_text_store",
+    "QdrantVectorStore",
+    "qdrant_store",
+    "AsyncQdrantVectorStore",
+    "async_qdrant_store",
+    "CollectionProfile",
+]
+
+# qdrant_client takes about a second to import, so the vector store module is
+# only loaded when one of its names is first asked for.
+_QDRANT_EXPORTS = {
+    "QdrantVectorStore",
+    "qdrant_store",
+    "AsyncQdrantVectorStore",
+    "async_qdrant_store",
+    "CollectionProfile",
+}
+
+
+def __getattr__(name: str):
+    if name in _QDRANT_EXPORTS:
+        from app.packages.storage import qdrant
+        return getattr(qdrant, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,190 @@
+import logging
+import struct
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+import numpy as np
+from minio.error import S3Error
+from redis import Redis
+
+from app.config import settings
+from app.packages.constants.constants import CHUNK_TEXT_KEY_PREFIX
+from app.packages.infrastructure.lazy import Lazy
+from app.packages.infrastructure.redis import redis_bin_cli
+from app.packages.storage.minio import MinioClient, artifact_minio_client
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_PREFIX = "chunks"
+_MAGIC = b"CHK1"
+_HEADER = struct.Struct("<4sI")
+
+
+def encode_chunks(chunks: list[str]) -> bytes:
+    """Pack chunks as a zlib-compressed header, end-offset table and UTF-8 text."""
+    encoded = [chunk.encode() for chunk in chunks]
+    ends = np.cumsum([len(data) for data in encoded], dtype="<u8") if encoded else np.empty(0, dtype="<u8")
+    raw = _HEADER.pack(_MAGIC, len(encoded)) + ends.tobytes() + b"".join(encoded)
+    return zlib.compress(raw)
+
+
+class ChunkTexts:
+    """Decoded artifact; ``texts[i]`` decodes chunk ``i`` on demand."""
+
+    def __init__(self, artifact: bytes):
+        raw = zlib.decompress(artifact)
+        magic, count = _HEADER.unpack_from(raw)
+        if magic != _MAGIC:
+            raise ValueError("Not a chunk text artifact")
+        table_end = _HEADER.size + 8 * count
+        self._ends = np.frombuffer(raw, dtype="<u8", count=count, offset=_HEADER.size)
+        self._text = memoryview(raw)[table_end:]
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, index: int) -> str:
+        start = int(self._ends[index - 1]) if index > 0 else 0
+        return str(self._text[start:int(self._ends[index])], "utf-8")
+
+
+class ChunkTextStore:
+    """Chunk text of each file kept as one compressed, offset-indexed MinIO object.
+
+    With text out of the Qdrant payload, points carry only their position and
+    the artifact version; ``hydrate`` fills text back into the results that
+    need it with one Redis MGET for the whole result set and parallel MinIO
+    reads for the misses. Every ``put`` writes a new version, so no two
+    collections ever share an artifact: a rebuild never overwrites the text
+    the live collection points into, and a collection can drop the versions
+    it superseded without touching anyone else's. Points written before
+    artifacts were versioned have no version and read the unversioned
+    ``chunks/<file_id>`` object.
+    """
+    _minio: MinioClient
+    _redis: Optional[Redis]
+
+    def __init__(
+            self,
+            minio: MinioClient,
+            redis: Optional[Redis] = None,
+            cache_ttl_seconds: int = 3600,
+            max_workers: int = 8,
+    ):
+        self._minio = minio
+        self._redis = redis if cache_ttl_seconds > 0 else None
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chunk-text")
+
+    def put(self, file_id: str, chunks: list[str]) -> str:
+        """Store the artifact of ``chunks`` under a new version and return it."""
+        version = uuid.uuid4().hex
+        ref = (file_id, version)
+        artifact = encode_chunks(chunks)
+        self._minio.upload_file(self._object_name(ref), artifact, content_type="application/zlib")
+        if self._redis is not None:
+            self._redis.set(self._key(ref), artifact, ex=self.cache_ttl_seconds)
+        return version
+
+    def load(self, refs: Iterable[tuple[str, Optional[str]]]) -> dict[tuple[str, Optional[str]], ChunkTexts]:
+        """Return the decoded artifacts for ``(file_id, version)`` refs; missing ones are left out."""
+        refs = list(dict.fromkeys(refs))
+        artifacts: dict[tuple[str, Optional[str]], bytes] = {}
+        if self._redis is not None and refs:
+            cached = self._redis.mget([self._key(ref) for ref in refs])
+            artifacts = {ref: value for ref, value in zip(refs, cached) if value is not None}
+
+        missing = [ref for ref in refs if ref not in artifacts]
+        fetched = {
+            ref: artifact
+            for ref, artifact in zip(missing, self._executor.map(self._download, missing))
+            if artifact is not None
+        }
+        if self._redis is not None and fetched:
+            pipe = self._redis.pipeline(transaction=False)
+            for ref, artifact in fetched.items():
+                pipe.set(self._key(ref), artifact, ex=self.cache_ttl_seconds)
+            pipe.execute()
+
+        return {ref: ChunkTexts(artifact) for ref, artifact in {**artifacts, **fetched}.items()}
+
+    def hydrate(self, hits: list[dict], versions: list[Optional[str]]) -> list[dict]:
+        """Fill in ``text`` for hits that lack it; ``versions`` holds each hit's artifact version."""
+        pending = [
+            (hit, (hit["file_id"], version))
+            for hit, version in zip(hits, versions)
+            if hit.get("text") is None and hit.get("file_id") is not None
+        ]
+        if not pending:
+            return hits
+        texts = self.load(ref for _, ref in pending)
+        for hit, ref in pending:
+            chunks = texts.get(ref)
+            if chunks is not None and hit.get("chunk_index") is not None and hit["chunk_index"] < len(chunks):
+                hit["text"] = chunks[hit["chunk_index"]]
+        return hits
+
+    def delete(self, file_ids: list[str]) -> None:
+        """Delete every artifact of ``file_ids``, versioned or not, and their cached copies."""
+        refs = []
+        for file_id in file_ids:
+            refs.append((file_id, None))
+            refs.extend(
+                (file_id, stat.object_name.rsplit(".", 1)[-1])
+                for stat in self._minio.iter_files(prefix=f"{ARTIFACT_PREFIX}/{file_id}.")
+            )
+        self._delete_refs(refs)
+
+    def delete_versions(self, file_id: str, versions: Iterable[Optional[str]]) -> None:
+        """Delete the given artifact versions of one file; ``None`` is the unversioned artifact."""
+        self._delete_refs([(file_id, version) for version in versions])
+
+    def _delete_refs(self, refs: list[tuple[str, Optional[str]]]) -> None:
+        if not refs:
+            return
+        # Missing objects count as deleted, so unversioned refs are always safe to include.
+        errors = self._minio.delete_files([self._object_name(ref) for ref in refs])
+        if errors:
+            logger.warning("Failed to delete chunk text artifacts", extra={"errors": errors})
+        if self._redis is not None:
+            self._redis.delete(*[self._key(ref) for ref in refs])
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _download(self, ref: tuple[str, Optional[str]]) -> Optional[bytes]:
+        try:
+            return self._minio.download_file(self._object_name(ref))
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                raise
+            return None
+
+    @staticmethod
+    def _object_name(ref: tuple[str, Optional[str]]) -> str:
+        file_id, version = ref
+        if version is None:
+            return f"{ARTIFACT_PREFIX}/{file_id}"
+        # A sibling rather than a child of the unversioned object: MinIO
+        # cannot hold both "chunks/<id>" and "chunks/<id>/...".
+        return f"{ARTIFACT_PREFIX}/{file_id}.{version}"
+
+    @staticmethod
+    def _key(ref: tuple[str, Optional[str]]) -> str:
+        file_id, version = ref
+        if version is None:
+            return f"{CHUNK_TEXT_KEY_PREFIX}:{file_id}"
+        return f"{CHUNK_TEXT_KEY_PREFIX}:{file_id}:{version}"
+
+
+chunk_text_store: Lazy[ChunkTextStore] = Lazy(
+    "chunk_text_store",
+    lambda: ChunkTextStore(
+        artifact_minio_client.get(),
+        redis=redis_bin_cli.get(),
+        cache_ttl_seconds=settings.chunk_text_cache_ttl_seconds,
+    ),
+    close=lambda store: store.close(),
+)
@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Disabled,
+    Distance,
+    HnswConfigDiff,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
+
+from app.config import settings
+
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+
+# Payload fields that searches and deletes filter on.
+INDEXED_PAYLOAD_FIELDS = ("file_id",)
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Storage and index layout of the chunk collection.
+
+    Quantized vectors stay in RAM while the originals can live on disk; with
+    ``rescore`` the top ``oversampling`` x limit candidates found on the
+    quantized vectors are re-ranked with the originals.
+    """
+    quantization: str = "none"
+    quantization_always_ram: bool = True
+    rescore: bool = True
+    oversampling: float = 2.0
+    on_disk_vectors: bool = False
+    on_disk_payload: bool = False
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_on_disk: bool = False
+    hnsw_ef: Optional[int] = None
+
+    def __post_init__(self):
+        if self.quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unsupported quantization: {self.quantization} (expected one of {', '.join(QUANTIZATION_MODES)})"
+            )
+
+    @classmethod
+    def from_settings(cls) -> "CollectionProfile":
+        return cls(
+            quantization=settings.qdrant_quantization,
+            quantization_always_ram=settings.qdrant_quantization_always_ram,
+            rescore=settings.qdrant_search_rescore,
+            oversampling=settings.qdrant_search_oversampling,
+            on_disk_vectors=settings.qdrant_on_disk_vectors,
+            on_disk_payload=settings.qdrant_on_disk_payload,
+            hnsw_m=settings.qdrant_hnsw_m,
+            hnsw_ef_construct=settings.qdrant_hnsw_ef_construct,
+            hnsw_on_disk=settings.qdrant_hnsw_on_disk,
+            hnsw_ef=settings.qdrant_hnsw_ef,
+        )
+
+    def vectors_config(self, vector_size: int) -> VectorParams:
+        return VectorParams(size=vector_size, distance=Distance.COSINE, on_disk=self.on_disk_vectors)
+
+    def hnsw_config(self) -> HnswConfigDiff:
+        return HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct, on_disk=self.hnsw_on_disk)
+
+    def quantization_config(self) -> ScalarQuantization | BinaryQuantization | None:
+        match self.quantization:
+            case "scalar":
+                return ScalarQuantization(scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=self.quantization_always_ram,
+                ))
+            case "binary":
+                return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=self.quantization_always_ram))
+            case _:
+                return None
+
+    def quantization_update(self) -> ScalarQuantization | BinaryQuantization | Disabled:
+        """Quantization config for ``update_collection``, where "none" must be explicit."""
+        return self.quantization_config() or Disabled.DISABLED
+
+    def search_params(self) -> Optional[SearchParams]:
+        quantization = None
+        if self.quantization != "none":
+            quantization = QuantizationSearchParams(rescore=self.rescore, oversampling=self.oversampling)
+        if quantization is None and self.hnsw_ef is None:
+            return None
+        return SearchParams(hnsw_ef=self.hnsw_ef, quantization=quantization)
+
+    def differences(self, config, vector_size: int) -> dict[str, tuple]:
+        """Settings of an existing collection's ``config`` that differ from this profile.
+
+        Maps each setting to ``(current, wanted)``.
+        """
+        params = config.params
+        vectors = params.vectors
+        current_quantization = config.quantization_config
+        current = {
+            "vector_size": vectors.size,
+            "on_disk_vectors": bool(vectors.on_disk),
+            "on_disk_payload": bool(params.on_disk_payload),
+            "hnsw_m": config.hnsw_config.m,
+            "hnsw_ef_construct": config.hnsw_config.ef_construct,
+            "hnsw_on_disk": bool(config.hnsw_config.on_disk),
+            "quantization": _quantization_mode(current_quantization),
+            "quantization_always_ram": _quantization_always_ram(current_quantization),
+        }
+        wanted = {
+            "vector_size": vector_size,
+            "on_disk_vectors": self.on_disk_vectors,
+            "on_disk_payload": self.on_disk_payload,
+            "hnsw_m": self.hnsw_m,
+            "hnsw_ef_construct": self.hnsw_ef_construct,
+            "hnsw_on_disk": self.hnsw_on_disk,
+            "quantization": self.quantization,
+            "quantization_always_ram": self.quantization_always_ram if self.quantization != "none" else None,
+        }
+        return {key: (current[key], wanted[key]) for key in wanted if current[key] != wanted[key]}
+
+
+def _quantization_mode(config) -> str:
+    if isinstance(config, ScalarQuantization):
+        return "scalar"
+    if isinstance(config, BinaryQuantization):
+        return "binary"
+    return "none"
+
+
+def _quantization_always_ram(config) -> Optional[bool]:
+    if isinstance(config, ScalarQuantization):
+        return bool(config.scalar.always_ram)
+    if isinstance(config, BinaryQuantization):
+        return bool(config.binary.always_ram)
+    return None
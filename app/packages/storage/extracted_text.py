@@ -0,0 +1,50 @@
+import zlib
+from typing import Optional
+
+from minio.error import S3Error
+
+from app.packages.infrastructure.lazy import Lazy
+from app.packages.storage.minio import MinioClient, artifact_minio_client
+
+ARTIFACT_PREFIX = "texts"
+
+
+class ExtractedTextStore:
+    """Extracted text of each file as a zlib-compressed MinIO object.
+
+    Lets files be re-chunked and re-embedded (e.g. for a new model) without
+    downloading and parsing the originals again.
+    """
+    _minio: MinioClient
+
+    def __init__(self, minio: MinioClient):
+        self._minio = minio
+
+    def put(self, file_id: str, text: str) -> None:
+        self._minio.upload_file(
+            self._object_name(file_id),
+            zlib.compress(text.encode()),
+            content_type="application/zlib",
+        )
+
+    def get(self, file_id: str) -> Optional[str]:
+        try:
+            artifact = self._minio.download_file(self._object_name(file_id))
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                raise
+            return None
+        return zlib.decompress(artifact).decode()
+
+    def delete(self, file_ids: list[str]) -> dict[str, str]:
+        return self._minio.delete_files([self._object_name(file_id) for file_id in file_ids])
+
+    @staticmethod
+    def _object_name(file_id: str) -> str:
+        return f"{ARTIFACT_PREFIX}/{file_id}"
+
+
+extracted_text_store: Lazy[ExtractedTextStore] = Lazy(
+    "extracted_text_store",
+    lambda: ExtractedTextStore(artifact_minio_client.get()),
+)
@@ -1,14 +1,22 @@
+import asyncio
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from minio import Minio
-from minio.datatypes import Object
+from minio.commonconfig import ComposeSource
+from minio.deleteobjects import DeleteObject
+from minio.datatypes import Object, Part
 from minio.error import S3Error
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Iterator, Optional
 from io import BytesIO
+from itertools import islice
 
 from pydantic import BaseModel
 
-from app.packages.infrastructure.minio import minio_cli
+from app.packages.infrastructure.lazy import Lazy
+from app.packages.infrastructure.minio import minio_cli, minio_presign_cli
+from app.packages.storage.spool import SpooledObject, spool_stream
 
 from app.config import settings
 
@@ -19,7 +27,7 @@ class FileStat(BaseModel):
     size: int
     etag: str
     last_modified: datetime.datetime
-    content_type: str
+    content_type: Optional[str] = None
 
     @classmethod
     def from_object(cls, obj: Object):
@@ -37,12 +45,12 @@ class MinioClient:
     client: Minio
     bucket_name: str
 
-    def __init__(self):
-        self.bucket_name = settings.minio_bucket
+    def __init__(self, bucket_name: Optional[str] = None):
+        self.bucket_name = bucket_name or settings.minio_bucket
         self._initialize()
 
     def _initialize(self):
-        self.client = minio_cli
+        self.client = minio_cli.get()
         self._ensure_bucket_exists()
 
     def _ensure_bucket_exists(self) -> None:
@@ -68,13 +76,16 @@ class MinioClient:
             data.seek(0)
             data_stream = data
 
+        # put_object reads at most one part at a time, so seekable streams
+        # (e.g. spooled uploads) are sent without being loaded into memory.
         result = self.client.put_object(
             bucket_name=self.bucket_name,
             object_name=object_name,
             data=data_stream,
             length=length,
             content_type=content_type,
-            metadata=metadata
+            metadata=metadata,
+            part_size=settings.minio_part_size,
         )
 
         return {
@@ -92,10 +103,39 @@ class MinioClient:
         response.release_conn()
         return data
 
+    def download_object(self, object_name: str, expected_sha256_prefix: Optional[str] = None) -> SpooledObject:
+        """Stream an object into a SpooledObject, never holding it in memory whole.
+
+        Large objects go to a temp file in ``DOWNLOAD_CHUNK_SIZE`` pieces; the
+        SHA-256 is checked against ``expected_sha256_prefix`` on the way.
+        """
+        response = self.client.get_object(self.bucket_name, object_name)
+        try:
+            return spool_stream(
+                response.stream(settings.download_chunk_size),
+                expected_sha256_prefix=expected_sha256_prefix,
+            )
+        finally:
+            response.close()
+            response.release_conn()
+
     def delete_file(self, object_name: str) -> bool:
         self.client.remove_object(self.bucket_name, object_name)
         return True
 
+    def delete_files(self, object_names: list[str]) -> dict[str, str]:
+        """Delete objects with multi-object DELETE requests (up to 1000 keys each).
+
+        Returns the objects that could not be deleted, mapped to the error
+        code. Missing objects count as deleted, as with ``remove_object``.
+        """
+        errors = self.client.remove_objects(
+            self.bucket_name,
+            (DeleteObject(object_name) for object_name in object_names),
+        )
+        # remove_objects is lazy; the requests are sent while iterating.
+        return {error.name: error.code for error in errors}
+
     def file_exists(self, object_name: str) -> bool:
         self.client.stat_object(self.bucket_name, object_name)
         return True
@@ -113,6 +153,81 @@ class MinioClient:
         )
         return url
 
+    def get_presigned_put_url(self, object_name: str, expires_in_seconds: int = 3600) -> str:
+        return minio_presign_cli.presigned_put_object(
+            bucket_name=self.bucket_name,
+            object_name=object_name,
+            expires=datetime.timedelta(seconds=expires_in_seconds),
+        )
+
+    # minio-py has no public multipart API; these use its protected S3 calls.
+    def create_multipart_upload(self, object_name: str, content_type: str) -> str:
+        return self.client._create_multipart_upload(
+            self.bucket_name,
+            object_name,
+            {"Content-Type": content_type},
+        )
+
+    def get_presigned_part_url(
+            self,
+            object_name: str,
+            upload_id: str,
+            part_number: int,
+            expires_in_seconds: int = 3600,
+    ) -> str:
+        return minio_presign_cli.get_presigned_url(
+            "PUT",
+            self.bucket_name,
+            object_name,
+            expires=datetime.timedelta(seconds=expires_in_seconds),
+            extra_query_params={"partNumber": str(part_number), "uploadId": upload_id},
+        )
+
+    def complete_multipart_upload(self, object_name: str, upload_id: str, parts: list[tuple[int, str]]) -> str:
+        """Assemble uploaded ``(part_number, etag)`` parts and return the object's ETag."""
+        result = self.client._complete_multipart_upload(
+            self.bucket_name,
+            object_name,
+            upload_id,
+            [Part(part_number, etag) for part_number, etag in sorted(parts)],
+        )
+        return result.etag
+
+    def abort_multipart_upload(self, object_name: str, upload_id: str) -> None:
+        self.client._abort_multipart_upload(self.bucket_name, object_name, upload_id)
+
+    def multipart_upload_size(self, object_name: str, upload_id: str) -> int:
+        """Total size of the parts uploaded so far."""
+        size = 0
+        marker = None
+        while True:
+            result = self.client._list_parts(self.bucket_name, object_name, upload_id, part_number_marker=marker)
+            size += sum(part.size for part in result.parts)
+            if not result.is_truncated:
+                return size
+            marker = result.next_part_number_marker
+
+    def copy_from(
+            self,
+            object_name: str,
+            source_bucket: str,
+            source_name: str,
+            content_type: str,
+            metadata: Optional[dict] = None,
+    ) -> str:
+        """Server-side copy of another bucket's object, with new content type and metadata.
+
+        compose_object switches to a multipart copy for sources above the
+        5 GiB single-copy limit. Returns the new object's ETag.
+        """
+        result = self.client.compose_object(
+            self.bucket_name,
+            object_name,
+            [ComposeSource(source_bucket, source_name)],
+            metadata={"Content-Type": content_type, **(metadata or {})},
+        )
+        return result.etag
+
     def list_files(self, prefix: str = "") -> list[FileStat]:
         objects = self.client.list_objects(
             bucket_name=self.bucket_name,
@@ -126,8 +241,73 @@ class MinioClient:
 
         return files
 
+    def iter_files(self, prefix: str = "", start_after: Optional[str] = None) -> Iterator[FileStat]:
+        """Lazily list objects in key order, starting after ``start_after``."""
+        objects = self.client.list_objects(
+            bucket_name=self.bucket_name,
+            prefix=prefix,
+            recursive=True,
+            start_after=start_after,
+        )
+        for obj in objects:
+            yield FileStat.from_object(obj)
+
     def stat_file(self, object_name: str) -> FileStat:
         return FileStat.from_object(self.client.stat_object(self.bucket_name, object_name))
 
 
-minio_client = MinioClient()
+class AsyncMinioClient:
+    """Awaitable facade over MinioClient.
+
+    minio-py only ships a blocking client, so calls run on a dedicated thread
+    pool sized for I/O instead of sharing the event loop's default executor
+    (and the request threadpool) with CPU-bound work.
+    """
+    _minio: MinioClient
+    _executor: ThreadPoolExecutor
+
+    def __init__(self, minio: MinioClient, max_workers: Optional[int] = None):
+        self._minio = minio
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.minio_async_workers,
+            thread_name_prefix="minio-io",
+        )
+
+    @property
+    def bucket_name(self) -> str:
+        return self._minio.bucket_name
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def stat_file(self, object_name: str) -> FileStat:
+        return await self._run(self._minio.stat_file, object_name)
+
+    async def delete_file(self, object_name: str) -> bool:
+        return await self._run(self._minio.delete_file, object_name)
+
+    async def delete_files(self, object_names: list[str]) -> dict[str, str]:
+        return await self._run(self._minio.delete_files, object_names)
+
+    async def download_file(self, object_name: str) -> bytes:
+        return await self._run(self._minio.download_file, object_name)
+
+    async def list_page(self, start_after: Optional[str] = None, limit: int = 10) -> list[FileStat]:
+        """Return up to ``limit`` objects in key order after ``start_after``."""
+        return await self._run(lambda: list(islice(self._minio.iter_files(start_after=start_after), limit)))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+minio_client: Lazy[MinioClient] = Lazy("minio_client", MinioClient)
+artifact_minio_client: Lazy[MinioClient] = Lazy(
+    "artifact_minio_client",
+    lambda: MinioClient(settings.minio_artifacts_bucket),
+)
+async_minio_client: Lazy[AsyncMinioClient] = Lazy(
+    "async_minio_client",
+    lambda: AsyncMinioClient(minio_client.get()),
+    close=lambda client: client.close(),
+)
@@ -1,52 +1,217 @@
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.models import (
-    Distance,
-    VectorParams,
-    PointStruct,
+    Batch,
+    CollectionParamsDiff,
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
     Filter,
     FieldCondition,
+    MatchAny,
     MatchValue,
+    PayloadSchemaType,
+    PointIdsList,
+    SetPayload,
+    SetPayloadOperation,
+    VectorParamsDiff,
 )
-from app.packages.infrastructure.qdrant import qdrant_client
+from app.packages.infrastructure.lazy import Lazy
+from app.packages.infrastructure.qdrant import qdrant_client, async_qdrant_client
+from app.packages.storage.chunk_text import ChunkTextStore, chunk_text_store
+from app.packages.storage.collection_profile import CollectionProfile, INDEXED_PAYLOAD_FIELDS
 from app.config import settings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import asyncio
+import hashlib
+import logging
 import numpy as np
-from typing import Optional
+import threading
+import time
+import uuid
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Namespace for point ids, so the same file and chunk always map to the same id.
+POINT_ID_NAMESPACE = uuid.UUID("6f1c3c52-3f4e-4b8e-9a57-0d1f1c2b7e41")
+
+
+def chunk_hash(chunk: str) -> str:
+    return hashlib.sha256(chunk.encode()).hexdigest()
+
+
+def point_ids(file_id: str, chunks: list[str]) -> list[str]:
+    """Stable UUIDv5 ids derived from the file id and chunk content.
+
+    Repeated chunks in one file are told apart by their occurrence number.
+    """
+    seen: dict[str, int] = {}
+    ids = []
+    for chunk in chunks:
+        digest = chunk_hash(chunk)
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        ids.append(str(uuid.uuid5(POINT_ID_NAMESPACE, f"{file_id}:{digest}:{occurrence}")))
+    return ids
+
+
+@dataclass
+class ReindexPlan:
+    """Difference between a file's stored points and its current chunks."""
+    ids: list[str]
+    new: list[int] = field(default_factory=list)
+    stale: list = field(default_factory=list)
+    moved: dict[str, int] = field(default_factory=dict)
+    # Chunk text versions the stored points reference (None: unversioned or inline).
+    text_versions: set = field(default_factory=set)
+
+    @property
+    def unchanged(self) -> bool:
+        return not (self.new or self.stale or self.moved)
 
 
 class QdrantVectorStore:
     client: QdrantClient
     collection_name: str
+    profile: CollectionProfile
+    chunk_texts: Optional[ChunkTextStore]
 
-    def __init__(self, collection_name: Optional[str] = None):
-        self.client = qdrant_client
+    def __init__(
+            self,
+            collection_name: Optional[str] = None,
+            client: Optional[QdrantClient] = None,
+            upsert_parallel: Optional[int] = None,
+            profile: Optional[CollectionProfile] = None,
+            chunk_texts: Optional[ChunkTextStore] = None,
+            vector_size: int = 384,
+    ):
+        self.client = client if client is not None else qdrant_client.get()
         self.collection_name = collection_name or settings.qdrant_collection_name
-        self._ensure_collection_exists()
+        self.profile = profile or CollectionProfile.from_settings()
+        self.chunk_texts = chunk_texts if chunk_texts is not None else _default_chunk_texts()
+        self._upload_pool = ThreadPoolExecutor(
+            max_workers=max(1, upsert_parallel or settings.qdrant_upsert_parallel),
+            thread_name_prefix="qdrant-upsert",
+        )
+        self._pending: dict[str, int] = {}
+        # Chunk text versions to delete once a pending file's upsert is visible.
+        self._superseded: dict[str, set] = {}
+        self._pending_lock = threading.Lock()
+        self._ensure_collection_exists(vector_size=vector_size)
 
     def _ensure_collection_exists(self, vector_size: int = 384) -> None:
         try:
             collections = self.client.get_collections().collections
             collection_names = [col.name for col in collections]
+            # The configured name may be an alias that reindexing points at a new collection.
+            collection_names += [alias.alias_name for alias in self.client.get_aliases().aliases]
 
             if self.collection_name not in collection_names:
-                print(f"Creating collection: {self.collection_name}")
+                logger.info("Creating collection %s", self.collection_name)
                 self.client.create_collection(
                     collection_name=self.collection_name,
-                    vectors_config=VectorParams(
-                        size=vector_size,
-                        distance=Distance.COSINE,
-                    ),
+                    vectors_config=self.profile.vectors_config(vector_size),
+                    on_disk_payload=self.profile.on_disk_payload,
+                    hnsw_config=self.profile.hnsw_config(),
+                    quantization_config=self.profile.quantization_config(),
                 )
-                print(f"Collection {self.collection_name} created successfully")
+                for field_name in INDEXED_PAYLOAD_FIELDS:
+                    self._create_payload_index(field_name)
+                logger.info("Collection %s created", self.collection_name)
         except Exception as e:
-            print(f"Error ensuring collection exists: {e}")
+            logger.error("Error ensuring collection exists: %s", e)
             raise
 
+    def _create_payload_index(self, field_name: str) -> None:
+        self.client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name=field_name,
+            field_schema=PayloadSchemaType.KEYWORD,
+            wait=True,
+        )
+
+    def migrate_collection(self, vector_size: int = 384, dry_run: bool = False) -> dict:
+        """Bring an existing collection in line with the configured profile, in place.
+
+        Missing payload indexes are built and HNSW, quantization and on-disk
+        settings updated; Qdrant rebuilds segments in the background and keeps
+        serving searches meanwhile. The vector size cannot change in place, so
+        a mismatch raises ValueError: recreate the collection and reindex.
+        """
+        info = self.client.get_collection(collection_name=self.collection_name)
+        changes = self.profile.differences(info.config, vector_size)
+        if "vector_size" in changes:
+            current, wanted = changes["vector_size"]
+            raise ValueError(f"Collection has {current}-dimensional vectors, expected {wanted}; it must be recreated")
+        missing_indexes = [field for field in INDEXED_PAYLOAD_FIELDS if field not in (info.payload_schema or {})]
+
+        result = {
+            "collection_name": self.collection_name,
+            "changes": {key: {"current": current, "wanted": wanted} for key, (current, wanted) in changes.items()},
+            "payload_indexes": missing_indexes,
+            "applied": False,
+        }
+        if dry_run or not (changes or missing_indexes):
+            return result
+
+        update = {}
+        if "on_disk_vectors" in changes:
+            # The collection's single unnamed vector is addressed as "".
+            update["vectors_config"] = {"": VectorParamsDiff(on_disk=self.profile.on_disk_vectors)}
+        if "on_disk_payload" in changes:
+            update["collection_params"] = CollectionParamsDiff(on_disk_payload=self.profile.on_disk_payload)
+        if changes.keys() & {"hnsw_m", "hnsw_ef_construct", "hnsw_on_disk"}:
+            update["hnsw_config"] = self.profile.hnsw_config()
+        if changes.keys() & {"quantization", "quantization_always_ram"}:
+            update["quantization_config"] = self.profile.quantization_update()
+        if update:
+            logger.info("Updating collection %s: %s", self.collection_name, ", ".join(changes))
+            self.client.update_collection(collection_name=self.collection_name, **update)
+
+        for field_name in missing_indexes:
+            logger.info("Creating payload index on %s", field_name)
+            self._create_payload_index(field_name)
+
+        result["applied"] = True
+        return result
+
+    def point_alias(self, alias: str, replace_collection: bool = False) -> Optional[str]:
+        """Point ``alias`` at this collection and return the collection it pointed at before.
+
+        The switch is a single atomic alias update, so searches through the
+        alias move over without downtime. A plain collection that has the
+        alias's name (before the first switch to aliases) has to be deleted
+        first; ``replace_collection`` allows that, and searches fail for the
+        moment between the delete and the alias creation.
+        """
+        previous = next(
+            (item.collection_name for item in self.client.get_aliases().aliases if item.alias_name == alias),
+            None,
+        )
+        if alias in {col.name for col in self.client.get_collections().collections}:
+            if not replace_collection:
+                raise ValueError(f"{alias} is a collection, not an alias; it has to be replaced to switch to an alias")
+            logger.warning("Deleting collection %s to replace it with an alias", alias)
+            self.client.delete_collection(collection_name=alias)
+
+        operations = []
+        if previous is not None:
+            operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias)))
+        operations.append(CreateAliasOperation(
+            create_alias=CreateAlias(collection_name=self.collection_name, alias_name=alias),
+        ))
+        self.client.update_collection_aliases(change_aliases_operations=operations)
+        logger.info("Alias %s now points at %s (was %s)", alias, self.collection_name, previous)
+        return previous
+
     def recreate_collection(self, vector_size: int = 384) -> None:
         try:
             self.client.delete_collection(collection_name=self.collection_name)
-            print(f"Deleted collection: {self.collection_name}")
+            logger.info("Deleted collection %s", self.collection_name)
         except Exception as e:
-            print(f"Collection might not exist: {e}")
+            logger.warning("Collection might not exist: %s", e)
 
         self._ensure_collection_exists(vector_size=vector_size)
 
@@ -55,72 +220,296 @@ class QdrantVectorStore:
             file_id: str,
             chunks: list[str],
             embeddings: np.ndarray,
+            wait: Optional[bool] = None,
+            indices: Optional[list[int]] = None,
+    ) -> dict:
+        """Upsert the chunks of a file in parallel batches.
+
+        ``indices`` restricts the upsert to those chunk positions, in which case
+        ``embeddings`` holds one row per index. With ``wait=False`` the call
+        returns once Qdrant has accepted the batches, before they are
+        searchable; call ``barrier`` to wait for them.
+
+        With the chunk text side store, the text versions the file's points
+        referenced before are deleted once the upsert is visible: right away
+        when waiting, otherwise when the file leaves the pending set.
+        """
+        indices = list(range(len(chunks))) if indices is None else indices
+        _check_embeddings(indices, embeddings)
+        text_version = None
+        superseded = set()
+        if self.chunk_texts is not None:
+            superseded = {payload.get("chunk_text") for _, payload in self._scroll_payloads(file_id, ["chunk_text"])}
+            # Written before the points, so no search hit points at missing text.
+            text_version = self.chunk_texts.put(file_id, chunks)
+        return self._upsert_chunks(file_id, chunks, embeddings, indices, wait, text_version, superseded)
+
+    def _upsert_chunks(
+            self,
+            file_id: str,
+            chunks: list[str],
+            embeddings: np.ndarray,
+            indices: list[int],
+            wait: Optional[bool],
+            text_version: Optional[str],
+            superseded: set = frozenset(),
     ) -> dict:
-        if len(chunks) != len(embeddings):
-            raise ValueError(f"Number of chunks ({len(chunks)}) must match number of embeddings ({len(embeddings)})")
-
-        points = []
-        for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            point = PointStruct(
-                id=hash(f"{file_id}_{idx}") % (10 ** 12),
-                vector=embedding.tolist(),
-                payload={
-                    "file_id": file_id,
-                    "chunk_index": idx,
-                    "text": chunk,
-                    "chunk_length": len(chunk),
-                }
+        wait = settings.qdrant_upsert_wait if wait is None else wait
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        all_ids = point_ids(file_id, chunks)
+        ids = [all_ids[idx] for idx in indices]
+        payloads = [
+            {
+                "file_id": file_id,
+                "chunk_index": idx,
+                "chunk_hash": chunk_hash(chunks[idx]),
+                "chunk_length": len(chunks[idx]),
+            }
+            for idx in indices
+        ]
+        if text_version is not None:
+            for payload in payloads:
+                payload["chunk_text"] = text_version
+        else:
+            for payload, idx in zip(payloads, indices):
+                payload["text"] = chunks[idx]
+
+        batch_size = max(1, settings.qdrant_upsert_batch_size)
+        futures = [
+            self._upload_pool.submit(
+                self._upsert_batch,
+                ids[start:start + batch_size],
+                vectors[start:start + batch_size],
+                payloads[start:start + batch_size],
+                wait,
             )
-            points.append(point)
+            for start in range(0, len(ids), batch_size)
+        ]
+        for future in futures:
+            future.result()
 
-        operation_info = self.client.upsert(
-            collection_name=self.collection_name,
-            points=points,
-            wait=True,
-        )
+        if wait:
+            self._delete_text_versions(file_id, superseded)
+        else:
+            with self._pending_lock:
+                self._pending[file_id] = len(chunks)
+                if superseded:
+                    self._superseded.setdefault(file_id, set()).update(superseded)
+            self._confirm_pending()
 
         return {
-            "status": operation_info.status,
+            "status": "completed" if wait else "acknowledged",
             "file_id": file_id,
-            "num_chunks": len(chunks),
+            "num_chunks": len(indices),
         }
 
+    def plan_reindex(self, file_id: str, chunks: list[str]) -> ReindexPlan:
+        """Compare the stored points of a file with its current chunks.
+
+        Chunks whose id is not stored yet are ``new`` and need embedding,
+        stored points that no longer match a chunk are ``stale``, and kept
+        points whose position changed are ``moved``.
+        """
+        ids = point_ids(file_id, chunks)
+        plan = ReindexPlan(ids=ids)
+        stored = {}
+        for point_id, payload in self._scroll_payloads(file_id, ["chunk_index", "chunk_text"]):
+            stored[point_id] = payload.get("chunk_index")
+            plan.text_versions.add(payload.get("chunk_text"))
+
+        for idx, point_id in enumerate(ids):
+            if point_id not in stored:
+                plan.new.append(idx)
+            elif stored[point_id] != idx:
+                plan.moved[point_id] = idx
+
+        current = set(ids)
+        plan.stale = [point_id for point_id in stored if point_id not in current]
+        return plan
+
+    def apply_reindex(
+            self,
+            file_id: str,
+            chunks: list[str],
+            plan: ReindexPlan,
+            embeddings: Optional[np.ndarray],
+    ) -> dict:
+        """Upsert the new chunks of a plan, re-point moved ones and drop stale ones.
+
+        ``embeddings`` holds one row per ``plan.new`` index; it may be None
+        when nothing is new, e.g. a file that only lost chunks.
+
+        With the chunk text side store, every point of the file moves to one
+        new text version, and the versions it superseded are deleted once the
+        payload update has landed.
+        """
+        _check_embeddings(plan.new, embeddings)
+        text_version = self.chunk_texts.put(file_id, chunks) if self.chunk_texts is not None else None
+        result = {"status": "unchanged", "file_id": file_id, "num_chunks": 0}
+        if plan.new:
+            result = self._upsert_chunks(file_id, chunks, embeddings, plan.new, None, text_version)
+
+        operations = [
+            SetPayloadOperation(set_payload=SetPayload(payload={"chunk_index": idx}, points=[point_id]))
+            for point_id, idx in plan.moved.items()
+        ]
+        if self.chunk_texts is not None:
+            # Kept points move to the new artifact along with the new ones.
+            operations.append(SetPayloadOperation(set_payload=SetPayload(
+                payload={"chunk_text": text_version},
+                filter=self._file_filter(file_id),
+            )))
+        if operations:
+            self.client.batch_update_points(collection_name=self.collection_name, update_operations=operations)
+        if plan.stale:
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=plan.stale),
+            )
+        if self.chunk_texts is not None:
+            self.chunk_texts.delete_versions(file_id, plan.text_versions - {text_version})
+
+        result["num_deleted"] = len(plan.stale)
+        return result
+
+    def scroll_chunk_indices(self, file_id: str) -> dict:
+        """Map every stored point id of a file to its chunk index."""
+        return {point_id: payload.get("chunk_index") for point_id, payload in self._scroll_payloads(file_id, ["chunk_index"])}
+
+    def _scroll_payloads(self, file_id: str, fields: list[str]) -> Iterator[tuple[str, dict]]:
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=self._file_filter(file_id),
+                limit=1000,
+                offset=offset,
+                with_payload=fields,
+                with_vectors=False,
+            )
+            for record in records:
+                yield str(record.id) if isinstance(record.id, uuid.UUID) else record.id, record.payload
+            if offset is None:
+                return
+
+    def _upsert_batch(self, ids: list, vectors: np.ndarray, payloads: list[dict], wait: bool) -> None:
+        # One tolist() per batch instead of a PointStruct per chunk.
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=Batch(ids=ids, vectors=vectors.tolist(), payloads=payloads),
+            wait=wait,
+        )
+
+    def barrier(self, timeout: Optional[float] = None) -> None:
+        """Block until every upsert sent with ``wait=False`` is visible to searches."""
+        timeout = settings.qdrant_barrier_timeout_seconds if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._pending_lock:
+            pending = dict(self._pending)
+
+        for file_id, expected in pending.items():
+            # A file deleted meanwhile leaves the pending set and never shows up.
+            while self._is_pending(file_id, expected) and self.count_by_file_id(file_id) < expected:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Chunks of file {file_id} not visible after {timeout}s")
+                time.sleep(0.05)
+            self._settle_pending(file_id, expected)
+
+    def _confirm_pending(self) -> None:
+        """Keep the pending set bounded once it reaches ``qdrant_pending_max_files``.
+
+        Entries already visible are dropped with one count each; if Qdrant is
+        so far behind that the set is still full, block on ``barrier``.
+        """
+        with self._pending_lock:
+            if len(self._pending) < settings.qdrant_pending_max_files:
+                return
+            pending = dict(self._pending)
+
+        for file_id, expected in pending.items():
+            if self.count_by_file_id(file_id) >= expected:
+                self._settle_pending(file_id, expected)
+
+        with self._pending_lock:
+            full = len(self._pending) >= settings.qdrant_pending_max_files
+        if full:
+            self.barrier()
+
+    def _settle_pending(self, file_id: str, expected: int) -> None:
+        with self._pending_lock:
+            if self._pending.get(file_id) != expected:
+                return
+            del self._pending[file_id]
+            superseded = self._superseded.pop(file_id, set())
+        self._delete_text_versions(file_id, superseded)
+
+    def _delete_text_versions(self, file_id: str, versions: set) -> None:
+        if versions and self.chunk_texts is not None:
+            self.chunk_texts.delete_versions(file_id, versions)
+
+    def _is_pending(self, file_id: str, expected: int) -> bool:
+        with self._pending_lock:
+            return self._pending.get(file_id) == expected
+
+    def _forget_pending(self, file_ids: list[str]) -> None:
+        with self._pending_lock:
+            for file_id in file_ids:
+                self._pending.pop(file_id, None)
+                self._superseded.pop(file_id, None)
+
+    def close(self) -> None:
+        """Stop the upsert threads; call ``barrier`` first to wait for pending upserts."""
+        self._upload_pool.shutdown(wait=True)
+
+    def count_by_file_id(self, file_id: str) -> int:
+        result = self.client.count(
+            collection_name=self.collection_name,
+            count_filter=self._file_filter(file_id),
+            exact=True,
+        )
+        return result.count
+
+    @staticmethod
+    def _file_filter(file_id: str) -> Filter:
+        return Filter(
+            must=[
+                FieldCondition(
+                    key="file_id",
+                    match=MatchValue(value=file_id),
+                )
+            ]
+        )
+
+    @staticmethod
+    def _files_filter(file_ids: list[str]) -> Filter:
+        return Filter(must=[FieldCondition(key="file_id", match=MatchAny(any=file_ids))])
+
     def search(
             self,
             query_embedding: np.ndarray,
             limit: int = 5,
             file_id: Optional[str] = None,
             score_threshold: Optional[float] = None,
+            with_text: bool = True,
     ) -> list[dict]:
-        search_filter = None
-        if file_id:
-            search_filter = Filter(
-                must=[
-                    FieldCondition(
-                        key="file_id",
-                        match=MatchValue(value=file_id),
-                    )
-                ]
-            )
+        """Return the closest chunks; ``with_text=False`` skips loading their text."""
+        search_filter = self._file_filter(file_id) if file_id else None
 
-        results = self.client.search(
+        results = self.client.query_points(
             collection_name=self.collection_name,
-            query_vector=query_embedding.tolist(),
+            query=np.asarray(query_embedding, dtype=np.float32).tolist(),
             limit=limit,
             query_filter=search_filter,
             score_threshold=score_threshold,
-        )
+            search_params=self.profile.search_params(),
+            with_payload=_hit_payload_fields(with_text),
+        ).points
 
-        return [
-            {
-                "id": result.id,
-                "score": result.score,
-                "text": result.payload.get("text"),
-                "file_id": result.payload.get("file_id"),
-                "chunk_index": result.payload.get("chunk_index"),
-            }
-            for result in results
-        ]
+        hits = [_search_hit(result) for result in results]
+        if with_text and self.chunk_texts is not None:
+            hits = self.chunk_texts.hydrate(hits, [result.payload.get("chunk_text") for result in results])
+        return hits
 
     def delete_by_file_id(self, file_id: str) -> dict:
         """Delete all chunks for a specific file."""
@@ -139,12 +528,31 @@ class QdrantVectorStore:
                 )
             ),
         )
+        self._forget_pending([file_id])
+        if self.chunk_texts is not None:
+            self.chunk_texts.delete([file_id])
 
         return {
             "status": result.status,
             "file_id": file_id,
         }
 
+    def delete_by_file_ids(self, file_ids: list[str]) -> dict:
+        """Delete all chunks of several files with a single filtered delete."""
+        from qdrant_client.models import FilterSelector
+
+        result = self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(filter=self._files_filter(file_ids)),
+        )
+        self._forget_pending(file_ids)
+        if self.chunk_texts is not None:
+            self.chunk_texts.delete(file_ids)
+        return {
+            "status": result.status,
+            "file_ids": file_ids,
+        }
+
     def get_collection_info(self) -> dict:
         """Get information about the collection."""
         info = self.client.get_collection(collection_name=self.collection_name)
@@ -156,4 +564,122 @@ class QdrantVectorStore:
         }
 
 
-qdrant_store = QdrantVectorStore()
+class AsyncQdrantVectorStore:
+    """Read and delete side of QdrantVectorStore for use on the event loop.
+
+    Collection setup and upserts stay with the synchronous store used by the
+    processor; this one assumes the collection already exists.
+    """
+    client: AsyncQdrantClient
+    collection_name: str
+    profile: CollectionProfile
+    chunk_texts: Optional[ChunkTextStore]
+
+    def __init__(
+            self,
+            collection_name: Optional[str] = None,
+            profile: Optional[CollectionProfile] = None,
+            chunk_texts: Optional[ChunkTextStore] = None,
+    ):
+        self.client = async_qdrant_client.get()
+        self.collection_name = collection_name or settings.qdrant_collection_name
+        self.profile = profile or CollectionProfile.from_settings()
+        self.chunk_texts = chunk_texts if chunk_texts is not None else _default_chunk_texts()
+
+    async def search(
+            self,
+            query_embedding: np.ndarray,
+            limit: int = 5,
+            file_id: Optional[str] = None,
+            score_threshold: Optional[float] = None,
+            with_text: bool = True,
+    ) -> list[dict]:
+        search_filter = QdrantVectorStore._file_filter(file_id) if file_id else None
+
+        response = await self.client.query_points(
+            collection_name=self.collection_name,
+            query=np.asarray(query_embedding, dtype=np.float32).tolist(),
+            limit=limit,
+            query_filter=search_filter,
+            score_threshold=score_threshold,
+            search_params=self.profile.search_params(),
+            with_payload=_hit_payload_fields(with_text),
+        )
+        hits = [_search_hit(result) for result in response.points]
+        if with_text and self.chunk_texts is not None:
+            # The side store is blocking (MinIO, Redis); keep it off the event loop.
+            versions = [result.payload.get("chunk_text") for result in response.points]
+            hits = await asyncio.to_thread(self.chunk_texts.hydrate, hits, versions)
+        return hits
+
+    async def count_by_file_id(self, file_id: str) -> int:
+        result = await self.client.count(
+            collection_name=self.collection_name,
+            count_filter=QdrantVectorStore._file_filter(file_id),
+            exact=True,
+        )
+        return result.count
+
+    async def delete_by_file_id(self, file_id: str) -> dict:
+        from qdrant_client.models import FilterSelector
+
+        result = await self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(filter=QdrantVectorStore._file_filter(file_id)),
+        )
+        if self.chunk_texts is not None:
+            await asyncio.to_thread(self.chunk_texts.delete, [file_id])
+        return {
+            "status": result.status,
+            "file_id": file_id,
+        }
+
+    async def delete_by_file_ids(self, file_ids: list[str]) -> dict:
+        from qdrant_client.models import FilterSelector
+
+        result = await self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(filter=QdrantVectorStore._files_filter(file_ids)),
+        )
+        if self.chunk_texts is not None:
+            await asyncio.to_thread(self.chunk_texts.delete, file_ids)
+        return {
+            "status": result.status,
+            "file_ids": file_ids,
+        }
+
+
+def _check_embeddings(indices: list[int], embeddings: Optional[np.ndarray]) -> None:
+    count = 0 if embeddings is None else len(embeddings)
+    if len(indices) != count:
+        raise ValueError(f"Number of chunks ({len(indices)}) must match number of embeddings ({count})")
+
+
+def _default_chunk_texts() -> Optional[ChunkTextStore]:
+    match settings.chunk_text_store:
+        case "payload":
+            return None
+        case "artifact":
+            return chunk_text_store
+        case _:
+            raise ValueError(f"Unsupported chunk text store: {settings.chunk_text_store}")
+
+
+def _hit_payload_fields(with_text: bool) -> list[str]:
+    # Points written before text moved to the side store still carry it in
+    # the payload; asking for the field costs nothing when it is absent.
+    return ["file_id", "chunk_index", "chunk_text", "text"] if with_text else ["file_id", "chunk_index"]
+
+
+def _search_hit(result) -> dict:
+    return {
+        "id": result.id,
+        "score": result.score,
+        "text": result.payload.get("text"),
+        "file_id": result.payload.get("file_id"),
+        "chunk_index": result.payload.get("chunk_index"),
+    }
+
+
+qdrant_store: Lazy[QdrantVectorStore] = Lazy("qdrant_store", QdrantVectorStore, close=lambda store: store.close())
+async_qdrant_store: Lazy[AsyncQdrantVectorStore] = Lazy("async_qdrant_store", AsyncQdrantVectorStore)
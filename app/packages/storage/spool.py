@@ -0,0 +1,98 @@
+import hashlib
+import mmap
+import tempfile
+from io import BytesIO
+from typing import IO, Iterable, Optional
+
+from app.config import settings
+
+
+class ChecksumMismatchError(Exception):
+    """Downloaded content does not hash to the expected digest."""
+
+
+class SpooledObject:
+    """Downloaded object content, in memory when small and in a temp file otherwise.
+
+    ``view`` returns a read-only, zero-copy buffer over the content: the
+    in-memory buffer itself, or a memory map of the temp file, so the kernel
+    pages large files in and out instead of them living on the heap. ``path``
+    is set for file-backed objects, so other processes can map the same file.
+    """
+
+    def __init__(self, file: IO[bytes], size: int, sha256: str, path: Optional[str] = None):
+        self._file = file
+        self._mmap: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        self.size = size
+        self.sha256 = sha256
+        self.path = path
+
+    def view(self) -> memoryview:
+        if self._view is None:
+            if isinstance(self._file, BytesIO):
+                self._view = self._file.getbuffer().toreadonly()
+            elif self.size == 0:
+                self._view = memoryview(b"")
+            else:
+                self._file.flush()
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mmap)
+        return self._view
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "SpooledObject":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def spool_stream(
+        chunks: Iterable[bytes],
+        expected_sha256_prefix: Optional[str] = None,
+        max_memory_bytes: Optional[int] = None,
+        directory: Optional[str] = None,
+) -> SpooledObject:
+    """Write ``chunks`` to memory, moving to a temp file past ``max_memory_bytes``.
+
+    The content is hashed as it arrives; when ``expected_sha256_prefix`` is
+    given and the digest does not start with it, the spooled data is discarded
+    and ChecksumMismatchError is raised.
+    """
+    max_memory_bytes = settings.download_spool_max_bytes if max_memory_bytes is None else max_memory_bytes
+    directory = directory or settings.download_dir
+
+    digest = hashlib.sha256()
+    file: IO[bytes] = BytesIO()
+    path = None
+    size = 0
+    try:
+        for chunk in chunks:
+            digest.update(chunk)
+            size += len(chunk)
+            if path is None and size > max_memory_bytes:
+                # Named so extraction workers can open and map the same file.
+                spilled = tempfile.NamedTemporaryFile(dir=directory, prefix="download-")
+                spilled.write(file.getbuffer())
+                file, path = spilled, spilled.name
+            file.write(chunk)
+    except BaseException:
+        file.close()
+        raise
+
+    sha256 = digest.hexdigest()
+    if expected_sha256_prefix and not sha256.startswith(expected_sha256_prefix):
+        file.close()
+        raise ChecksumMismatchError(f"Content hashes to {sha256}, expected prefix {expected_sha256_prefix}")
+
+    file.seek(0)
+    return SpooledObject(file, size=size, sha256=sha256, path=path)
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, status, Depends
+from typing import Optional
+
+from fastapi import APIRouter, status, Depends, Query
 from fastapi.encoders import jsonable_encoder
 from fastapi.concurrency import run_in_threadpool
 from fastapi_utils.cbv import cbv
 from minio.error import S3Error
 
-from app.models.service import Response, UploadFileRequest, GetFileRequest
+from app.models.service import Response, UploadFileRequest, UploadBatchRequest, GetFileRequest, DeleteFilesRequest, CreateUploadRequest, CompleteUploadRequest
 from app.packages import FileStat
 from app.handlers.services import FileService
 from app.exceptions import ServiceException
+from app.config import settings
 
 router = APIRouter(prefix="/files", tags=["Files"])
 
@@ -25,11 +28,75 @@ class FileHandler:
         )
         return Response.success(data)
 
+    @router.post("/upload/batch", status_code=status.HTTP_200_OK, response_model=Response)
+    async def upload_files(self, request: UploadBatchRequest = Depends()):
+        if len(request.files) > settings.upload_batch_max_files:
+            raise ServiceException(
+                code=status.HTTP_400_BAD_REQUEST,
+                message=f"At most {settings.upload_batch_max_files} files per batch"
+            )
+        data = await self.file_service.save_files(request.files)
+        return Response.success(data)
+
+    @router.post("/delete/batch", status_code=status.HTTP_200_OK, response_model=Response)
+    async def delete_files(self, request: DeleteFilesRequest):
+        data = await self.file_service.delete_files(request.file_ids)
+        return Response.success(data)
+
+    @router.post("/uploads", status_code=status.HTTP_200_OK, response_model=Response)
+    async def create_upload(self, request: CreateUploadRequest):
+        try:
+            data = await run_in_threadpool(
+                self.file_service.create_upload_session,
+                request.filename,
+                request.content_type,
+                request.size,
+                request.sha256,
+            )
+        except ValueError as e:
+            raise ServiceException(
+                code=status.HTTP_409_CONFLICT,
+                message=str(e)
+            )
+        return Response.success(data)
+
+    @router.post("/uploads/{session_id}/complete", status_code=status.HTTP_200_OK, response_model=Response)
+    async def complete_upload(self, session_id: str, request: CompleteUploadRequest):
+        parts = [(part.part_number, part.etag) for part in request.parts] if request.parts else None
+        try:
+            data = await run_in_threadpool(self.file_service.complete_upload_session, session_id, parts)
+        except LookupError as e:
+            raise ServiceException(
+                code=status.HTTP_404_NOT_FOUND,
+                message=str(e)
+            )
+        except ValueError as e:
+            raise ServiceException(
+                code=status.HTTP_400_BAD_REQUEST,
+                message=str(e)
+            )
+        return Response.success(data)
+
+    # Declared before /{file_id} so "list" is not captured as a file id.
+    @router.get("/list", status_code=status.HTTP_200_OK, response_model=Response)
+    async def list_files(self, cursor: Optional[str] = None, limit: int = Query(default=10, ge=1, le=100)):
+        try:
+            data = await self.file_service.list_files(cursor=cursor, limit=limit)
+        except ValueError as e:
+            raise ServiceException(
+                code=status.HTTP_400_BAD_REQUEST,
+                message=str(e)
+            )
+        return {
+            "code": status.HTTP_200_OK,
+            "message": "Files retrieved successfully",
+            "data": jsonable_encoder(data)
+        }
+
     @router.get("/{file_id}", response_model=Response[FileStat])
     async def get_file(self, request: GetFileRequest = Depends()):
         try:
             data = await self.file_service.get_file(request.file_id)
-            return Response.success(jsonable_encoder(data))
         except S3Error as e:
             match e.code:
                 case "NoSuchKey":
@@ -48,20 +115,26 @@ class FileHandler:
                 message=f"Unexpected error: {str(e)}"
             )
 
+        if data is None:
+            raise ServiceException(
+                code=status.HTTP_404_NOT_FOUND,
+                message="File not found"
+            )
+        return Response.success(jsonable_encoder(data))
+
     @router.delete("/{file_id}", status_code=status.HTTP_200_OK, response_model=Response)
     async def delete_file(self, file_id: str):
-        data = await self.file_service.delete_file(file_id)
+        result = await self.file_service.delete_files([file_id])
+        if result["failed"]:
+            raise ServiceException(
+                code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message=f"Storage error: {result['failed'][0]['error']}"
+            )
         return {
             "code": status.HTTP_200_OK,
             "message": "File deleted successfully",
-            "data": data
-        }
-
-    @router.get("/list", status_code=status.HTTP_200_OK, response_model=Response)
-    async def list_files(self, skip: int = 0, limit: int = 10):
-        data = await self.file_service.list_files(skip=skip, limit=limit)
-        return {
-            "code": status.HTTP_200_OK,
-            "message": "Files retrieved successfully",
-            "data": data
+            "data": {
+                "file_id": file_id,
+                "status": "deleted",
+            }
         }
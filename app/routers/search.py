@@ -0,0 +1,32 @@
+from fastapi import APIRouter, status
+from fastapi_utils.cbv import cbv
+
+from app.models.service import Response, SearchRequest
+from app.handlers.services import SearchService
+from app.exceptions import ServiceException
+
+router = APIRouter(tags=["Search"])
+
+
+@cbv(router)
+class SearchHandler:
+    def __init__(self):
+        self.search_service = SearchService()
+
+    # cbv re-mounts endpoints on an unprefixed router, so the path carries the
+    # full route rather than relying on a router prefix.
+    @router.post("/search", status_code=status.HTTP_200_OK, response_model=Response)
+    async def search(self, request: SearchRequest):
+        try:
+            data = await self.search_service.search(
+                query=request.query,
+                file_id=request.file_id,
+                limit=request.limit,
+                with_text=request.with_text,
+            )
+            return Response.success(data)
+        except RuntimeError as e:
+            raise ServiceException(
+                code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                message=f"Search unavailable: {str(e)}"
+            )
@@ -1,14 +1,93 @@
+from app.startup import startup_timer
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
+from starlette.routing import Match
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.config import settings
-from app.routers import health, files
+from app.routers import health, files, search, metrics
 from app.exceptions import ServiceException
+from app.handlers.services.query_encoder import query_encoder
+from app.packages.cache import redis_client, async_redis_client
+from app.packages.storage import minio_client, async_minio_client
+from app.packages.infrastructure import initialize, shutdown
+from app.packages.observability import configure_logging, configure_tracing, span, HTTP_REQUEST_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up():
+    """
+    Build the storage clients and load the query encoder ahead of the first
+    requests. Failures are reported and retried on first use.
+    """
+    from app.packages.storage import async_qdrant_store
+
+    timings = {}
+    for singleton in (redis_client, async_redis_client, minio_client, async_minio_client, async_qdrant_store):
+        try:
+            timings.update(await asyncio.to_thread(initialize, singleton))
+        except Exception as e:
+            logger.warning("Warm-up of %s failed, retrying on first use: %s", singleton.name, e)
+
+    started = time.perf_counter()
+    try:
+        await query_encoder.start()
+        timings["query_encoder"] = time.perf_counter() - started
+    except Exception as e:
+        logger.warning("Warm-up of query encoder failed, retrying on first use: %s", e)
+
+    logger.info(
+        "Warm-up finished (" + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in timings.items()) + ")",
+        extra={"warmup": timings},
+    )
+
+
+async def abort_expired_uploads():
+    """Periodically clean up the staged uploads of expired presigned sessions."""
+    from app.handlers.services import FileService
+
+    file_service = None
+    while True:
+        await asyncio.sleep(settings.upload_cleanup_interval_seconds)
+        try:
+            file_service = file_service or FileService()
+            await asyncio.to_thread(file_service.abort_expired_uploads)
+        except Exception as e:
+            logger.warning("Aborting expired uploads failed: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start serving without waiting for Redis, MinIO, Qdrant or the model:
+    they are built on first use, and warmed in the background when enabled.
+    Everything that was built is closed on shutdown.
+    """
+    configure_logging()
+    configure_tracing("analytics-api")
+    startup_timer.mark("imports")
+    warmup = asyncio.create_task(warm_up()) if settings.warmup_on_startup else None
+    cleanup = asyncio.create_task(abort_expired_uploads()) if settings.upload_cleanup_interval_seconds > 0 else None
+    startup_timer.report("API")
+    yield
+    for task in (warmup, cleanup):
+        if task is not None:
+            task.cancel()
+    await query_encoder.stop()
+    await shutdown()
+
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # Custom exception handler for ServiceException
@@ -32,6 +111,32 @@ async def service_exception_handler(request: Request, exc: ServiceException):
         content=response_data
     )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    Observe request latency per route template, so /files/{file_id} is one
+    series rather than one per file.
+    """
+    started = time.perf_counter()
+    status_code = 500
+    route = route_template(request)
+    with span(f"{request.method} {route}"):
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            HTTP_REQUEST_SECONDS.labels(request.method, route, str(status_code)).observe(time.perf_counter() - started)
+
+
+def route_template(request: Request) -> str:
+    """Path template of the route a request will be dispatched to, e.g. /files/{file_id}."""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
+
 # CORS middleware configuration
 app.add_middleware(
     CORSMiddleware,
@@ -44,6 +149,8 @@ app.add_middleware(
 # Include routers
 app.include_router(health.router)
 app.include_router(files.router)
+app.include_router(search.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,47 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Taken when this module is first imported; entry points import it first.
+PROCESS_STARTED = time.perf_counter()
+
+
+class StartupTimer:
+    """Records how long each startup phase took and prints a one-line report."""
+
+    def __init__(self, started: Optional[float] = None):
+        self._started = PROCESS_STARTED if started is None else started
+        self._last = self._started
+        self.phases: dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """Close ``phase`` as everything since the previous mark."""
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+            self._last = time.perf_counter()
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self._started
+
+    def report(self, component: str) -> None:
+        details = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.phases.items())
+        logger.info(
+            f"{component} started in {self.total:.3f}s ({details})",
+            extra={"startup_seconds": round(self.total, 3), "phases": self.phases},
+        )
+
+
+startup_timer = StartupTimer()
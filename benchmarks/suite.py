@@ -0,0 +1,309 @@
+"""Offline benchmarks for the ingestion hot paths.
+
+Everything runs in-process: PDFs are generated, Qdrant runs in local
+``:memory:`` mode and MinIO/Redis are replaced by in-memory stand-ins. Cases
+that need the embedding model are skipped when it cannot be loaded (e.g. it
+is not in the local Hugging Face cache).
+
+Results are JSON. Each case reports the min/median/mean wall time of its
+repeats and a throughput; with a baseline, each case's median is compared
+against the baseline median and flagged when it got slower than the
+threshold allows.
+"""
+import datetime
+import hashlib
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.packages.storage.minio import FileStat
+from app.packages.storage.spool import SpooledObject, spool_stream
+from benchmarks.synthetic import make_pdf, make_text
+
+EMBEDDING_DIMENSIONS = 384
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[int], None]
+    items: int
+    unit: str
+    repeat: int = 5
+
+
+class InMemoryMinio:
+    """Just enough of MinioClient for the processor's fetch and text persistence steps."""
+
+    def __init__(self):
+        self.objects: dict[str, tuple[bytes, str]] = {}
+
+    def put(self, object_name: str, data: bytes, content_type: str) -> None:
+        self.objects[object_name] = (data, content_type)
+
+    def stat_file(self, object_name: str) -> FileStat:
+        data, content_type = self.objects[object_name]
+        return FileStat(
+            bucket_name="benchmark",
+            object_name=object_name,
+            size=len(data),
+            etag="",
+            last_modified=datetime.datetime.now(datetime.UTC),
+            content_type=content_type,
+        )
+
+    def download_object(self, object_name: str, expected_sha256_prefix: Optional[str] = None) -> SpooledObject:
+        return spool_stream([self.objects[object_name][0]], expected_sha256_prefix=expected_sha256_prefix)
+
+    def upload_file(self, object_name: str, data: bytes, content_type: str = "application/octet-stream") -> dict:
+        self.put(object_name, data, content_type)
+        return {"bucket": "benchmark", "object_name": object_name}
+
+
+class InMemoryDedup:
+    """Just enough of DedupIndex for the processor."""
+
+    def __init__(self):
+        self.indexed: set[str] = set()
+
+    def file_hash(self, file_id: str) -> Optional[str]:
+        return None
+
+    def is_indexed(self, file_id: str) -> bool:
+        return file_id in self.indexed
+
+    def mark_indexed(self, file_id: str) -> None:
+        self.indexed.add(file_id)
+
+
+def run_suite(only: Optional[str] = None, quick: bool = False) -> dict:
+    """Run every case whose name contains ``only`` and return the JSON report.
+
+    Progress goes to stderr so stdout carries only the report.
+    """
+    results: dict[str, dict] = {}
+    for name, build in _CASE_BUILDERS:
+        if only and only not in name:
+            continue
+        try:
+            cases = build(quick)
+        except Exception as e:
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+            print(f"[benchmark] {name}: skipped ({e})", file=sys.stderr)
+            continue
+        try:
+            for case in cases:
+                try:
+                    results[case.name] = _measure(case)
+                except Exception as e:
+                    results[case.name] = {"failed": f"{type(e).__name__}: {e}"}
+                    print(f"[benchmark] {case.name}: failed ({e})", file=sys.stderr)
+                    continue
+                print(f"[benchmark] {case.name}: {results[case.name]['median_seconds']:.4f}s", file=sys.stderr)
+        finally:
+            for case in cases:
+                close = getattr(case.run, "close", None)
+                if close is not None:
+                    close()
+
+    return {
+        "created_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "environment": _environment(),
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> dict:
+    """Add a per-case comparison with ``baseline`` and the list of regressions to ``report``."""
+    comparison = {}
+    regressions = []
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if "median_seconds" not in current or not previous or "median_seconds" not in previous:
+            continue
+        change = current["median_seconds"] / previous["median_seconds"] - 1
+        regressed = change > threshold
+        comparison[name] = {
+            "baseline_median_seconds": previous["median_seconds"],
+            "median_seconds": current["median_seconds"],
+            "change": round(change, 4),
+            "regression": regressed,
+        }
+        if regressed:
+            regressions.append(name)
+
+    return {**report, "baseline_created_at": baseline.get("created_at"), "threshold": threshold,
+            "comparison": comparison, "regressions": regressions}
+
+
+def _measure(case: Case) -> dict:
+    case.run(0)  # warm-up: imports, pools, caches
+    timings = []
+    for iteration in range(1, case.repeat + 1):
+        started = time.perf_counter()
+        case.run(iteration)
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    return {
+        "repeat": case.repeat,
+        "min_seconds": min(timings),
+        "median_seconds": median,
+        "mean_seconds": statistics.fmean(timings),
+        "items": case.items,
+        "unit": case.unit,
+        "per_second": case.items / median if median else None,
+    }
+
+
+def _environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pdf_backend": settings.pdf_backend,
+        "embedding_backend": settings.embedding_backend,
+        "embedding_model": settings.embedding_model,
+    }
+
+
+def _pdf_cases(quick: bool) -> list[Case]:
+    from app.handlers.files_processor.pdf import extract_text_from_pdf
+
+    pool = ProcessPoolExecutor(
+        max_workers=os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    cases = []
+    for pages in (1, 100) if quick else (1, 100, 1000):
+        content = make_pdf(pages)
+        repeat = 3 if pages >= 1000 else 5
+        cases.append(Case(
+            f"pdf.extract.serial.{pages}p",
+            lambda _, content=content: extract_text_from_pdf(content),
+            pages, "pages", repeat,
+        ))
+        cases.append(Case(
+            f"pdf.extract.parallel.{pages}p",
+            lambda _, content=content: extract_text_from_pdf(content, executor=pool),
+            pages, "pages", repeat,
+        ))
+    cases[-1].run.close = lambda: pool.shutdown()
+    return cases
+
+
+def _chunk_cases(quick: bool) -> list[Case]:
+    from app.handlers.files_processor.chunking import chunk_text
+
+    cases = []
+    for words in (100_000,) if quick else (100_000, 1_000_000):
+        text = make_text(words)
+        cases.append(Case(f"chunk.words.{words}", lambda _, text=text: chunk_text(text), words, "words"))
+    return cases
+
+
+def _token_chunk_cases(quick: bool) -> list[Case]:
+    from app.handlers.files_processor.chunking import TokenChunker
+
+    model = _load_model()
+    tokenizer = model.tokenizer
+    chunker = TokenChunker(
+        tokenizer=tokenizer.backend_tokenizer,
+        max_tokens=model.max_seq_length - tokenizer.num_special_tokens_to_add(pair=False),
+        overlap=settings.chunk_overlap_tokens,
+        snap_to_sentence=settings.chunk_snap_sentences,
+    )
+    words = 100_000
+    text = make_text(words)
+    return [Case(f"chunk.tokens.{words}", lambda _: chunker.chunk(text), words, "words")]
+
+
+def _encode_cases(quick: bool) -> list[Case]:
+    model = _load_model()
+    texts = [make_text(120, seed=i) for i in range(256 if quick else 1024)]
+    return [
+        Case(
+            f"encode.batch.{batch_size}",
+            lambda _, batch_size=batch_size: model.encode(texts, batch_size=batch_size, show_progress_bar=False),
+            len(texts), "chunks", 3,
+        )
+        for batch_size in (8, 32, 64, 128)
+    ]
+
+
+def _qdrant_cases(quick: bool) -> list[Case]:
+    store = _local_store()
+    chunks = [make_text(80, seed=i) for i in range(1000 if quick else 5000)]
+    embeddings = np.random.default_rng(0).standard_normal((len(chunks), EMBEDDING_DIMENSIONS)).astype(np.float32)
+
+    def run(iteration: int) -> None:
+        store.add_documents(f"benchmark-{iteration}", chunks, embeddings, wait=True)
+
+    run.close = lambda: store.client.close()
+    return [Case(f"qdrant.add_documents.{len(chunks)}", run, len(chunks), "chunks", 3)]
+
+
+def _processor_cases(quick: bool) -> list[Case]:
+    from app.handlers.files_processor import Processor
+    from app.packages.cache import EmbeddingCache
+    from app.packages.storage import ExtractedTextStore
+
+    pages = 20 if quick else 100
+    minio = InMemoryMinio()
+    processor = Processor(
+        minio_client=minio,
+        vector_store=_local_store(),
+        dedup=InMemoryDedup(),
+        transformer=_load_model(),
+        # Local-only cache; every iteration uploads new text, so it never hits.
+        embedding_cache=EmbeddingCache(model_name="benchmark", redis=None),
+        text_store=ExtractedTextStore(InMemoryMinio()),
+    )
+
+    def run(iteration: int) -> None:
+        content = make_pdf(pages, seed=iteration + 1)
+        # Content-addressed like uploads, so the download checksum check passes.
+        file_id = hashlib.sha256(content).hexdigest()[:16]
+        minio.put(file_id, content, "application/pdf")
+        processor._handle_file(file_id)
+
+    run.close = lambda: processor._vector_store.client.close()
+    return [Case(f"processor.handle_file.{pages}p", run, pages, "pages", 3)]
+
+
+def _local_store():
+    from qdrant_client import QdrantClient
+    from app.packages.storage.qdrant import QdrantVectorStore
+
+    # Local mode is not thread-safe, so batches go out one at a time; this
+    # measures the client side (ids, payloads, batching), not a server.
+    return QdrantVectorStore(collection_name="benchmark", client=QdrantClient(":memory:"), upsert_parallel=1)
+
+
+_model = None
+
+
+def _load_model():
+    global _model
+    if _model is None:
+        from app.packages.embeddings import load_embedding_model
+        _model = load_embedding_model()
+    return _model
+
+
+_CASE_BUILDERS: list[tuple[str, Callable[[bool], list[Case]]]] = [
+    ("pdf", _pdf_cases),
+    ("chunk.words", _chunk_cases),
+    ("chunk.tokens", _token_chunk_cases),
+    ("encode", _encode_cases),
+    ("qdrant", _qdrant_cases),
+    ("processor", _processor_cases),
+]
@@ -1,7 +1,14 @@
+from app.startup import startup_timer
+
+import asyncio
+import logging
 import click
 import uvicorn
 from app.config import settings
-from app.handlers.files_processor import Processor
+from app.packages.infrastructure import shutdown
+from app.packages.observability import configure_logging, configure_tracing
+
+logger = logging.getLogger(__name__)
 
 @click.group()
 def cli():
@@ -19,13 +26,139 @@ def server():
 
 @cli.command()
 def processor():
+    # Imported here so the other commands do not load the embedding model stack.
+    from app.handlers.files_processor import Processor
+
+    configure_logging()
+    configure_tracing("analytics-processor")
+    startup_timer.mark("imports")
     proc = Processor()
     try:
         proc.run()
     except KeyboardInterrupt:
-        print("\nShutting down processor...")
+        logger.info("Shutting down processor")
         proc.terminate()
-        print("Processor stopped.")
+        asyncio.run(shutdown())
+        logger.info("Processor stopped")
+
+@cli.command("rebuild-file-index")
+def rebuild_file_index():
+    """Backfill the Redis file index from the MinIO bucket listing."""
+    from app.packages import minio_client
+    from app.packages.cache import FileIndex
+    from app.packages.infrastructure.redis import redis_cli
+
+    count = FileIndex(redis_cli).rebuild(minio_client.iter_files())
+    print(f"Indexed {count} files.")
+
+@cli.command("migrate-collection")
+@click.option("--dry-run", is_flag=True, help="Only report what would change.")
+def migrate_collection(dry_run):
+    """Apply the configured Qdrant collection profile to the existing collection."""
+    import json
+    from app.packages.storage import QdrantVectorStore
+
+    try:
+        result = QdrantVectorStore().migrate_collection(dry_run=dry_run)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    print(json.dumps(result, indent=2))
+
+@cli.command()
+@click.option("--collection", required=True, help="Collection to build; created with the configured profile if missing.")
+@click.option("--alias", help="Alias to point at the new collection when done [default: QDRANT_COLLECTION_NAME].")
+@click.option("--no-cutover", is_flag=True, help="Build the collection but leave the alias alone.")
+@click.option("--replace-collection", is_flag=True,
+              help="Delete a plain collection that has the alias's name (first switch to aliases).")
+@click.option("--checkpoint", type=click.Path(dir_okay=False), help="File of finished ids; a rerun skips them.")
+@click.option("--workers", type=int, default=settings.reindex_workers, show_default=True,
+              help="Threads loading and chunking files.")
+def reindex(collection, alias, no_cutover, replace_collection, checkpoint, workers):
+    """Rebuild embeddings of every file from its extracted text, then switch the alias over."""
+    import json
+    from app.handlers.files_processor import Processor
+    from app.handlers.files_processor.reindex import Checkpoint, Reindexer
+    from app.packages import minio_client
+    from app.packages.embeddings import load_embedding_model
+    from app.packages.storage import QdrantVectorStore, extracted_text_store
+
+    configure_logging()
+    alias = alias or settings.qdrant_collection_name
+    if collection == alias:
+        raise click.ClickException("--collection must differ from the alias it replaces")
+
+    model = load_embedding_model()
+    target = QdrantVectorStore(collection_name=collection, vector_size=model.get_sentence_embedding_dimension())
+    processor = Processor(vector_store=target, transformer=model, text_store=extracted_text_store)
+    progress = Checkpoint(checkpoint)
+    reindexer = Reindexer(processor, target, extracted_text_store, progress, workers=workers)
+    list_file_ids = lambda: (stat.object_name for stat in minio_client.iter_files())
+    try:
+        result = reindexer.run(list_file_ids)
+        if not no_cutover:
+            if result["failed"]:
+                raise click.ClickException(
+                    f"{result['failed']} files failed; rerun with --checkpoint before cutting over"
+                )
+            try:
+                result["previous_collection"] = target.point_alias(alias, replace_collection=replace_collection)
+            except ValueError as e:
+                raise click.ClickException(str(e))
+            result["alias"] = alias
+            # Uploads and deletions since the last pass reached only the old collection.
+            result["caught_up"] = reindexer.catch_up(list_file_ids)
+    finally:
+        progress.close()
+        target.close()
+    print(json.dumps(result, indent=2))
+
+@cli.command("embedding-parity")
+@click.option("--backend", required=True, help="Backend to check: onnx or onnx-int8.")
+@click.option("--reference", default="torch", show_default=True, help="Backend to compare against.")
+@click.option("--texts", "texts_file", type=click.File(), help="File with one sample text per line.")
+def embedding_parity(backend, reference, texts_file):
+    """Report cosine drift and throughput of an embedding backend against a reference."""
+    import json
+    from app.packages.embeddings import check_parity
+
+    texts = [line.strip() for line in texts_file if line.strip()] if texts_file else None
+    report = check_parity(backend, reference=reference, texts=texts)
+    print(json.dumps(report.as_dict(), indent=2))
+    if report.min_cosine < settings.embedding_parity_min_cosine:
+        raise click.ClickException(
+            f"min cosine {report.min_cosine:.4f} is below EMBEDDING_PARITY_MIN_COSINE "
+            f"({settings.embedding_parity_min_cosine})"
+        )
+
+@cli.command()
+@click.option("--output", type=click.Path(dir_okay=False), help="Write the JSON report here instead of stdout.")
+@click.option("--baseline", type=click.Path(dir_okay=False), help="Baseline report to compare against.")
+@click.option("--save-baseline", type=click.Path(dir_okay=False), help="Also store this run as a baseline.")
+@click.option("--threshold", default=0.15, show_default=True, help="Median slowdown that counts as a regression.")
+@click.option("--only", help="Run only the cases whose name contains this.")
+@click.option("--quick", is_flag=True, help="Smaller inputs, for a fast sanity check.")
+def benchmark(output, baseline, save_baseline, threshold, only, quick):
+    """Run the offline ingestion benchmarks and report JSON."""
+    import json
+    from benchmarks.suite import run_suite, compare
+
+    report = run_suite(only=only, quick=quick)
+    if save_baseline:
+        with open(save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+    if baseline:
+        with open(baseline) as f:
+            report = compare(report, json.load(f), threshold)
+
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if report.get("regressions"):
+        raise click.ClickException(f"Regressions: {', '.join(report['regressions'])}")
 
 if __name__ == "__main__":
       cli()
@@ -0,0 +1,180 @@
+import datetime
+import hashlib
+import uuid
+from typing import BinaryIO, Optional
+
+import fakeredis
+import pytest
+from minio.error import S3Error
+from qdrant_client import QdrantClient
+
+from app.config import settings
+from app.packages.cache import file_stat_cache
+from app.packages.infrastructure import lazy
+from app.packages.infrastructure.redis import redis_cli, redis_bin_cli, redis_async_cli
+from app.packages.storage import FileStat, SpooledObject, spool_stream
+from app.packages.storage.minio import minio_client, artifact_minio_client
+
+
+# Buckets by name, so server-side copies can find their source.
+_buckets: dict[str, "InMemoryMinio"] = {}
+
+
+class InMemoryMinio:
+    """The ``MinioClient`` surface the services use, kept in a dict."""
+
+    def __init__(self, bucket_name: str = "files"):
+        self.bucket_name = bucket_name
+        _buckets[bucket_name] = self
+        self.objects: dict[str, bytes] = {}
+        self.stats: dict[str, FileStat] = {}
+        self.multipart: dict[str, dict[int, bytes]] = {}
+
+    def put(self, object_name: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        """Store an object the way a client's presigned PUT would."""
+        self.objects[object_name] = bytes(data)
+        self.stats[object_name] = FileStat(
+            bucket_name=self.bucket_name,
+            object_name=object_name,
+            size=len(data),
+            etag=hashlib.md5(data).hexdigest(),
+            last_modified=datetime.datetime.now(datetime.UTC),
+            content_type=content_type,
+        )
+
+    def upload_file(
+            self,
+            object_name: str,
+            data: bytes | BinaryIO,
+            content_type: str = "application/octet-stream",
+            metadata: Optional[dict] = None,
+    ) -> dict:
+        if not isinstance(data, bytes):
+            data.seek(0)
+            data = data.read()
+        self.put(object_name, data, content_type)
+        return {"bucket": self.bucket_name, "object_name": object_name, "etag": self.stats[object_name].etag}
+
+    def download_file(self, object_name: str) -> bytes:
+        if object_name not in self.objects:
+            raise _s3_error("NoSuchKey", object_name)
+        return self.objects[object_name]
+
+    def download_object(self, object_name: str, expected_sha256_prefix: Optional[str] = None) -> SpooledObject:
+        return spool_stream([self.download_file(object_name)], expected_sha256_prefix=expected_sha256_prefix)
+
+    def copy_from(
+            self,
+            object_name: str,
+            source_bucket: str,
+            source_name: str,
+            content_type: str,
+            metadata: Optional[dict] = None,
+    ) -> str:
+        self.put(object_name, _buckets[source_bucket].download_file(source_name), content_type)
+        return self.stats[object_name].etag
+
+    def stat_file(self, object_name: str) -> FileStat:
+        if object_name not in self.stats:
+            raise _s3_error("NoSuchKey", object_name)
+        return self.stats[object_name].model_copy()
+
+    def iter_files(self, prefix: str = "", start_after: Optional[str] = None):
+        for name in sorted(self.objects):
+            if name.startswith(prefix) and (start_after is None or name > start_after):
+                yield self.stats[name]
+
+    def delete_file(self, object_name: str) -> bool:
+        self.objects.pop(object_name, None)
+        self.stats.pop(object_name, None)
+        return True
+
+    def delete_files(self, object_names: list[str]) -> dict[str, str]:
+        for name in object_names:
+            self.delete_file(name)
+        return {}
+
+    def get_presigned_put_url(self, object_name: str, expires_in_seconds: int = 3600) -> str:
+        return f"http://minio/{self.bucket_name}/{object_name}"
+
+    def create_multipart_upload(self, object_name: str, content_type: str) -> str:
+        upload_id = uuid.uuid4().hex
+        self.multipart[upload_id] = {}
+        return upload_id
+
+    def get_presigned_part_url(self, object_name: str, upload_id: str, part_number: int, expires_in_seconds: int = 3600) -> str:
+        return f"http://minio/{self.bucket_name}/{object_name}?uploadId={upload_id}&partNumber={part_number}"
+
+    def put_part(self, upload_id: str, part_number: int, data: bytes) -> str:
+        """Store a part the way a client's presigned part PUT would, returning its ETag."""
+        self.multipart[upload_id][part_number] = data
+        return hashlib.md5(data).hexdigest()
+
+    def multipart_upload_size(self, object_name: str, upload_id: str) -> int:
+        if upload_id not in self.multipart:
+            raise _s3_error("NoSuchUpload", object_name)
+        return sum(len(data) for data in self.multipart[upload_id].values())
+
+    def complete_multipart_upload(self, object_name: str, upload_id: str, parts: list[tuple[int, str]]) -> str:
+        if upload_id not in self.multipart:
+            raise _s3_error("NoSuchUpload", object_name)
+        uploaded = self.multipart.pop(upload_id)
+        self.put(object_name, b"".join(uploaded[part_number] for part_number, _ in sorted(parts)))
+        return self.stats[object_name].etag
+
+    def abort_multipart_upload(self, object_name: str, upload_id: str) -> None:
+        if self.multipart.pop(upload_id, None) is None:
+            raise _s3_error("NoSuchUpload", object_name)
+
+
+def _s3_error(code: str, resource: str) -> S3Error:
+    return S3Error(None, code, code, resource, "", "")
+
+
+@pytest.fixture(autouse=True)
+def singletons(monkeypatch, redis_server):
+    """Reset every lazy singleton and point the Redis ones at one fakeredis server."""
+    for singleton in lazy._registry:
+        monkeypatch.setattr(singleton, "_instance", None)
+    decode = settings.redis_decode_responses
+    monkeypatch.setattr(redis_cli, "_instance", fakeredis.FakeRedis(server=redis_server, decode_responses=decode))
+    monkeypatch.setattr(redis_bin_cli, "_instance", fakeredis.FakeRedis(server=redis_server))
+    monkeypatch.setattr(
+        redis_async_cli,
+        "_instance",
+        fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=decode),
+    )
+    file_stat_cache._local.clear()
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis():
+    return redis_cli.get()
+
+
+@pytest.fixture
+def minio(monkeypatch):
+    """The uploads bucket, installed as ``minio_client``."""
+    client = InMemoryMinio(settings.minio_bucket)
+    monkeypatch.setattr(minio_client, "_instance", client)
+    return client
+
+
+@pytest.fixture
+def artifacts(monkeypatch):
+    """The artifacts bucket, installed as ``artifact_minio_client``."""
+    client = InMemoryMinio(settings.minio_artifacts_bucket)
+    monkeypatch.setattr(artifact_minio_client, "_instance", client)
+    return client
+
+
+@pytest.fixture
+def qdrant():
+    client = QdrantClient(":memory:")
+    yield client
+    client.close()
@@ -0,0 +1,72 @@
+import asyncio
+import hashlib
+from io import BytesIO
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.handlers.services import FileService
+from app.packages.cache import DedupIndex, redis_client
+from app.packages.constants.constants import FILES_TOPIC
+
+
+def upload(content: bytes, filename: str) -> UploadFile:
+    return UploadFile(BytesIO(content), filename=filename, headers=Headers({"content-type": "application/pdf"}))
+
+
+def test_batch_is_stored_and_enqueued_in_one_publish(minio, redis, monkeypatch):
+    service = FileService()
+    publishes = []
+    publish_many = service._publisher.publish_many
+    monkeypatch.setattr(
+        service._publisher,
+        "publish_many",
+        lambda channel, messages: publishes.append(list(messages)) or publish_many(channel, publishes[-1]),
+    )
+
+    results = asyncio.run(service.save_files([upload(b"a", "a.pdf"), upload(b"b", "b.pdf")]))
+
+    assert [result["status"] for result in results] == ["uploaded", "uploaded"]
+    assert [result["filename"] for result in results] == ["a.pdf", "b.pdf"]
+    assert sorted(minio.objects) == sorted(hashlib.sha256(c).hexdigest()[:16] for c in (b"a", b"b"))
+    assert len(publishes) == 1
+    assert redis.xlen(FILES_TOPIC) == 2
+
+
+def test_same_content_twice_in_a_batch_is_enqueued_once(minio, redis):
+    service = FileService()
+
+    results = asyncio.run(service.save_files([upload(b"same", "first.pdf"), upload(b"same", "second.pdf")]))
+
+    assert sorted(result["status"] for result in results) == ["duplicate", "uploaded"]
+    assert redis.xlen(FILES_TOPIC) == 1
+
+
+def test_previously_uploaded_content_is_a_duplicate(minio, redis):
+    service = FileService()
+    service.save_file(upload(b"old", "old.pdf"))
+
+    results = asyncio.run(service.save_files([upload(b"old", "again.pdf"), upload(b"new", "new.pdf")]))
+
+    assert [result["status"] for result in results] == ["duplicate", "uploaded"]
+    assert results[0]["filename"] == "old.pdf"
+    assert redis.xlen(FILES_TOPIC) == 2
+
+
+def test_a_failed_file_does_not_fail_the_batch(minio, redis, monkeypatch):
+    upload_file = minio.upload_file
+
+    def failing(object_name, data, **kwargs):
+        if object_name == hashlib.sha256(b"bad").hexdigest()[:16]:
+            raise ConnectionError("storage unavailable")
+        return upload_file(object_name, data, **kwargs)
+
+    monkeypatch.setattr(minio, "upload_file", failing)
+    service = FileService()
+
+    results = asyncio.run(service.save_files([upload(b"bad", "bad.pdf"), upload(b"good", "good.pdf")]))
+
+    assert results[0] == {"filename": "bad.pdf", "status": "failed", "error": "storage unavailable"}
+    assert results[1]["status"] == "uploaded"
+    assert redis.xlen(FILES_TOPIC) == 1
+    assert DedupIndex(redis_client).get(hashlib.sha256(b"bad").hexdigest()) is None
@@ -0,0 +1,65 @@
+import numpy as np
+
+from app.handlers.files_processor.batcher import EmbeddingBatcher
+from app.handlers.files_processor.pipeline import FileJob
+from app.packages.cache import EmbeddingCache
+from app.packages.infrastructure.redis import redis_bin_cli
+
+
+def vector(text: str) -> np.ndarray:
+    return np.array([len(text), sum(map(ord, text)) % 97], dtype=np.float32)
+
+
+class RecordingEncoder:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str], batch_size: int) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.stack([vector(text) for text in texts])
+
+
+def job(file_id: str, chunks: list[str], embed_indices=None) -> FileJob:
+    return FileJob(file_id=file_id, chunks=chunks, embed_indices=embed_indices)
+
+
+def test_vectors_go_back_to_their_files_in_order():
+    encoder = RecordingEncoder()
+    jobs = [job("a", ["a long chunk of text", "x"]), job("b", ["medium text"])]
+
+    EmbeddingBatcher(encoder).embed(jobs)
+
+    assert len(encoder.calls) == 1
+    for item in jobs:
+        np.testing.assert_array_equal(item.embeddings, np.stack([vector(text) for text in item.chunks]))
+
+
+def test_texts_are_encoded_shortest_first_and_once():
+    encoder = RecordingEncoder()
+
+    EmbeddingBatcher(encoder).embed([job("a", ["ccc", "a", "bb"]), job("b", ["a", "ccc"])])
+
+    assert encoder.calls == [["a", "bb", "ccc"]]
+
+
+def test_only_new_chunks_are_embedded():
+    encoder = RecordingEncoder()
+    item = job("a", ["kept", "new one", "also kept"], embed_indices=[1])
+
+    EmbeddingBatcher(encoder).embed([item])
+
+    assert encoder.calls == [["new one"]]
+    np.testing.assert_array_equal(item.embeddings, vector("new one")[None])
+
+
+def test_cached_texts_are_not_encoded_again():
+    encoder = RecordingEncoder()
+    cache = EmbeddingCache("model", redis=redis_bin_cli.get(), dtype="float32")
+    EmbeddingBatcher(encoder, cache=cache).embed([job("a", ["first", "second"])])
+
+    fresh_cache = EmbeddingCache("model", redis=redis_bin_cli.get(), dtype="float32")
+    item = job("b", ["second", "third"])
+    EmbeddingBatcher(encoder, cache=fresh_cache).embed([item])
+
+    assert encoder.calls[-1] == ["third"]
+    np.testing.assert_array_equal(item.embeddings, np.stack([vector("second"), vector("third")]))
@@ -0,0 +1,127 @@
+import zlib
+
+import numpy as np
+import pytest
+
+from app.packages.infrastructure.redis import redis_bin_cli
+from app.packages.storage.chunk_text import ChunkTexts, ChunkTextStore, encode_chunks
+from app.packages.storage.qdrant import QdrantVectorStore
+
+VECTOR_SIZE = 4
+
+
+def embeddings(count: int) -> np.ndarray:
+    return np.random.default_rng(count).random((count, VECTOR_SIZE), dtype=np.float32)
+
+
+@pytest.fixture
+def texts(artifacts):
+    store = ChunkTextStore(artifacts, redis=redis_bin_cli.get())
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def store(qdrant, texts):
+    store = QdrantVectorStore("test", client=qdrant, chunk_texts=texts, vector_size=VECTOR_SIZE)
+    yield store
+    store.close()
+
+
+def search_texts(store: QdrantVectorStore) -> list[tuple[int, str]]:
+    return sorted((hit["chunk_index"], hit["text"]) for hit in store.search([1.0] * VECTOR_SIZE, limit=10))
+
+
+@pytest.mark.parametrize("chunks", [
+    ["first chunk", "second chunk", "third"],
+    ["", "after an empty chunk", ""],
+    ["naïve café", "日本語のテキスト", "emoji 🚀"],
+    [],
+])
+def test_encode_chunks_round_trip(chunks):
+    texts = ChunkTexts(encode_chunks(chunks))
+
+    assert len(texts) == len(chunks)
+    assert [texts[i] for i in range(len(texts))] == chunks
+
+
+def test_chunk_texts_rejects_other_data():
+    with pytest.raises(ValueError):
+        ChunkTexts(zlib.compress(b"XXXX\x00\x00\x00\x00"))
+
+
+def test_search_hydrates_text_kept_out_of_the_payload(store, qdrant):
+    store.add_documents("file", ["a", "b"], embeddings(2), wait=True)
+
+    assert search_texts(store) == [(0, "a"), (1, "b")]
+    payloads = [point.payload for point in qdrant.scroll("test", with_payload=True)[0]]
+    assert all("text" not in payload for payload in payloads)
+    assert search_texts(store) == [(0, "a"), (1, "b")]
+
+
+def test_hits_without_text_skip_the_side_store(store, artifacts):
+    store.add_documents("file", ["a"], embeddings(1), wait=True)
+    artifacts.objects.clear()
+
+    assert [hit.get("text") for hit in store.search([1.0] * VECTOR_SIZE, with_text=False)] == [None]
+
+
+def test_indexing_a_file_again_replaces_its_text(store, artifacts):
+    # A redelivered file is indexed in full again.
+    store.add_documents("file", ["a", "b"], embeddings(2), wait=True)
+    store.add_documents("file", ["a", "b"], embeddings(2), wait=True)
+
+    assert len(artifacts.objects) == 1
+    assert search_texts(store) == [(0, "a"), (1, "b")]
+
+
+def test_unconfirmed_index_keeps_the_previous_text_until_visible(store, artifacts):
+    store.add_documents("file", ["a", "b"], embeddings(2), wait=True)
+    store.add_documents("file", ["a", "b"], embeddings(2), wait=False)
+    assert len(artifacts.objects) == 2
+
+    store.barrier()
+
+    assert len(artifacts.objects) == 1
+    assert search_texts(store) == [(0, "a"), (1, "b")]
+
+
+def test_put_writes_a_new_version_each_time(texts):
+    first = texts.put("file", ["a", "b"])
+    second = texts.put("file", ["b", "c"])
+
+    assert first != second
+    loaded = texts.load([("file", first), ("file", second)])
+    assert loaded[("file", first)][1] == "b"
+    assert loaded[("file", second)][1] == "c"
+
+
+def test_hydrate_reads_unversioned_artifacts(artifacts, texts):
+    artifacts.upload_file("chunks/legacy", encode_chunks(["old text"]))
+    hits = [{"file_id": "legacy", "chunk_index": 0, "text": None}]
+
+    texts.hydrate(hits, [None])
+
+    assert hits[0]["text"] == "old text"
+
+
+def test_delete_removes_every_layout(artifacts, texts):
+    artifacts.upload_file("chunks/file", encode_chunks(["legacy"]))
+    version = texts.put("file", ["current"])
+    other = texts.put("other", ["kept"])
+
+    texts.delete(["file"])
+
+    assert list(artifacts.objects) == [f"chunks/other.{other}"]
+    assert texts.load([("file", version), ("file", None)]) == {}
+
+
+def test_reindex_keeps_one_text_version(store, artifacts):
+    store.add_documents("file", ["a", "b"], embeddings(2), wait=True)
+
+    for chunks in (["b", "c"], ["c", "b", "d"]):
+        plan = store.plan_reindex("file", chunks)
+        store.apply_reindex("file", chunks, plan, embeddings(len(plan.new)))
+
+    assert len(artifacts.objects) == 1
+    assert search_texts(store) == [(0, "c"), (1, "b"), (2, "d")]
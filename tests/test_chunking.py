@@ -0,0 +1,56 @@
+import pytest
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
+
+from app.handlers.files_processor.chunking import TokenChunker
+
+
+@pytest.fixture(scope="module")
+def tokenizer() -> Tokenizer:
+    tokenizer = Tokenizer(WordLevel({"[UNK]": 0}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    return tokenizer
+
+
+def words(count: int) -> str:
+    return " ".join(f"w{i}" for i in range(count))
+
+
+def test_windows_fit_and_overlap(tokenizer):
+    chunks = TokenChunker(tokenizer, max_tokens=10, overlap=3, snap_to_sentence=False).chunk(words(25))
+
+    assert [chunk.split() for chunk in chunks] == [
+        [f"w{i}" for i in range(start, min(start + 10, 25))] for start in (0, 7, 14)
+    ] + [[f"w{i}" for i in range(21, 25)]]
+
+
+def test_chunks_are_slices_of_the_text(tokenizer):
+    text = "First  line\n\nsecond\tline with   odd spacing and more words to split"
+
+    chunks = TokenChunker(tokenizer, max_tokens=4, overlap=0, snap_to_sentence=False).chunk(text)
+
+    assert all(chunk in text for chunk in chunks)
+    assert chunks[0] == "First  line\n\nsecond\tline"
+
+
+def test_windows_end_at_a_sentence_in_their_second_half(tokenizer):
+    text = "one two three four five six . seven eight nine ten eleven"
+
+    chunks = TokenChunker(tokenizer, max_tokens=9, overlap=0).chunk(text)
+
+    assert chunks[0] == "one two three four five six ."
+    assert chunks[1] == "seven eight nine ten eleven"
+
+
+def test_short_and_empty_texts(tokenizer):
+    chunker = TokenChunker(tokenizer, max_tokens=10, overlap=2)
+
+    assert chunker.chunk("just a few words") == ["just a few words"]
+    assert chunker.chunk("   ") == []
+
+
+@pytest.mark.parametrize("max_tokens, overlap", [(0, 0), (10, 10), (10, -1)])
+def test_rejects_bad_windows(tokenizer, max_tokens, overlap):
+    with pytest.raises(ValueError):
+        TokenChunker(tokenizer, max_tokens=max_tokens, overlap=overlap)
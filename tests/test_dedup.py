@@ -0,0 +1,58 @@
+import asyncio
+import hashlib
+from io import BytesIO
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.handlers.services import FileService
+from app.packages.cache import DedupIndex, redis_client
+from app.packages.constants.constants import FILES_TOPIC
+
+CONTENT = b"%PDF-1.4 the same bytes every time"
+
+
+def upload(content: bytes, filename: str = "report.pdf") -> UploadFile:
+    return UploadFile(BytesIO(content), filename=filename, headers=Headers({"content-type": "application/pdf"}))
+
+
+def test_same_content_is_stored_and_enqueued_once(minio, redis):
+    service = FileService()
+
+    first = service.save_file(upload(CONTENT))
+    second = service.save_file(upload(CONTENT, filename="copy.pdf"))
+
+    assert first["status"] == "uploaded"
+    assert second["status"] == "duplicate"
+    assert second["file_id"] == first["file_id"] == hashlib.sha256(CONTENT).hexdigest()[:16]
+    assert second["filename"] == "report.pdf"
+    assert list(minio.objects) == [first["file_id"]]
+    assert redis.xlen(FILES_TOPIC) == 1
+
+
+def test_deleted_content_can_be_uploaded_again(minio):
+    service = FileService()
+    file_id = service.save_file(upload(CONTENT))["file_id"]
+
+    asyncio.run(service.delete_files([file_id]))
+
+    assert service.save_file(upload(CONTENT))["status"] == "uploaded"
+
+
+def test_record_keeps_the_first_upload():
+    dedup = DedupIndex(redis_client)
+
+    assert dedup.record("hash", "file", {"file_id": "file", "filename": "first"})
+    assert not dedup.record("hash", "file", {"file_id": "file", "filename": "second"})
+    assert dedup.get("hash")["filename"] == "first"
+
+
+def test_forget_drops_the_hash_and_the_indexed_mark():
+    dedup = DedupIndex(redis_client)
+    dedup.record("hash", "file", {"file_id": "file"})
+    dedup.mark_indexed("file")
+
+    dedup.forget("file")
+
+    assert dedup.get("hash") is None
+    assert not dedup.is_indexed("file")
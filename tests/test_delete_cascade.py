@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.handlers.files_processor import Processor
+from app.packages.cache import EmbeddingCache, SearchCache, redis_client
+from app.packages.constants.constants import FILES_DELETED_TOPIC
+from app.packages.storage import ExtractedTextStore
+from app.packages.storage.qdrant import QdrantVectorStore
+from app.server import app
+
+VECTOR_SIZE = 4
+
+
+@pytest.fixture
+def store(qdrant):
+    store = QdrantVectorStore("test", client=qdrant, vector_size=VECTOR_SIZE)
+    for file_id in ("a", "b", "c"):
+        chunks = [f"{file_id} {i}" for i in range(3)]
+        store.add_documents(file_id, chunks, np.ones((3, VECTOR_SIZE), dtype=np.float32), wait=True)
+    yield store
+    store.close()
+
+
+class FakeTransformer:
+    def encode(self, texts, batch_size, show_progress_bar):
+        raise AssertionError("not expected to embed")
+
+
+def test_delete_by_file_ids_drops_only_those_files(store):
+    store.delete_by_file_ids(["a", "c"])
+
+    assert [store.count_by_file_id(file_id) for file_id in ("a", "b", "c")] == [0, 3, 0]
+
+
+def test_processor_removes_vectors_text_and_cached_searches(store, artifacts, monkeypatch):
+    monkeypatch.setattr(settings, "chunker", "words")
+    text_store = ExtractedTextStore(artifacts)
+    text_store.put("a", "text of a")
+    cache = SearchCache(redis_client)
+    cache.set("query", None, 5, [{"file_id": "a"}])
+    processor = Processor(
+        minio_client=object(),
+        vector_store=store,
+        transformer=FakeTransformer(),
+        embedding_cache=EmbeddingCache(model_name="test", redis=None),
+        text_store=text_store,
+    )
+
+    processor.delete_files(["a"])
+
+    assert store.count_by_file_id("a") == 0
+    assert text_store.get("a") is None
+    assert cache.get("query", None, 5) is None
+
+
+def test_delete_routes(minio, redis):
+    for name in ("a", "b", "c"):
+        minio.put(name, name.encode())
+    client = TestClient(app)
+
+    single = client.delete("/files/a")
+    batch = client.post("/files/delete/batch", json={"file_ids": ["b", "c"]})
+
+    assert single.status_code == batch.status_code == 200
+    assert single.json()["data"] == {"file_id": "a", "status": "deleted"}
+    assert batch.json()["data"] == {"deleted": ["b", "c"], "failed": []}
+    assert minio.objects == {}
+    assert [fields["data"] for _, fields in redis.xrange(FILES_DELETED_TOPIC)] == ["a", "b", "c"]
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.handlers.services import FileService
+from app.packages.constants.constants import FILES_DELETED_TOPIC
+from app.packages.infrastructure.redis import redis_async_cli
+from app.packages.queues import new_async_publisher
+
+
+@pytest.mark.parametrize("async_storage", [False, True])
+def test_delete_publishes_deleted_ids_once(minio, redis, async_storage):
+    minio.put("a", b"a")
+    minio.put("b", b"b")
+    service = FileService(async_storage=async_storage)
+
+    result = asyncio.run(service.delete_files(["a", "b", "a"]))
+
+    assert result == {"deleted": ["a", "b"], "failed": []}
+    assert minio.objects == {}
+    assert [fields["data"] for _, fields in redis.xrange(FILES_DELETED_TOPIC)] == ["a", "b"]
+
+
+@pytest.mark.parametrize("async_storage", [False, True])
+def test_failed_deletes_are_not_published(minio, redis, monkeypatch, async_storage):
+    minio.put("a", b"a")
+    minio.put("b", b"b")
+    monkeypatch.setattr(minio, "delete_files", lambda names: {"b": "AccessDenied"})
+    service = FileService(async_storage=async_storage)
+
+    result = asyncio.run(service.delete_files(["a", "b"]))
+
+    assert result == {"deleted": ["a"], "failed": [{"file_id": "b", "error": "AccessDenied"}]}
+    assert [fields["data"] for _, fields in redis.xrange(FILES_DELETED_TOPIC)] == ["a"]
+
+
+def test_async_pubsub_publisher_reaches_subscribers(redis, monkeypatch):
+    monkeypatch.setattr(settings, "queue_backend", "pubsub")
+    pubsub = redis.pubsub()
+    pubsub.subscribe("channel")
+    pubsub.get_message(timeout=1)
+
+    asyncio.run(new_async_publisher(redis_async_cli).publish_many("channel", [b"a", b"b"]))
+
+    assert [pubsub.get_message(timeout=1)["data"] for _ in range(2)] == ["a", "b"]
@@ -0,0 +1,33 @@
+import numpy as np
+
+from app.packages.cache import EmbeddingCache
+from app.packages.infrastructure.redis import redis_bin_cli
+
+VECTORS = np.array([[0.25, -1.5, 3.0], [1.0, 0.5, -0.125]], dtype=np.float32)
+
+
+def test_vectors_round_trip_through_redis():
+    EmbeddingCache("model", redis=redis_bin_cli.get()).put_many(["a", "b"], VECTORS)
+    cache = EmbeddingCache("model", redis=redis_bin_cli.get())
+
+    found = cache.get_many(["b", "missing", "a"])
+
+    np.testing.assert_array_equal(found[0], VECTORS[1])
+    assert found[1] is None
+    np.testing.assert_array_equal(found[2], VECTORS[0])
+    assert cache.stats()["redis_hits"] == 2
+
+
+def test_entries_are_kept_per_model():
+    EmbeddingCache("model-a", redis=redis_bin_cli.get()).put_many(["a"], VECTORS[:1])
+
+    assert EmbeddingCache("model-b", redis=redis_bin_cli.get()).get_many(["a"]) == [None]
+
+
+def test_local_tier_is_bounded():
+    cache = EmbeddingCache("model", max_entries=1)
+    cache.put_many(["a", "b"], VECTORS)
+
+    assert cache.get_many(["a"]) == [None]
+    np.testing.assert_array_equal(cache.get_many(["b"])[0], VECTORS[1])
+    assert cache.stats()["local_entries"] == 1
@@ -0,0 +1,80 @@
+import asyncio
+import datetime
+
+import fakeredis
+import pytest
+
+from app.packages.cache import FileIndex
+from app.packages.storage.minio import FileStat
+
+NOW = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def stat(name: str, seconds: int = 0) -> FileStat:
+    return FileStat(
+        bucket_name="files",
+        object_name=name,
+        size=1,
+        etag=name,
+        last_modified=NOW + datetime.timedelta(seconds=seconds),
+    )
+
+
+def all_pages(page, limit: int) -> list[list[str]]:
+    pages, cursor = [], None
+    while True:
+        stats, cursor = page(cursor=cursor, limit=limit)
+        pages.append([s.object_name for s in stats])
+        if cursor is None:
+            return pages
+
+
+@pytest.fixture
+def index(redis_server):
+    return FileIndex(
+        fakeredis.FakeRedis(server=redis_server, decode_responses=True),
+        async_redis=fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True),
+    )
+
+
+def test_page_orders_newest_first(index):
+    index.rebuild([stat("a", 0), stat("b", 1), stat("c", 2)])
+
+    assert all_pages(index.page, limit=2) == [["c", "b"], ["a"]]
+
+
+def test_page_splits_ties_without_skipping_or_repeating(index):
+    index.rebuild([stat(name) for name in "abcdefg"] + [stat("newer", 1)])
+
+    pages = all_pages(index.page, limit=3)
+
+    assert pages == [["newer", "g", "f"], ["e", "d", "c"], ["b", "a"]]
+
+
+def test_page_async_matches_page(index):
+    index.rebuild([stat(name) for name in "abcde"] + [stat("older", -1)])
+
+    async def pages_async():
+        pages, cursor = [], None
+        while True:
+            stats, cursor = await index.page_async(cursor=cursor, limit=2)
+            pages.append([s.object_name for s in stats])
+            if cursor is None:
+                return pages
+
+    assert asyncio.run(pages_async()) == all_pages(index.page, limit=2)
+
+
+def test_page_rejects_bad_cursor(index):
+    with pytest.raises(ValueError):
+        index.page(cursor="not-a-cursor")
+
+
+def test_removed_files_leave_the_index(index):
+    index.rebuild([stat("a"), stat("b")])
+
+    index.remove("a")
+
+    assert index.total() == 1
+    assert index.get("a") is None
+    assert index.get("b").object_name == "b"
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.handlers.services import FileService
+from app.packages.cache import FileStatCache, redis_client, async_redis_client
+
+
+@pytest.fixture
+def stat_calls(minio, monkeypatch):
+    """Count the stat requests that reach MinIO."""
+    calls = []
+    stat_file = minio.stat_file
+
+    def counting(object_name):
+        calls.append(object_name)
+        return stat_file(object_name)
+
+    monkeypatch.setattr(minio, "stat_file", counting)
+    return calls
+
+
+@pytest.mark.parametrize("async_storage", [False, True])
+def test_get_file_stats_minio_once(minio, stat_calls, async_storage):
+    minio.put("file", b"data", "text/plain")
+    service = FileService(async_storage=async_storage)
+
+    first = asyncio.run(service.get_file("file"))
+    second = asyncio.run(service.get_file("file"))
+
+    assert first.object_name == second.object_name == "file"
+    assert second.size == 4
+    assert stat_calls == ["file"]
+
+
+@pytest.mark.parametrize("async_storage", [False, True])
+def test_missing_files_are_cached_too(minio, stat_calls, async_storage):
+    service = FileService(async_storage=async_storage)
+
+    assert asyncio.run(service.get_file("missing")) is None
+    assert asyncio.run(service.get_file("missing")) is None
+    assert stat_calls == ["missing"]
+
+
+def test_deleted_files_are_not_served_from_cache(minio):
+    minio.put("file", b"data")
+    service = FileService()
+    asyncio.run(service.get_file("file"))
+
+    asyncio.run(service.delete_files(["file"]))
+
+    assert asyncio.run(service.get_file("file")) is None
+
+
+def test_redis_tier_is_shared_across_instances(minio):
+    minio.put("file", b"data")
+    writer = FileStatCache(redis_client)
+    reader = FileStatCache(redis_client, async_redis=async_redis_client)
+    writer.set(minio.stat_file("file"))
+
+    hit, stat = asyncio.run(reader.get_async("file"))
+
+    assert hit
+    assert stat.object_name == "file"
+
+
+def test_invalidate_clears_both_tiers(minio):
+    minio.put("file", b"data")
+    cache = FileStatCache(redis_client)
+    cache.set(minio.stat_file("file"))
+
+    cache.invalidate("file")
+
+    assert cache.get("file") == (False, None)
@@ -0,0 +1,20 @@
+import hashlib
+from io import BytesIO
+
+from app.handlers.services.file_service import hash_stream
+
+
+def test_hash_stream_reads_in_chunks_and_rewinds():
+    content = bytes(range(256)) * 100
+    stream = BytesIO(content)
+    stream.seek(123)
+
+    sha256, size = hash_stream(stream, chunk_size=1000)
+
+    assert sha256 == hashlib.sha256(content).hexdigest()
+    assert size == len(content)
+    assert stream.tell() == 0
+
+
+def test_hash_stream_of_empty_stream():
+    assert hash_stream(BytesIO()) == (hashlib.sha256(b"").hexdigest(), 0)
@@ -0,0 +1,70 @@
+import asyncio
+import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.handlers.services import FileService
+from app.packages.cache import FileIndex
+from app.packages.infrastructure.redis import redis_cli
+from app.server import app
+
+NOW = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def files(minio):
+    """Five stored files, "a" oldest, in MinIO and the file index."""
+    index = FileIndex(redis_cli)
+    for age, name in enumerate("edcba"):
+        minio.put(name, name.encode())
+        minio.stats[name].last_modified = NOW - datetime.timedelta(seconds=age)
+        index.add(minio.stats[name])
+    return minio
+
+
+def all_pages(service: FileService, limit: int) -> list[dict]:
+    pages, cursor = [], None
+    while True:
+        page = asyncio.run(service.list_files(cursor=cursor, limit=limit))
+        pages.append(page)
+        if not page["has_more"]:
+            return pages
+        cursor = page["next_cursor"]
+
+
+@pytest.mark.parametrize("async_storage", [False, True])
+def test_list_pages_through_the_index_newest_first(files, async_storage):
+    pages = all_pages(FileService(async_storage=async_storage), limit=2)
+
+    assert [[stat.object_name for stat in page["files"]] for page in pages] == [["e", "d"], ["c", "b"], ["a"]]
+    assert {page["total"] for page in pages} == {5}
+
+
+@pytest.mark.parametrize("async_storage", [False, True])
+def test_list_falls_back_to_minio_in_key_order(files, monkeypatch, async_storage):
+    monkeypatch.setattr(settings, "file_index_enabled", False)
+
+    pages = all_pages(FileService(async_storage=async_storage), limit=2)
+
+    assert [[stat.object_name for stat in page["files"]] for page in pages] == [["a", "b"], ["c", "d"], ["e"]]
+    assert {page["total"] for page in pages} == {None}
+
+
+def test_list_route(files):
+    client = TestClient(app)
+
+    first = client.get("/files/list", params={"limit": 3})
+    second = client.get("/files/list", params={"limit": 3, "cursor": first.json()["data"]["next_cursor"]})
+
+    assert first.status_code == second.status_code == 200
+    assert [f["object_name"] for f in first.json()["data"]["files"]] == ["e", "d", "c"]
+    assert [f["object_name"] for f in second.json()["data"]["files"]] == ["b", "a"]
+    assert second.json()["data"]["has_more"] is False
+
+
+def test_list_route_rejects_a_bad_cursor(files):
+    response = TestClient(app).get("/files/list", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
@@ -0,0 +1,40 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.config import settings
+from app.handlers.files_processor.pdf import extract_text_from_pdf
+from benchmarks.synthetic import make_pdf
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.fixture
+def content(monkeypatch):
+    monkeypatch.setattr(settings, "pdf_pages_per_task", 2)
+    return make_pdf(5, words_per_page=20)
+
+
+def test_parallel_extraction_matches_serial(content, pool):
+    serial = extract_text_from_pdf(content, backend="pypdf2")
+
+    assert serial
+    assert extract_text_from_pdf(content, executor=pool, backend="pypdf2") == serial
+
+
+def test_parallel_extraction_from_a_file(content, pool, tmp_path):
+    path = tmp_path / "document.pdf"
+    path.write_bytes(content)
+
+    text = extract_text_from_pdf(memoryview(content), executor=pool, backend="pypdf2", path=str(path))
+
+    assert text == extract_text_from_pdf(content, backend="pypdf2")
+
+
+def test_pdf_without_text_is_rejected():
+    with pytest.raises(ValueError):
+        extract_text_from_pdf(make_pdf(1, words_per_page=0), backend="pypdf2")
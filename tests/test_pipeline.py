@@ -0,0 +1,70 @@
+import threading
+
+from app.handlers.files_processor.pipeline import BatchStage, FileJob, Pipeline, Stage
+
+
+def run(stages: list[Stage], file_ids: list[str]) -> dict[str, FileJob]:
+    done: dict[str, FileJob] = {}
+    lock = threading.Lock()
+
+    def on_done(job: FileJob) -> None:
+        with lock:
+            assert job.file_id not in done, "on_done called twice"
+            done[job.file_id] = job
+
+    pipeline = Pipeline(stages, on_done=on_done)
+    pipeline.start()
+    for file_id in file_ids:
+        pipeline.submit(FileJob(file_id=file_id))
+    pipeline.stop()
+    return done
+
+
+def test_every_job_finishes_once_through_all_stages():
+    def split(job):
+        job.chunks = [job.file_id] * 3
+        return job
+
+    def embed(jobs):
+        for job in jobs:
+            job.text = "embedded"
+        return jobs
+
+    done = run(
+        [Stage("split", split, workers=3), BatchStage("embed", embed, max_items=8, max_wait=0.01)],
+        [f"file-{i}" for i in range(20)],
+    )
+
+    assert len(done) == 20
+    assert all(job.text == "embedded" and not job.failed for job in done.values())
+
+
+def test_dropped_and_failed_jobs_are_finished():
+    def handle(job):
+        if job.file_id == "fails":
+            raise RuntimeError("boom")
+        if job.file_id == "skipped":
+            return None
+        return job
+
+    reached = []
+    done = run(
+        [Stage("first", handle), Stage("second", lambda job: reached.append(job.file_id) or job)],
+        ["fails", "skipped", "kept"],
+    )
+
+    assert done["fails"].failed
+    assert not done["skipped"].failed
+    assert reached == ["kept"]
+
+
+def test_failed_batch_marks_every_job():
+    def embed(jobs):
+        raise RuntimeError("model unavailable")
+
+    done = run(
+        [Stage("load", lambda job: job), BatchStage("embed", embed, max_items=100, max_wait=0.05)],
+        ["a", "b", "c"],
+    )
+
+    assert all(job.failed for job in done.values())
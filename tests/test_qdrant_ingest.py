@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.packages.storage.qdrant import QdrantVectorStore
+
+VECTOR_SIZE = 4
+
+
+def embeddings(count: int) -> np.ndarray:
+    return np.random.default_rng(count).random((count, VECTOR_SIZE), dtype=np.float32)
+
+
+@pytest.fixture
+def store(qdrant, monkeypatch):
+    monkeypatch.setattr(settings, "qdrant_upsert_batch_size", 3)
+    store = QdrantVectorStore("test", client=qdrant, vector_size=VECTOR_SIZE)
+    yield store
+    store.close()
+
+
+def invisible(store: QdrantVectorStore, monkeypatch) -> None:
+    """Make every non-waiting upsert look like Qdrant has not applied it yet."""
+    monkeypatch.setattr(store, "count_by_file_id", lambda file_id: 0)
+
+
+def test_batches_of_one_file_all_land(store):
+    chunks = [f"chunk {i}" for i in range(10)]
+
+    result = store.add_documents("file", chunks, embeddings(10), wait=True)
+
+    assert result["num_chunks"] == 10
+    assert store.count_by_file_id("file") == 10
+
+
+def test_barrier_waits_for_unconfirmed_upserts(store, monkeypatch):
+    invisible(store, monkeypatch)
+    store.add_documents("file", ["a", "b"], embeddings(2), wait=False)
+
+    with pytest.raises(TimeoutError):
+        store.barrier(timeout=0.1)
+
+
+def test_deleted_file_is_no_longer_awaited(store, monkeypatch):
+    invisible(store, monkeypatch)
+    store.add_documents("kept", ["a"], embeddings(1), wait=False)
+    store.add_documents("deleted", ["b"], embeddings(1), wait=False)
+    store.add_documents("also deleted", ["c"], embeddings(1), wait=False)
+    monkeypatch.setattr(store, "count_by_file_id", lambda file_id: 1 if file_id == "kept" else 0)
+
+    store.delete_by_file_ids(["deleted"])
+    store.delete_by_file_id("also deleted")
+
+    store.barrier(timeout=0.1)
+
+
+def test_pending_set_stays_bounded(store, monkeypatch):
+    monkeypatch.setattr(settings, "qdrant_pending_max_files", 3)
+
+    for i in range(10):
+        store.add_documents(f"file-{i}", ["a"], embeddings(1), wait=False)
+        assert len(store._pending) < 3
+
+
+def test_close_stops_the_upsert_threads(store):
+    store.close()
+
+    with pytest.raises(RuntimeError):
+        store.add_documents("file", ["a"], embeddings(1), wait=True)
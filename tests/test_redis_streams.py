@@ -0,0 +1,100 @@
+import time
+
+import fakeredis
+import pytest
+
+from app.packages.queues.redis_streams import RedisStreamPublisher, RedisStreamSubscriber
+
+CHANNEL = "files"
+GROUP = "processors"
+
+
+@pytest.fixture(params=[False, True], ids=["bytes", "decoded"])
+def connect(request, redis_server):
+    return lambda: fakeredis.FakeRedis(server=redis_server, decode_responses=request.param)
+
+
+@pytest.fixture
+def subscribers(connect):
+    created = []
+
+    def subscriber(consumer: str, **kwargs) -> RedisStreamSubscriber:
+        kwargs = {"block_ms": 10, "claim_idle_ms": 300, "claim_interval_seconds": 0, **kwargs}
+        created.append(RedisStreamSubscriber(connect(), GROUP, consumer=consumer, **kwargs))
+        return created[-1]
+
+    yield subscriber
+    for sub in created:
+        sub.close()
+
+
+def pending(redis, consumer=None) -> int:
+    return len(redis.xpending_range(CHANNEL, GROUP, "-", "+", 100, consumername=consumer))
+
+
+def test_ack_clears_pending(connect, subscribers):
+    redis = connect()
+    RedisStreamPublisher(redis).publish(CHANNEL, b"file-1")
+    sub = subscribers("a")
+
+    message = next(sub.subscribe(CHANNEL))
+    assert message == b"file-1"
+    assert pending(redis) == 1
+
+    sub.ack(CHANNEL, message)
+    assert pending(redis) == 0
+
+
+def test_released_message_is_claimed_by_another_consumer(connect, subscribers):
+    redis = connect()
+    RedisStreamPublisher(redis).publish(CHANNEL, b"file-1")
+    first, second = subscribers("a"), subscribers("b")
+    message = next(first.subscribe(CHANNEL))
+
+    first.release(CHANNEL, message)
+    time.sleep(0.4)
+    claimed = next(second.subscribe(CHANNEL))
+
+    assert claimed == b"file-1"
+    assert claimed.message_id == message.message_id
+    assert pending(redis, "b") == 1
+
+
+def test_in_flight_message_is_not_claimed(connect, subscribers):
+    redis = connect()
+    RedisStreamPublisher(redis).publish(CHANNEL, b"file-1")
+    first, second = subscribers("a"), subscribers("b")
+    next(first.subscribe(CHANNEL))
+
+    time.sleep(0.6)
+    second._ensure_group(CHANNEL)
+
+    assert second._claim_stale(CHANNEL) == []
+    assert pending(redis, "a") == 1
+
+
+def test_message_past_max_deliveries_is_dead_lettered(connect, subscribers):
+    redis = connect()
+    RedisStreamPublisher(redis).publish(CHANNEL, b"file-1")
+    first, second = subscribers("a", max_deliveries=1), subscribers("b", max_deliveries=1)
+    message = next(first.subscribe(CHANNEL))
+
+    first.release(CHANNEL, message)
+    time.sleep(0.4)
+    second._ensure_group(CHANNEL)
+
+    assert second._claim_stale(CHANNEL) == []
+    assert pending(redis) == 0
+    [(_, fields)] = redis.xrange(f"{CHANNEL}:dead")
+    assert fields in ({b"data": b"file-1", b"message_id": message.message_id.encode()},
+                      {"data": "file-1", "message_id": message.message_id})
+
+
+def test_entry_without_data_is_acked_and_skipped(connect, subscribers):
+    redis = connect()
+    redis.xadd(CHANNEL, {"other": "field"})
+    RedisStreamPublisher(redis).publish(CHANNEL, b"file-1")
+    sub = subscribers("a")
+
+    assert next(sub.subscribe(CHANNEL)) == b"file-1"
+    assert pending(redis) == 1
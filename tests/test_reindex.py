@@ -0,0 +1,107 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.handlers.files_processor import Processor
+from app.handlers.files_processor.reindex import Checkpoint, Reindexer
+from app.packages.cache import EmbeddingCache
+from app.packages.storage import ExtractedTextStore
+from app.packages.storage.qdrant import QdrantVectorStore
+from benchmarks.synthetic import make_pdf
+
+VECTOR_SIZE = 4
+
+
+class FakeTransformer:
+    def encode(self, texts, batch_size, show_progress_bar):
+        return np.ones((len(texts), VECTOR_SIZE), dtype=np.float32)
+
+
+@pytest.fixture
+def text_store(artifacts):
+    return ExtractedTextStore(artifacts)
+
+
+@pytest.fixture
+def target(qdrant):
+    store = QdrantVectorStore("rebuild", client=qdrant, vector_size=VECTOR_SIZE)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def reindexer(minio, target, text_store, monkeypatch):
+    monkeypatch.setattr(settings, "chunker", "words")
+    processor = Processor(
+        minio_client=minio,
+        vector_store=target,
+        transformer=FakeTransformer(),
+        embedding_cache=EmbeddingCache(model_name="test", redis=None),
+        text_store=text_store,
+    )
+    return Reindexer(processor, target, text_store, Checkpoint(), workers=2)
+
+
+def listing(minio):
+    return lambda: iter(sorted(minio.objects))
+
+
+def test_rebuild_reads_stored_text_and_extracts_the_rest(minio, target, text_store, reindexer):
+    minio.put("stored", b"not read")
+    text_store.put("stored", "text kept by the processor")
+    content = make_pdf(1, words_per_page=30)
+    file_id = hashlib.sha256(content).hexdigest()[:16]
+    minio.put(file_id, content, "application/pdf")
+
+    result = reindexer.run(listing(minio))
+
+    assert result["files"] == 2
+    assert result["indexed"] == 2
+    assert result["failed"] == 0
+    assert result["text_from_artifact"] == result["text_extracted"] == 1
+    assert target.count_by_file_id("stored") == 1
+    assert target.count_by_file_id(file_id) > 0
+    assert text_store.get(file_id) is not None
+
+
+def test_catch_up_follows_uploads_and_deletions(minio, target, text_store, reindexer):
+    for file_id in ("a", "b"):
+        minio.put(file_id, b"")
+        text_store.put(file_id, f"text of {file_id}")
+    reindexer.run(listing(minio))
+
+    minio.delete_file("a")
+    minio.put("c", b"")
+    text_store.put("c", "text of c")
+
+    assert reindexer.catch_up(listing(minio)) == 2
+    assert [target.count_by_file_id(file_id) for file_id in ("a", "b", "c")] == [0, 1, 1]
+    assert reindexer.catch_up(listing(minio)) == 0
+
+
+def test_checkpoint_resumes_across_runs(tmp_path):
+    path = str(tmp_path / "checkpoint")
+    checkpoint = Checkpoint(path)
+    checkpoint.record("a")
+    checkpoint.record("b")
+    checkpoint.discard(["a"])
+    checkpoint.close()
+
+    assert Checkpoint(path).done == {"b"}
+
+
+def test_checkpointed_files_are_skipped(minio, target, text_store, reindexer, tmp_path):
+    minio.put("a", b"")
+    text_store.put("a", "text of a")
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint"))
+    checkpoint.record("a")
+    resumed = Reindexer(reindexer._processor, target, text_store, checkpoint)
+
+    result = resumed.run(listing(minio))
+    checkpoint.close()
+
+    assert result["already_done"] == 1
+    assert result["files"] == 0
+    assert target.count_by_file_id("a") == 0
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from app.handlers.files_processor.batcher import EmbeddingBatcher
+from app.handlers.files_processor.pipeline import FileJob
+from app.packages.storage.qdrant import QdrantVectorStore, point_ids
+
+VECTOR_SIZE = 4
+
+
+def embeddings(count: int) -> np.ndarray:
+    return np.random.default_rng(count).random((count, VECTOR_SIZE), dtype=np.float32)
+
+
+@pytest.fixture
+def store(qdrant):
+    return QdrantVectorStore("test", client=qdrant, vector_size=VECTOR_SIZE)
+
+
+def reindex(store: QdrantVectorStore, file_id: str, chunks: list[str]):
+    plan = store.plan_reindex(file_id, chunks)
+    store.apply_reindex(file_id, chunks, plan, embeddings(len(plan.new)))
+    return plan
+
+
+def test_plan_for_unknown_file_is_all_new(store):
+    plan = store.plan_reindex("file", ["a", "b", "c"])
+
+    assert plan.new == [0, 1, 2]
+    assert plan.moved == {}
+    assert plan.stale == []
+    assert not plan.unchanged
+
+
+def test_plan_for_indexed_file_is_unchanged(store):
+    store.add_documents("file", ["a", "b"], embeddings(2), wait=True)
+
+    plan = store.plan_reindex("file", ["a", "b"])
+
+    assert plan.unchanged
+
+
+def test_plan_finds_new_moved_and_stale_chunks(store):
+    store.add_documents("file", ["a", "b", "c"], embeddings(3), wait=True)
+    old_ids = point_ids("file", ["a", "b", "c"])
+
+    plan = store.plan_reindex("file", ["b", "c", "d"])
+
+    assert plan.new == [2]
+    assert plan.moved == {old_ids[1]: 0, old_ids[2]: 1}
+    assert plan.stale == [old_ids[0]]
+
+
+def test_apply_reindex_leaves_only_current_chunks(store):
+    store.add_documents("file", ["a", "b", "c"], embeddings(3), wait=True)
+
+    reindex(store, "file", ["b", "c", "d"])
+
+    assert store.scroll_chunk_indices("file") == dict(zip(point_ids("file", ["b", "c", "d"]), [0, 1, 2]))
+    assert store.plan_reindex("file", ["b", "c", "d"]).unchanged
+
+
+
+def test_file_that_only_lost_chunks_drops_them(store):
+    store.add_documents("file", ["a", "b", "c"], embeddings(3), wait=True)
+    plan = store.plan_reindex("file", ["a", "b"])
+    job = FileJob(file_id="file", chunks=["a", "b"], embed_indices=plan.new, plan=plan)
+
+    # Nothing to encode, so the batcher leaves no embeddings on the job.
+    EmbeddingBatcher(lambda texts, batch_size: embeddings(len(texts))).embed([job])
+    result = store.apply_reindex("file", job.chunks, plan, job.embeddings)
+
+    assert plan.new == []
+    assert result["num_deleted"] == 1
+    assert store.scroll_chunk_indices("file") == dict(zip(point_ids("file", ["a", "b"]), [0, 1]))
@@ -0,0 +1,78 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.handlers.services.search_service import SearchService
+from app.packages.cache import SearchCache, redis_client, async_redis_client
+
+RESULTS = [{"id": "1", "score": 0.5, "file_id": "file", "chunk_index": 0, "text": "hit"}]
+
+
+@pytest.fixture
+def cache():
+    return SearchCache(redis_client, async_redis=async_redis_client)
+
+
+def test_whitespace_variants_share_an_entry(cache):
+    cache.set("apple pie", None, 5, RESULTS)
+
+    assert cache.get("apple pie", None, 5) == RESULTS
+    assert cache.get("Apple pie", None, 5) is None
+    assert cache.get("apple pie", "file", 5) is None
+    assert cache.get("apple pie", None, 5, with_text=False) is None
+
+
+def test_invalidate_retires_every_entry(cache):
+    cache.set("apple", None, 5, RESULTS)
+
+    cache.invalidate()
+
+    assert cache.get("apple", None, 5) is None
+
+
+def test_async_and_sync_keys_agree(cache):
+    async def roundtrip():
+        await cache.set_async("apple", None, 5, RESULTS)
+        found = cache.get("apple", None, 5)
+        await cache.invalidate_async()
+        return found, await cache.get_async("apple", None, 5)
+
+    assert asyncio.run(roundtrip()) == (RESULTS, None)
+
+
+class FakeEncoder:
+    def __init__(self):
+        self.queries: list[str] = []
+
+    async def encode(self, query: str) -> np.ndarray:
+        self.queries.append(query)
+        return np.zeros(4, dtype=np.float32)
+
+
+class FakeStore:
+    def search(self, query_embedding, limit, file_id, with_text):
+        return RESULTS[:limit]
+
+
+@pytest.mark.parametrize("async_storage", [False, True])
+def test_search_is_cached_per_query_text(async_storage):
+    service = SearchService(async_storage=async_storage)
+    service._encoder = FakeEncoder()
+    service._store = FakeStore()
+    service._async_store = None
+
+    async def search(query: str) -> dict:
+        if async_storage:
+            async def store_search(**kwargs):
+                return FakeStore().search(**kwargs)
+            service._async_store = type("AsyncStore", (), {"search": staticmethod(store_search)})()
+        return await service.search(query)
+
+    first = asyncio.run(search("  Apple   pie "))
+    second = asyncio.run(search("Apple pie"))
+    lowered = asyncio.run(search("apple pie"))
+
+    assert not first["cached"] and second["cached"] and not lowered["cached"]
+    assert service._encoder.queries == ["Apple pie", "apple pie"]
+    assert second["results"] == RESULTS
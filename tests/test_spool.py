@@ -0,0 +1,43 @@
+import hashlib
+
+import pytest
+
+from app.packages.storage import ChecksumMismatchError, spool_stream
+
+CONTENT = b"0123456789" * 10
+
+
+def chunks(data: bytes, size: int = 7):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+def test_small_content_stays_in_memory(tmp_path):
+    with spool_stream(chunks(CONTENT), max_memory_bytes=len(CONTENT), directory=str(tmp_path)) as spooled:
+        assert spooled.path is None
+        assert bytes(spooled.view()) == CONTENT
+        assert spooled.size == len(CONTENT)
+        assert spooled.sha256 == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_large_content_spills_to_a_mapped_file(tmp_path):
+    with spool_stream(chunks(CONTENT), max_memory_bytes=20, directory=str(tmp_path)) as spooled:
+        assert spooled.path is not None
+        assert spooled.path.startswith(str(tmp_path))
+        assert bytes(spooled.view()) == CONTENT
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_checksum_prefix_is_verified(tmp_path):
+    prefix = hashlib.sha256(CONTENT).hexdigest()[:16]
+    with spool_stream(chunks(CONTENT), expected_sha256_prefix=prefix, directory=str(tmp_path)) as spooled:
+        assert bytes(spooled.view()) == CONTENT
+
+    with pytest.raises(ChecksumMismatchError):
+        spool_stream(chunks(CONTENT), expected_sha256_prefix="0" * 16, max_memory_bytes=20, directory=str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_empty_content_has_an_empty_view(tmp_path):
+    with spool_stream(iter([]), max_memory_bytes=0, directory=str(tmp_path)) as spooled:
+        assert spooled.size == 0
+        assert bytes(spooled.view()) == b""
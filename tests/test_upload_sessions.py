@@ -0,0 +1,188 @@
+import hashlib
+import time
+from datetime import datetime, timedelta, UTC
+
+import pytest
+
+from app.config import settings
+from app.handlers.files_processor import Processor
+from app.handlers.files_processor.pipeline import FileJob
+from app.handlers.services import FileService
+from app.packages.cache import DedupIndex, EmbeddingCache, FileIndex, UploadSession, UploadSessionStore, redis_client
+from app.packages.constants.constants import FILES_TOPIC, UPLOAD_SESSION_KEY_PREFIX, UPLOAD_STAGING_KEY
+from app.packages.infrastructure.redis import redis_cli
+
+CONTENT = b"%PDF-1.4 uploaded straight to storage"
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+FILE_ID = SHA256[:16]
+
+
+def staging(session: dict) -> str:
+    return UploadSessionStore.staging_name(session["session_id"])
+
+
+def create(service: FileService, size: int = len(CONTENT), sha256: str = SHA256) -> dict:
+    return service.create_upload_session("report.pdf", "application/pdf", size, sha256)
+
+
+def expire_all(redis):
+    for member in redis.zrange(UPLOAD_STAGING_KEY, 0, -1):
+        redis.zadd(UPLOAD_STAGING_KEY, {member: time.time() - 1})
+
+
+def test_upload_is_staged_then_copied_into_place(minio, artifacts, redis):
+    service = FileService()
+    session = create(service)
+    assert session["url"] == f"http://minio/{artifacts.bucket_name}/{staging(session)}"
+
+    # The client ignored the signed Content-Type header.
+    artifacts.put(staging(session), CONTENT, "application/octet-stream")
+    result = service.complete_upload_session(session["session_id"])
+
+    assert result["status"] == "uploaded"
+    assert result["file_id"] == FILE_ID
+    assert minio.objects == {FILE_ID: CONTENT}
+    assert minio.stat_file(FILE_ID).content_type == "application/pdf"
+    assert artifacts.objects == {}
+    assert redis.xlen(FILES_TOPIC) == 1
+    assert DedupIndex(redis_client).file_hash(FILE_ID) == SHA256
+    assert create(service)["status"] == "duplicate"
+
+
+def test_completing_before_the_upload_keeps_the_session(minio, artifacts):
+    service = FileService()
+    session = create(service)
+
+    with pytest.raises(ValueError):
+        service.complete_upload_session(session["session_id"])
+
+    artifacts.put(staging(session), CONTENT)
+    assert service.complete_upload_session(session["session_id"])["status"] == "uploaded"
+
+
+def test_wrong_size_discards_the_upload_and_session(minio, artifacts):
+    service = FileService()
+    session = create(service)
+    artifacts.put(staging(session), CONTENT + b"extra")
+
+    with pytest.raises(ValueError):
+        service.complete_upload_session(session["session_id"])
+
+    assert artifacts.objects == {}
+    assert minio.objects == {}
+    with pytest.raises(LookupError):
+        service.complete_upload_session(session["session_id"])
+
+
+def test_multipart_upload(minio, artifacts, monkeypatch):
+    monkeypatch.setattr(settings, "upload_multipart_threshold", 1)
+    monkeypatch.setattr(settings, "upload_part_size", 0)
+    content = bytes(range(256)) * (24 * 1024)
+    service = FileService()
+    session = create(service, size=len(content), sha256=hashlib.sha256(content).hexdigest())
+    part_size = session["part_size"]
+    assert [part["part_number"] for part in session["parts"]] == [1, 2]
+
+    upload_id = next(iter(artifacts.multipart))
+    etags = [
+        (number, artifacts.put_part(upload_id, number, content[(number - 1) * part_size:number * part_size]))
+        for number in (1, 2)
+    ]
+    result = service.complete_upload_session(session["session_id"], etags)
+
+    assert result["status"] == "uploaded"
+    assert minio.objects[result["file_id"]] == content
+    assert artifacts.objects == {}
+
+
+def test_aborted_multipart_upload_is_not_found(minio, artifacts, monkeypatch):
+    monkeypatch.setattr(settings, "upload_multipart_threshold", 1)
+    service = FileService()
+    session = create(service)
+    artifacts.multipart.clear()
+
+    with pytest.raises(LookupError):
+        service.complete_upload_session(session["session_id"], [(1, "etag")])
+
+
+def test_second_session_for_the_same_content_is_a_duplicate(minio, artifacts):
+    service = FileService()
+    first, second = create(service), create(service)
+    artifacts.put(staging(first), CONTENT)
+    artifacts.put(staging(second), CONTENT)
+
+    service.complete_upload_session(first["session_id"])
+    result = service.complete_upload_session(second["session_id"])
+
+    assert result["status"] == "duplicate"
+    assert artifacts.objects == {}
+
+
+def test_session_key_expires_with_its_cleanup_entry(redis):
+    store = UploadSessionStore(redis_client, ttl_seconds=3600)
+    expires_at = datetime.now(UTC) + timedelta(seconds=10)
+    session = UploadSession(
+        session_id=store.new_id(),
+        file_id=FILE_ID,
+        sha256=SHA256,
+        filename="report.pdf",
+        content_type="application/pdf",
+        size=len(CONTENT),
+        expires_at=expires_at.isoformat(),
+    )
+
+    # Saved again after a premature completion, late in the session.
+    store.save(session)
+
+    assert 0 < redis.ttl(f"{UPLOAD_SESSION_KEY_PREFIX}:{session.session_id}") <= 10
+    assert redis.zscore(UPLOAD_STAGING_KEY, f"{session.session_id}:") == expires_at.timestamp()
+
+
+def test_expired_sessions_are_cleaned_up(minio, artifacts, redis, monkeypatch):
+    service = FileService()
+    completed = create(service)
+    artifacts.put(staging(completed), CONTENT)
+    service.complete_upload_session(completed["session_id"])
+    # The presigned URL is still valid after completion.
+    artifacts.put(staging(completed), b"uploaded again")
+    monkeypatch.setattr(settings, "upload_multipart_threshold", 1)
+    multipart = create(service, sha256=hashlib.sha256(b"other").hexdigest())
+    artifacts.put_part(next(iter(artifacts.multipart)), 1, b"part")
+
+    assert service.abort_expired_uploads() == 0
+    expire_all(redis)
+
+    assert service.abort_expired_uploads() == 2
+    assert artifacts.objects == {}
+    assert artifacts.multipart == {}
+    assert redis.zcard(UPLOAD_STAGING_KEY) == 0
+    assert minio.objects == {FILE_ID: CONTENT}
+    with pytest.raises(LookupError):
+        service.complete_upload_session(multipart["session_id"], [(1, "etag")])
+
+
+class FakeTransformer:
+    def encode(self, texts, batch_size, show_progress_bar):
+        raise AssertionError("not expected to embed")
+
+
+def test_processor_rejects_content_that_does_not_match_its_hash(minio, artifacts, monkeypatch):
+    monkeypatch.setattr(settings, "chunker", "words")
+    service = FileService()
+    session = create(service)
+    forged = b"%PDF-1.4 something else of the same size!"[:len(CONTENT)]
+    artifacts.put(staging(session), forged)
+    service.complete_upload_session(session["session_id"])
+    processor = Processor(
+        minio_client=minio,
+        vector_store=object(),
+        transformer=FakeTransformer(),
+        embedding_cache=EmbeddingCache(model_name="test", redis=None),
+    )
+
+    assert processor.download(FileJob(file_id=FILE_ID)) is None
+
+    assert minio.objects == {}
+    assert FileIndex(redis_cli).total() == 0
+    assert DedupIndex(redis_client).get(SHA256) is None
+    assert create(service)["status"] == "pending"